@@ -0,0 +1,31 @@
+"""Add items.title_norm (lowercased, stripped title) for relaxed dedupe.
+
+Revision ID: 005_title_norm
+Revises: 004_dlq
+Create Date: 2025-02-06
+
+Backfills existing rows with lower(btrim(title)) so relaxed dedupe compares
+against the stored value instead of lowering every candidate per check.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "005_title_norm"
+down_revision: Union[str, Sequence[str], None] = "004_dlq"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("ALTER TABLE items ADD COLUMN IF NOT EXISTS title_norm VARCHAR(1024)"))
+    conn.execute(text("UPDATE items SET title_norm = NULLIF(lower(btrim(title)), '') WHERE title_norm IS NULL AND title IS NOT NULL"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_items_title_norm ON items (title_norm)"))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("DROP INDEX IF EXISTS ix_items_title_norm"))
+    conn.execute(text("ALTER TABLE items DROP COLUMN IF EXISTS title_norm"))
@@ -0,0 +1,32 @@
+"""Add partial index for the review queue.
+
+Revision ID: 006_review_idx
+Revises: 005_title_norm
+Create Date: 2025-02-07
+
+GET /review/pending filters needs_review = true AND status = 'drafted' and
+orders by id DESC. A partial index on (id DESC) restricted to that predicate
+serves the query directly and only holds rows waiting for review.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "006_review_idx"
+down_revision: Union[str, Sequence[str], None] = "005_title_norm"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_items_review_pending ON items (id DESC) "
+        "WHERE needs_review = true AND status = 'drafted'"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("DROP INDEX IF EXISTS ix_items_review_pending"))
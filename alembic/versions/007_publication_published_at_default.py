@@ -0,0 +1,28 @@
+"""Default publications.published_at to now() on the database side.
+
+Revision ID: 007_pub_published_at
+Revises: 006_review_idx
+Create Date: 2025-02-08
+
+Publishers no longer build a timestamp per publish; rows inserted without an
+explicit published_at are stamped by the DB clock. Existing rows are untouched.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "007_pub_published_at"
+down_revision: Union[str, Sequence[str], None] = "006_review_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("ALTER TABLE publications ALTER COLUMN published_at SET DEFAULT now()"))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("ALTER TABLE publications ALTER COLUMN published_at DROP DEFAULT"))
@@ -5,7 +5,7 @@ structured so Alembic can take over migrations later (single Base.metadata).
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -52,11 +52,19 @@ class Item(Base):
         Index("ix_items_fingerprint_created_at", "fingerprint", "created_at"),
         Index("ix_items_source_type_created_at", "source_type", "created_at"),
         Index("ix_items_status_id", "status", "id"),
+        # Review queue (GET /review/pending): only rows awaiting review, newest first
+        Index(
+            "ix_items_review_pending",
+            "id",
+            postgresql_ops={"id": "DESC"},
+            postgresql_where=text("needs_review = true AND status = 'drafted'"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     fingerprint: Mapped[str] = mapped_column(String(64), unique=True, index=True)
     title: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+    title_norm: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True, index=True)  # strip().lower() of title, for relaxed dedupe
     url: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True, index=True)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -99,7 +107,10 @@ class Publication(Base):
     external_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
-    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # DB clock stamps the row when the publisher does not pass an explicit time
+    published_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, server_default=func.now()
+    )
 
 
 class EventsLog(Base):
@@ -18,9 +18,15 @@ from apps.shared.secrets import get_secret
 
 logger = logging.getLogger(__name__)
 
-# Pool config: env overrides with safe defaults
-POOL_SIZE = parse_int(get_secret("DB_POOL_SIZE", ""), default=5, min_val=1, name="DB_POOL_SIZE")
-MAX_OVERFLOW = parse_int(get_secret("DB_MAX_OVERFLOW", ""), default=10, min_val=0, name="DB_MAX_OVERFLOW")
+# Pool config: env overrides with safe defaults. Defaults scale with the worker's publish concurrency
+# (each publish thread holds its own session, plus the coordinator session) so threads don't queue on the pool.
+_PUBLISH_WORKERS = parse_int(get_secret("PUBLISH_MAX_WORKERS", ""), default=4, min_val=1, name="PUBLISH_MAX_WORKERS")
+POOL_SIZE = parse_int(
+    get_secret("DB_POOL_SIZE", ""), default=max(5, 2 * _PUBLISH_WORKERS), min_val=1, name="DB_POOL_SIZE"
+)
+MAX_OVERFLOW = parse_int(
+    get_secret("DB_MAX_OVERFLOW", ""), default=max(10, 2 * _PUBLISH_WORKERS), min_val=0, name="DB_MAX_OVERFLOW"
+)
 POOL_RECYCLE = parse_int(get_secret("DB_POOL_RECYCLE", ""), default=1800, min_val=60, name="DB_POOL_RECYCLE")  # 30 min
 POOL_TIMEOUT = parse_int(get_secret("DB_POOL_TIMEOUT", ""), default=30, min_val=1, name="DB_POOL_TIMEOUT")
 
@@ -3,35 +3,78 @@ API middleware: request_id/correlation_id, rate limiting per IP/token, request s
 Uses secrets provider for REDIS_URL.
 """
 import os
+import threading
 import uuid
+from time import time
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from apps.api.settings_utils import env_int
+from apps.observability.logging import get_logger
+from apps.shared.config import REDIS_URL_DEFAULT
 from apps.shared.secrets import get_secret
 
-# Paths that skip rate limiting (health, metrics)
-_SKIP_RATE_LIMIT_PATHS = frozenset(
-    ("/health", "/health/live", "/health/ready", "/health/detailed", "/metrics", "")
-)
+try:
+    import redis
+except ImportError:  # rate limiting is skipped without redis
+    redis = None
+
+try:
+    import structlog
+    _HAS_STRUCTLOG = True
+except ImportError:
+    structlog = None
+    _HAS_STRUCTLOG = False
+
+# Paths that skip rate limiting (health, metrics); trailing-slash forms included so most lookups need no rstrip
+_SKIP_RATE_LIMIT_BASE = ("/health", "/health/live", "/health/ready", "/health/detailed", "/metrics", "")
+_SKIP_RATE_LIMIT_PATHS = frozenset(_SKIP_RATE_LIMIT_BASE + tuple(p + "/" for p in _SKIP_RATE_LIMIT_BASE))
+
+
+_redis_client = None
+_redis_lock = threading.Lock()
 
 
 def _get_redis():
-    try:
-        import redis
-        from apps.shared.config import REDIS_URL_DEFAULT
-        url = get_secret("REDIS_URL", REDIS_URL_DEFAULT)
-        return redis.Redis.from_url(url)
-    except Exception:
-        return None
+    """Process-wide Redis client (connections are pooled by redis-py). None if redis is unavailable."""
+    global _redis_client
+    if _redis_client is None and redis is not None:
+        with _redis_lock:
+            if _redis_client is None:
+                try:
+                    _redis_client = redis.Redis.from_url(get_secret("REDIS_URL", REDIS_URL_DEFAULT))
+                except Exception:
+                    return None
+    return _redis_client
 
 
 API_RATE_LIMIT_PER_MINUTE = env_int("API_RATE_LIMIT_PER_MINUTE", default=60)
 API_RATE_LIMIT_PER_HOUR = env_int("API_RATE_LIMIT_PER_HOUR", default=1000)
 API_MAX_BODY_SIZE = env_int("API_MAX_BODY_SIZE", default=65536)  # 64KB default
 
+# Check-then-count in one round trip. KEYS = minute, hour; ARGV = per-minute, per-hour limit.
+# Returns {0} when counted, {1, count} when over the minute limit, {2, count} when over the hour limit.
+_RATE_LIMIT_LUA = """
+local m = tonumber(redis.call('GET', KEYS[1]) or '0')
+if m >= tonumber(ARGV[1]) then return {1, m} end
+local h = tonumber(redis.call('GET', KEYS[2]) or '0')
+if h >= tonumber(ARGV[2]) then return {2, h} end
+if redis.call('INCR', KEYS[1]) == 1 then redis.call('EXPIRE', KEYS[1], 120) end
+if redis.call('INCR', KEYS[2]) == 1 then redis.call('EXPIRE', KEYS[2], 7200) end
+return {0}
+"""
+_rate_limit_script = None
+
+
+@lru_cache(maxsize=4096)
+def _token_id(credential: str) -> str:
+    """Short non-reversible bucket id for an API key / bearer header (16 hex chars; not a security hash)."""
+    return blake2b(credential.encode(), digest_size=8).hexdigest()
+
 
 def _client_identifier(request: Request) -> str:
     """IP or X-Forwarded-For, or auth token hash for per-token limiting."""
@@ -42,32 +85,48 @@ def _client_identifier(request: Request) -> str:
         ip = request.client.host if request.client else "unknown"
     api_key = request.headers.get("X-API-Key")
     if api_key:
-        import hashlib
-        token_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
-        return f"token:{token_hash}"
+        return f"token:{_token_id(api_key)}"
     auth = request.headers.get("Authorization")
     if auth and auth.startswith("Bearer "):
-        import hashlib
-        token_hash = hashlib.sha256(auth.encode()).hexdigest()[:16]
-        return f"token:{token_hash}"
+        return f"token:{_token_id(auth)}"
     return f"ip:{ip}"
 
 
 def _minute_key(identifier: str) -> str:
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc)
-    return f"api:rate:{identifier}:min:{now.strftime('%Y-%m-%d-%H-%M')}"
+    """Per-minute bucket: epoch minutes (UTC), unique per minute like the old %Y-%m-%d-%H-%M stamp."""
+    return f"api:rate:{identifier}:min:{int(time()) // 60}"
 
 
 def _hour_key(identifier: str) -> str:
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc)
-    return f"api:rate:{identifier}:hr:{now.strftime('%Y-%m-%d-%H')}"
+    return f"api:rate:{identifier}:hr:{int(time()) // 3600}"
 
 
 def _should_skip_rate_limit(path: str) -> bool:
     """Skip rate limit for health and metrics (Docker, load balancers, Prometheus)."""
-    return path.rstrip("/") in _SKIP_RATE_LIMIT_PATHS
+    return path in _SKIP_RATE_LIMIT_PATHS or (path.endswith("//") and path.rstrip("/") in _SKIP_RATE_LIMIT_PATHS)
+
+
+def _check_and_count(r, minute_key: str, hour_key: str) -> list:
+    """Run the rate-limit script (EVALSHA; redis-py reloads it on NOSCRIPT). Blocked requests are not counted."""
+    global _rate_limit_script
+    if _rate_limit_script is None:
+        _rate_limit_script = r.register_script(_RATE_LIMIT_LUA)
+    return _rate_limit_script(
+        keys=[minute_key, hour_key],
+        args=[API_RATE_LIMIT_PER_MINUTE, API_RATE_LIMIT_PER_HOUR],
+        client=r,
+    )
+
+
+_request_logger = None
+
+
+def _get_request_logger():
+    """api.request logger, resolved on first request (get_logger configures structlog lazily)."""
+    global _request_logger
+    if _request_logger is None:
+        _request_logger = get_logger("api.request")
+    return _request_logger
 
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
@@ -82,20 +141,16 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
         request.state.request_id = request_id
         request.state.correlation_id = request_id
         try:
-            try:
-                import structlog
+            if _HAS_STRUCTLOG:
                 structlog.contextvars.bind_contextvars(
                     request_id=request_id,
                     correlation_id=request_id,
                 )
-            except ImportError:
-                pass
             response = await call_next(request)
             if hasattr(response, "headers"):
                 response.headers["X-Request-ID"] = request_id
             try:
-                from apps.observability.logging import get_logger
-                get_logger("api.request").info(
+                _get_request_logger().info(
                     "request",
                     method=request.method,
                     path=request.url.path,
@@ -105,11 +160,8 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
                 pass
             return response
         finally:
-            try:
-                import structlog
+            if _HAS_STRUCTLOG:
                 structlog.contextvars.clear_contextvars()
-            except ImportError:
-                pass
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -125,26 +177,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         mk = _minute_key(ident)
         hk = _hour_key(ident)
         try:
-            min_count = int(r.get(mk) or 0)
-            hour_count = int(r.get(hk) or 0)
-            if min_count >= API_RATE_LIMIT_PER_MINUTE:
+            blocked = _check_and_count(r, mk, hk)[0]
+            if blocked == 1:
                 return Response(
                     content='{"detail":"Rate limit exceeded (per minute)"}',
                     status_code=429,
                     media_type="application/json",
                 )
-            if hour_count >= API_RATE_LIMIT_PER_HOUR:
+            if blocked == 2:
                 return Response(
                     content='{"detail":"Rate limit exceeded (per hour)"}',
                     status_code=429,
                     media_type="application/json",
                 )
-            pipe = r.pipeline()
-            pipe.incr(mk)
-            pipe.expire(mk, 120)
-            pipe.incr(hk)
-            pipe.expire(hk, 7200)
-            pipe.execute()
         except Exception:
             pass
         return await call_next(request)
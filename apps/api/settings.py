@@ -1,17 +1,58 @@
 """
 Load and update Settings from DB. Single row (id=1) holds flags and limits.
 Feature flags: runtime toggles in feature_flags JSON.
+Reads are cached in-process for SETTINGS_CACHE_SECONDS (default 5); writes through this module invalidate the cache
+once the writing session commits.
 """
+import os
+import threading
+import time
 from typing import Any, Optional
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from apps.api.db.models import Settings
 
+SETTINGS_ROW_ID = 1
+SETTINGS_CACHE_TTL = float(os.environ.get("SETTINGS_CACHE_SECONDS") or "5.0")
 
-def get_settings(session: Session) -> dict[str, Any]:
-    """Return current settings as dict. Uses first row or defaults."""
-    row = session.query(Settings).first()
+# (monotonic time read, settings dict)
+_settings_cache: Optional[tuple[float, dict[str, Any]]] = None
+_settings_cache_lock = threading.Lock()
+
+
+def clear_settings_cache() -> None:
+    """Drop cached settings; the next get_settings reads the DB."""
+    global _settings_cache
+    with _settings_cache_lock:
+        _settings_cache = None
+
+
+_DIRTY_KEY = "settings_cache_dirty"
+
+
+def _invalidate_on_commit(session: Session) -> None:
+    """Mark the session: its commit drops the cache. Clearing at flush time would let a concurrent read
+    re-cache the old committed row (or a rolled-back write) for the full TTL."""
+    session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_cache_on_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        clear_settings_cache()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction: Any) -> None:
+    # Only the outermost rollback undoes the write; a rolled-back savepoint leaves earlier writes pending
+    if previous_transaction.parent is None:
+        session.info.pop(_DIRTY_KEY, None)
+
+
+def _row_to_dict(row: Optional[Settings]) -> dict[str, Any]:
+    """Settings row (or defaults when None) as the dict returned by get_settings."""
     if row is None:
         return {
             "pause_all_publish": False,
@@ -27,6 +68,36 @@ def get_settings(session: Session) -> dict[str, Any]:
     }
 
 
+def _fetch_row(session: Session) -> Optional[Settings]:
+    """The singleton row by primary key (identity map first, then a PK lookup).
+    Falls back to the first row for databases where the singleton was created with another id."""
+    row = session.get(Settings, SETTINGS_ROW_ID)
+    if row is None:
+        row = session.query(Settings).first()
+    return row
+
+
+def _get_or_create_row(session: Session) -> Settings:
+    row = _fetch_row(session)
+    if row is None:
+        row = Settings(id=SETTINGS_ROW_ID)
+        session.add(row)
+        session.flush()
+    return row
+
+
+def get_settings(session: Session) -> dict[str, Any]:
+    """Return current settings as dict. Uses first row or defaults. Cached for SETTINGS_CACHE_TTL seconds."""
+    global _settings_cache
+    cached = _settings_cache
+    if cached is not None and time.monotonic() - cached[0] < SETTINGS_CACHE_TTL:
+        return dict(cached[1])
+    settings = _row_to_dict(_fetch_row(session))
+    with _settings_cache_lock:
+        _settings_cache = (time.monotonic(), settings)
+    return dict(settings)
+
+
 def get_feature_flag(session: Session, name: str, default: bool = False) -> bool:
     """Return feature flag value. Default False if not set."""
     settings = get_settings(session)
@@ -39,17 +110,15 @@ def get_feature_flag(session: Session, name: str, default: bool = False) -> bool
     return bool(val)
 
 
-def set_feature_flag(session: Session, name: str, value: bool) -> None:
-    """Set feature flag. Caller should commit."""
-    row = session.query(Settings).first()
-    if row is None:
-        row = Settings()
-        session.add(row)
-        session.flush()
+def set_feature_flag(session: Session, name: str, value: bool) -> dict[str, Any]:
+    """Set feature flag. Caller should commit. Returns the updated settings (built from the same row, no re-query)."""
+    row = _get_or_create_row(session)
     flags = dict(row.feature_flags) if row.feature_flags else {}
     flags[name] = value
     row.feature_flags = flags
     session.flush()
+    _invalidate_on_commit(session)
+    return _row_to_dict(row)
 
 
 def set_settings(
@@ -59,12 +128,9 @@ def set_settings(
     autopilot_enabled: Optional[bool] = None,
     rate_limits: Optional[dict] = None,
 ) -> dict[str, Any]:
-    """Update one or more settings. Gets or creates first row. Caller should commit."""
-    row = session.query(Settings).first()
-    if row is None:
-        row = Settings()
-        session.add(row)
-        session.flush()
+    """Update one or more settings. Gets or creates first row. Caller should commit.
+    Returns the updated settings built from the same row (no re-query)."""
+    row = _get_or_create_row(session)
     if pause_all_publish is not None:
         row.pause_all_publish = pause_all_publish
     if autopilot_enabled is not None:
@@ -72,4 +138,5 @@ def set_settings(
     if rate_limits is not None:
         row.rate_limits = rate_limits
     session.flush()
-    return get_settings(session)
+    _invalidate_on_commit(session)
+    return _row_to_dict(row)
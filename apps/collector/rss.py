@@ -24,7 +24,11 @@ from apps.worker.dedupe import (
     DEDUPE_DAYS,
     build_fingerprint,
     created_at_in_window,
-    find_item,
+    find_items_batch,
+    find_similar_item,
+    get_window_cutoff,
+    legacy_fingerprint,
+    title_norm,
 )
 
 
@@ -62,6 +66,7 @@ def run(limit: int = 20) -> int:
         sources = list_sources()
         total = 0
         now = datetime.now(timezone.utc)
+        cutoff = get_window_cutoff(DEDUPE_DAYS, now)
         for src in sources:
             if total >= limit:
                 break
@@ -71,8 +76,9 @@ def run(limit: int = 20) -> int:
             entries = fetch_feed(url, limit=limit * 2)
             source = get_or_create_source(session, name, url)
             session.flush()
+            records = []
             for entry in entries:
-                if total >= limit:
+                if total + len(records) >= limit:
                     break
                 try:
                     rec = normalized_record(entry, source_name=name)
@@ -80,8 +86,17 @@ def run(limit: int = 20) -> int:
                     continue
                 canonical_url = rec.get("url") or ""
                 normalized_title = (rec.get("title") or "").strip()
-                fingerprint = build_fingerprint("rss", canonical_url, normalized_title)
-                rec["fingerprint"] = fingerprint
+                rec["fingerprint"] = build_fingerprint("rss", canonical_url, normalized_title)
+                rec["legacy_fingerprint"] = legacy_fingerprint("rss", canonical_url, normalized_title)
+                rec["normalized_title"] = normalized_title
+                records.append(rec)
+            # One IN (...) query for the batch; items created below are added so in-batch repeats dedupe too
+            known = find_items_batch(
+                session, [r["fingerprint"] for r in records] + [r["legacy_fingerprint"] for r in records]
+            )
+            for rec in records:
+                fingerprint = rec["fingerprint"]
+                normalized_title = rec["normalized_title"]
                 # Store raw
                 raw_content = json.dumps(rec.get("raw_payload") or {}, default=str)
                 raw_row = RawItem(
@@ -92,12 +107,19 @@ def run(limit: int = 20) -> int:
                 session.add(raw_row)
                 session.flush()
                 # Centralized dedupe: 7-day window (configurable DEDUPE_DAYS); relaxed policy uses title
-                item = find_item(session, fingerprint, title=normalized_title)
+                item = (
+                    known.get(fingerprint)
+                    or known.get(rec["legacy_fingerprint"])
+                    or find_similar_item(session, normalized_title, cutoff)
+                )
                 if item:
-                    if created_at_in_window(item, DEDUPE_DAYS, now):
+                    if created_at_in_window(item, DEDUPE_DAYS, cutoff=cutoff):
                         item.updated_at = now
                     else:
+                        if item.fingerprint == rec["legacy_fingerprint"]:
+                            item.fingerprint = fingerprint
                         item.title = rec.get("title")
+                        item.title_norm = title_norm(rec.get("title"))
                         item.url = rec.get("url")
                         item.published_at = rec.get("published_at")
                         item.summary = rec.get("summary")
@@ -108,6 +130,7 @@ def run(limit: int = 20) -> int:
                     item = Item(
                         fingerprint=fingerprint,
                         title=rec.get("title"),
+                        title_norm=title_norm(rec.get("title")),
                         url=rec.get("url"),
                         published_at=rec.get("published_at"),
                         summary=rec.get("summary"),
@@ -116,6 +139,7 @@ def run(limit: int = 20) -> int:
                         status="new",
                     )
                     session.add(item)
+                    known[fingerprint] = item
                 total += 1
         session.commit()
         return total
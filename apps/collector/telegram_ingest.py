@@ -24,7 +24,11 @@ from apps.worker.dedupe import (
     DEDUPE_DAYS,
     build_fingerprint,
     created_at_in_window,
-    find_item,
+    find_items_batch,
+    find_similar_item,
+    get_window_cutoff,
+    legacy_fingerprint,
+    title_norm,
 )
 
 
@@ -96,6 +100,7 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
         since = datetime.now(timezone.utc) - timedelta(minutes=since_minutes)
         total = 0
         now = datetime.now(timezone.utc)
+        cutoff = get_window_cutoff(DEDUPE_DAYS, now)
 
         client = TelegramClient(session_path, int(api_id), api_hash.strip())
         with client:
@@ -111,6 +116,7 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
                 if hasattr(entity, "title") and entity.title and not src.name:
                     source_name = entity.title
 
+                records = []
                 for message in client.iter_messages(
                     entity,
                     offset_date=since,
@@ -124,9 +130,17 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
                     raw_url = rec["url"] or f"telegram:{chat_id}:{message.id}"
                     canonical_url_str = canonicalize_url(rec["url"]) if rec["url"] else raw_url
                     norm_title = (rec["title"] or "").strip() or "(no title)"
-                    fingerprint = build_fingerprint("telegram", canonical_url_str, norm_title)
-                    rec["fingerprint"] = fingerprint
-
+                    rec["fingerprint"] = build_fingerprint("telegram", canonical_url_str, norm_title)
+                    rec["legacy_fingerprint"] = legacy_fingerprint("telegram", canonical_url_str, norm_title)
+                    records.append(rec)
+
+                # One IN (...) query per source; items created below are added so in-batch repeats dedupe too
+                session.flush()
+                known = find_items_batch(
+                    session, [r["fingerprint"] for r in records] + [r["legacy_fingerprint"] for r in records]
+                )
+                for rec in records:
+                    fingerprint = rec["fingerprint"]
                     raw_content = json.dumps(rec.get("raw_payload") or {}, default=str)
                     raw_row = RawItem(
                         source_id=src.id,
@@ -137,12 +151,19 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
                     session.flush()
 
                     # Centralized dedupe: 7-day window (configurable DEDUPE_DAYS)
-                    item = find_item(session, fingerprint, title=rec.get("title"))
+                    item = (
+                        known.get(fingerprint)
+                        or known.get(rec["legacy_fingerprint"])
+                        or find_similar_item(session, rec.get("title"), cutoff)
+                    )
                     if item:
-                        if created_at_in_window(item, DEDUPE_DAYS, now):
+                        if created_at_in_window(item, DEDUPE_DAYS, cutoff=cutoff):
                             item.updated_at = now
                         else:
+                            if item.fingerprint == rec["legacy_fingerprint"]:
+                                item.fingerprint = fingerprint
                             item.title = rec.get("title")
+                            item.title_norm = title_norm(rec.get("title"))
                             item.url = rec.get("url") or None
                             item.published_at = rec.get("published_at")
                             item.summary = rec.get("summary")
@@ -153,6 +174,7 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
                         item = Item(
                             fingerprint=fingerprint,
                             title=rec.get("title"),
+                            title_norm=title_norm(rec.get("title")),
                             url=rec.get("url") or None,
                             published_at=rec.get("published_at"),
                             summary=rec.get("summary"),
@@ -161,6 +183,7 @@ def run(since_minutes: int = 60, limit_per_source: int = 200) -> int:
                             status="new",
                         )
                         session.add(item)
+                        known[fingerprint] = item
                     total += 1
 
         session.commit()
@@ -5,6 +5,7 @@ Block publish + log event if rate limited. Default safe limits when missing.
 from __future__ import annotations
 
 import os
+import threading
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -24,11 +25,35 @@ class RateLimitExceededError(Exception):
         super().__init__(f"Rate limit exceeded for {channel}: {limit_type} {current}/{limit}")
 
 
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
 def _get_redis():
-    """Lazy Redis client from REDIS_URL. VM-first default: redis:6379."""
-    import redis
-    url = os.environ.get("REDIS_URL", "redis://redis:6379/0")
-    return redis.Redis.from_url(url)
+    """Process-wide Redis client from REDIS_URL (connections pooled by redis-py). VM-first default: redis:6379."""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                import redis
+                url = os.environ.get("REDIS_URL", "redis://redis:6379/0")
+                _redis_client = redis.Redis.from_url(url)
+    return _redis_client
+
+
+# Check-then-count atomically in Redis, so concurrent publish workers need no Python-side lock.
+# KEYS = minute, hour; ARGV = per-minute, per-hour limit.
+# Returns {0} when counted, {1, count} when over the minute limit, {2, count} when over the hour limit.
+_RATE_LIMIT_LUA = """
+local m = tonumber(redis.call('GET', KEYS[1]) or '0')
+if m >= tonumber(ARGV[1]) then return {1, m} end
+local h = tonumber(redis.call('GET', KEYS[2]) or '0')
+if h >= tonumber(ARGV[2]) then return {2, h} end
+if redis.call('INCR', KEYS[1]) == 1 then redis.call('EXPIRE', KEYS[1], 120) end
+if redis.call('INCR', KEYS[2]) == 1 then redis.call('EXPIRE', KEYS[2], 7200) end
+return {0}
+"""
+_rate_limit_script = None
 
 
 def _get_limits_for_channel(settings: dict[str, Any], channel: str) -> tuple[int, int]:
@@ -69,24 +94,19 @@ def check_rate_limit(
 ) -> None:
     """
     Check if channel is within rate limit. Raises RateLimitExceededError if blocked.
-    Increments counters only when allowed. settings: dict from get_settings(session); if None, uses defaults.
+    Increments counters only when allowed (check + increment are one atomic Redis script). settings: dict from get_settings(session); if None, uses defaults.
     """
+    global _rate_limit_script
     per_minute, per_hour = _get_limits_for_channel(settings or {}, channel)
     r = redis_client or _get_redis()
-    mk = _minute_key(channel)
-    hk = _hour_key(channel)
-    min_count = int(r.get(mk) or 0)
-    hour_count = int(r.get(hk) or 0)
-    if min_count >= per_minute:
-        raise RateLimitExceededError(channel, "per_minute", min_count, per_minute)
-    if hour_count >= per_hour:
-        raise RateLimitExceededError(channel, "per_hour", hour_count, per_hour)
-    pipe = r.pipeline()
-    pipe.incr(mk)
-    pipe.expire(mk, 120)
-    pipe.incr(hk)
-    pipe.expire(hk, 7200)
-    pipe.execute()
+    if _rate_limit_script is None:
+        _rate_limit_script = r.register_script(_RATE_LIMIT_LUA)
+    # EVALSHA (redis-py reloads the script on NOSCRIPT); one round trip, atomic across workers
+    res = _rate_limit_script(keys=[_minute_key(channel), _hour_key(channel)], args=[per_minute, per_hour], client=r)
+    if res[0] == 1:
+        raise RateLimitExceededError(channel, "per_minute", int(res[1]), per_minute)
+    if res[0] == 2:
+        raise RateLimitExceededError(channel, "per_hour", int(res[1]), per_hour)
 
 
 def log_rate_limit_event(
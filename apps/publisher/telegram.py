@@ -5,24 +5,71 @@ Stores returned message_id(s) in DB publications (comma-separated if multiple).
 """
 from __future__ import annotations
 
+import atexit
 import os
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Protocol, runtime_checkable
 
+import orjson
+
 try:
     import httpx
 except ImportError:
     httpx = None  # type: ignore
 
+try:
+    import h2  # noqa: F401  (httpx[http2] extra; enables HTTP/2 multiplexing)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 try:
     from sqlalchemy.orm import Session
 except ImportError:
     Session = None  # type: ignore
 
+from apps.worker.circuit_breaker import get_circuit_breaker
 from apps.worker.retry import PUBLISH_MAX_ATTEMPTS, run_with_retry
 
+try:
+    from apps.observability.metrics import record_publish
+except ImportError:
+    record_publish = None  # type: ignore
+
+try:
+    from apps.observability.logging import get_logger
+    _log = get_logger("apps.publisher.telegram")
+except ImportError:
+    _log = None
+
 # Telegram sendMessage limit (use slightly under to avoid edge cases)
 TELEGRAM_MAX_MESSAGE_LENGTH = 4090
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared client: keeps TLS connections to api.telegram.org alive across sends, chunks and retries
+_CLIENT: Optional["httpx.Client"] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> "httpx.Client":
+    """Process-wide httpx.Client for the Bot API (thread-safe; pooled keep-alive connections, HTTP/2 when h2 is installed)."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _client_lock:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(
+                    base_url=TELEGRAM_API_BASE,
+                    http2=_HTTP2,
+                    timeout=30.0,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=300),
+                )
+                atexit.register(_CLIENT.close)
+    return _CLIENT
 
 
 @runtime_checkable
@@ -59,6 +106,15 @@ class PublicationResult:
         self.attempts = attempts
 
 
+class TelegramPublishError(RuntimeError):
+    """Raised by publish() when a send fails after retries; carries the logged "failed" row's id and attempts."""
+
+    def __init__(self, message: str, publication_id: Optional[int] = None, attempts: int = 0):
+        self.publication_id = publication_id
+        self.attempts = attempts
+        super().__init__(message)
+
+
 def _get_session():
     """Lazy import to avoid requiring apps.api at module load."""
     import sys
@@ -70,11 +126,14 @@ def _get_session():
     return SessionLocal()
 
 
+# Resolved once per process; TelegramPublisher.reload_secrets() picks up rotated values
+@lru_cache(maxsize=1)
 def _get_bot_token() -> str:
     from apps.shared.secrets import get_secret
     return get_secret("TELEGRAM_BOT_TOKEN")
 
 
+@lru_cache(maxsize=1)
 def _get_target_chat_id() -> str:
     from apps.shared.secrets import get_secret
     return get_secret("TELEGRAM_TARGET_CHAT_ID") or get_secret("TELEGRAM_CHAT_ID")
@@ -88,15 +147,12 @@ def _log_publication(
     published_at: Optional[datetime] = None,
     attempts: int = 0,
 ) -> int:
-    """Create a Publication row; return id. Caller must commit."""
+    """Create a Publication row; return id. Caller must commit.
+    published_at defaults to the DB's now() (server default) unless given explicitly."""
     from apps.api.db.models import Publication
-    row = Publication(
-        channel=channel,
-        status=status,
-        external_id=external_id,
-        published_at=published_at,
-        attempts=attempts,
-    )
+    row = Publication(channel=channel, status=status, external_id=external_id, attempts=attempts)
+    if published_at is not None:
+        row.published_at = published_at
     session.add(row)
     session.flush()
     return row.id
@@ -105,10 +161,10 @@ def _log_publication(
 def _split_message(text: str, max_len: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> list[str]:
     """
     Split text so no part exceeds max_len. Preserve first line as header on continuation parts.
+    Parts break after a newline in the second half of the chunk when there is one (not mid-line).
     """
     if not text or len(text) <= max_len:
         return [text] if text else []
-    parts = []
     first_newline = text.find("\n")
     has_header = first_newline >= 0
     header = (text[: first_newline + 1]).strip() + "\n" if has_header else ""
@@ -116,48 +172,132 @@ def _split_message(text: str, max_len: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> lis
     chunk_size = max_len - len(header) if header else max_len
     if chunk_size <= 0:
         # Header alone too long; split by max_len only
-        for i in range(0, len(text), max_len):
-            parts.append(text[i : i + max_len])
-        return parts
+        return [text[i : i + max_len] for i in range(0, len(text), max_len)]
+    parts: list[str] = []
     pos = 0
     while pos < len(rest):
-        chunk = rest[pos : pos + chunk_size]
-        parts.append(header + chunk if header else chunk)
-        pos += chunk_size
+        end = min(pos + chunk_size, len(rest))
+        if end < len(rest):
+            nl = rest.rfind("\n", pos, end)
+            if nl - pos > chunk_size // 2:
+                end = nl + 1
+        parts.append(header + rest[pos:end].rstrip("\n"))
+        pos = end
     return parts
 
 
-def _normalize_messages_for_telegram(messages: list[str]) -> list[str]:
-    """Ensure no single message exceeds Telegram limit; split with header preserved."""
-    out: list[str] = []
+def _pack_messages(messages: list[str], max_len: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> list[str]:
+    """Join consecutive messages with a blank line while the result fits in max_len (fewer sendMessage calls).
+    Empty messages are dropped; a message that is already too long is kept as is for the splitter."""
+    packed: list[str] = []
+    buf = ""
     for msg in messages:
         if not msg:
             continue
-        for part in _split_message(msg, TELEGRAM_MAX_MESSAGE_LENGTH):
-            if part:
-                out.append(part)
+        if buf and len(buf) + 2 + len(msg) <= max_len:
+            buf = f"{buf}\n\n{msg}"
+            continue
+        if buf:
+            packed.append(buf)
+        buf = msg
+    if buf:
+        packed.append(buf)
+    return packed
+
+
+def _normalize_messages_for_telegram(messages: list[str]) -> list[str]:
+    """Pack short messages together, then ensure no single message exceeds Telegram limit; split with header preserved."""
+    out: list[str] = []
+    for msg in _pack_messages(messages, TELEGRAM_MAX_MESSAGE_LENGTH):
+        # Packed messages are non-empty; only oversize ones go through the splitter
+        if len(msg) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+            out.append(msg)
+            continue
+        out.extend(part for part in _split_message(msg, TELEGRAM_MAX_MESSAGE_LENGTH) if part)
     return out
 
 
+@lru_cache(maxsize=4)
+def _send_path(token: str) -> str:
+    """sendMessage path relative to TELEGRAM_API_BASE, built once per token."""
+    return f"/bot{token}/sendMessage"
+
+
 def _send_message(token: str, chat_id: str, text: str) -> str:
     """POST sendMessage to Telegram Bot API (plain text). Returns message_id. Raises on error."""
     if not httpx:
         raise RuntimeError("httpx not installed")
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
     # Plain text (no parse_mode) so separators and bullets render correctly
     payload = {"chat_id": chat_id, "text": text}
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.post(url, json=payload)
-        if resp.status_code < 200 or resp.status_code >= 300:
-            raise RuntimeError(f"Telegram API {resp.status_code}: {resp.text[:300]}")
-        data = resp.json()
-        if not data.get("ok"):
-            raise RuntimeError(f"Telegram API error: {data.get('description', 'unknown')}")
-        result = data.get("result") or {}
-        msg_id = result.get("message_id")
-        if msg_id is None:
-            raise RuntimeError("Telegram API: no message_id in response")
-        return str(msg_id)
+    resp = _get_client().post(_send_path(token), content=orjson.dumps(payload), headers=_JSON_HEADERS)
+    body = resp.content
+    if resp.status_code < 200 or resp.status_code >= 300:
+        # Decode only the bytes that go into the message
+        raise RuntimeError(f"Telegram API {resp.status_code}: {body[:300].decode('utf-8', 'replace')}")
+    data = orjson.loads(body)
+    if not data.get("ok"):
+        raise RuntimeError(f"Telegram API error: {data.get('description', 'unknown')}")
+    result = data.get("result") or {}
+    msg_id = result.get("message_id")
+    if msg_id is None:
+        raise RuntimeError("Telegram API: no message_id in response")
+    return str(msg_id)
+
+
+def _send_with_retry(token: str, chat_id: str, messages: list[str]) -> tuple[bool, object, int]:
+    """Send messages (normalized to Telegram limits) through the circuit breaker with retry.
+    Returns run_with_retry's (ok, message_ids or last error, attempts); records the publish metric."""
+    to_send = _normalize_messages_for_telegram(messages)
+    # Parts are sent in order (Telegram shows them in arrival order). ids persists across
+    # retries, so a retry resumes at the first unsent part instead of re-sending the post.
+    ids: list[str] = []
+    cb = get_circuit_breaker("telegram")
+
+    def _send_all() -> list[str]:
+        for msg in to_send[len(ids):]:
+            ids.append(cb.call(lambda m=msg: _send_message(token, chat_id, m)))
+        return ids
+
+    ok, result_or_err, attempts = run_with_retry(_send_all, max_attempts=PUBLISH_MAX_ATTEMPTS)
+    if record_publish is not None:
+        record_publish("telegram", "sent" if ok else "failed")
+    return ok, result_or_err, attempts
+
+
+# Background senders for publish_async (fire-and-forget callers)
+_EXEC = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tg-send")
+
+
+def _send_queued(publication_id: int, messages: list[str], token: str, chat_id: str) -> None:
+    """Worker for publish_async: send, then move the queued Publication row to sent/failed.
+    Runs in a fire-and-forget future, so any failure is logged here (else the row stays "queued" silently)."""
+    from sqlalchemy import func, update
+
+    from apps.api.db.models import Publication
+
+    try:
+        ok, result_or_err, attempts = _send_with_retry(token, chat_id, messages)
+        values: dict = {"status": "failed", "attempts": attempts}
+        if ok and isinstance(result_or_err, list) and result_or_err:
+            values.update(status="sent", external_id=",".join(result_or_err), published_at=func.now())
+        session = _get_session()
+        try:
+            session.execute(update(Publication).where(Publication.id == publication_id).values(**values))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    except Exception as e:
+        if _log:
+            _log.error(
+                "telegram_queued_publish_failed",
+                publication_id=publication_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+        raise
 
 
 class TelegramPublisher:
@@ -166,6 +306,13 @@ class TelegramPublisher:
     dry_run: print only, no send. Uses shared retry; stores message_id as external_id; increments attempts.
     """
 
+    @staticmethod
+    def reload_secrets() -> None:
+        """Drop the cached bot token and chat id (e.g. after rotation); next publish re-reads them."""
+        _get_bot_token.cache_clear()
+        _get_target_chat_id.cache_clear()
+        _send_path.cache_clear()
+
     def publish(
         self,
         messages: list[str],
@@ -183,7 +330,6 @@ class TelegramPublisher:
             own_session = True
         token = _get_bot_token()
         chat_id = _get_target_chat_id()
-        now = datetime.now(timezone.utc)
 
         try:
             if dry_run:
@@ -193,44 +339,23 @@ class TelegramPublisher:
                     except UnicodeEncodeError:
                         safe_msg = msg.encode("ascii", errors="replace").decode("ascii")
                         print(f"[telegram dry_run] {channel} part {i}/{len(messages)}:\n{safe_msg}\n")
-                pub_id = _log_publication(session, channel, "dry_run", external_id=None, published_at=now, attempts=0)
+                pub_id = _log_publication(session, channel, "dry_run", external_id=None, attempts=0)
                 if own_session:
                     session.commit()
                 return PublicationResult(publication_id=pub_id, status="dry_run", dry_run=True, attempts=0)
 
             if not token or not chat_id:
-                pub_id = _log_publication(session, channel, "dry_run", external_id=None, published_at=now, attempts=0)
+                pub_id = _log_publication(session, channel, "dry_run", external_id=None, attempts=0)
                 if own_session:
                     session.commit()
                 return PublicationResult(publication_id=pub_id, status="dry_run", dry_run=True, attempts=0)
 
-            # Normalize: split any message over Telegram limit (preserve headers)
-            to_send = _normalize_messages_for_telegram(messages)
-            message_ids: list[str] = []
-
-            def _send_all() -> list[str]:
-                from apps.worker.circuit_breaker import get_circuit_breaker
-
-                cb = get_circuit_breaker("telegram")
-                ids: list[str] = []
-                for msg in to_send:
-                    mid = cb.call(lambda m=msg: _send_message(token, chat_id, m))
-                    ids.append(mid)
-                return ids
-
-            ok, result_or_err, attempts = run_with_retry(_send_all, max_attempts=PUBLISH_MAX_ATTEMPTS)
-            try:
-                from apps.observability.metrics import record_publish
-                record_publish("telegram", "sent" if ok else "failed")
-            except ImportError:
-                pass
+            ok, result_or_err, attempts = _send_with_retry(token, chat_id, messages)
             if ok and isinstance(result_or_err, list) and result_or_err:
-                message_ids = result_or_err
-                external_id = ",".join(message_ids)
+                external_id = ",".join(result_or_err)
                 pub_id = _log_publication(
                     session, channel, "sent",
                     external_id=external_id,
-                    published_at=now,
                     attempts=attempts,
                 )
                 if own_session:
@@ -244,10 +369,14 @@ class TelegramPublisher:
                 )
             # Failed after retries
             err_str = str(result_or_err) if isinstance(result_or_err, Exception) else (result_or_err or "unknown")
-            pub_id = _log_publication(session, channel, "failed", external_id=None, published_at=now, attempts=attempts)
+            pub_id = _log_publication(session, channel, "failed", external_id=None, attempts=attempts)
             if own_session:
                 session.commit()
-            raise RuntimeError(f"Telegram send failed after {attempts} attempts: {err_str}")
+            raise TelegramPublishError(
+                f"Telegram send failed after {attempts} attempts: {err_str}",
+                publication_id=pub_id,
+                attempts=attempts,
+            )
         except Exception:
             if own_session:
                 session.rollback()
@@ -256,6 +385,61 @@ class TelegramPublisher:
             if own_session and session:
                 session.close()
 
+    def publish_batch(
+        self,
+        batches: list[tuple[list[str], str]],
+        dry_run: bool = True,
+        session: Optional["Session"] = None,
+    ) -> list[PublicationResult]:
+        """
+        Publish several (messages, channel) posts on one session and commit once at the end.
+        A post that fails after retries yields a "failed" result (its row is still logged) and the batch continues.
+        """
+        own_session = session is None
+        if own_session:
+            session = _get_session()
+        results: list[PublicationResult] = []
+        try:
+            for messages, channel in batches:
+                try:
+                    results.append(self.publish(messages, channel, dry_run=dry_run, session=session))
+                except TelegramPublishError as e:
+                    results.append(
+                        PublicationResult(
+                            publication_id=e.publication_id, status="failed", dry_run=False, attempts=e.attempts
+                        )
+                    )
+            session.commit()
+            return results
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if own_session:
+                session.close()
+
+    def publish_async(self, messages: list[str], channel: str) -> PublicationResult:
+        """
+        Queue a real send on a background thread and return at once with status "queued".
+        The Publication row is committed first; the worker updates it to sent/failed with message_id(s).
+        Without token/chat_id this falls back to a (synchronous) dry_run log, like publish().
+        """
+        token = _get_bot_token()
+        chat_id = _get_target_chat_id()
+        if not token or not chat_id:
+            return self.publish(messages, channel, dry_run=True)
+        session = _get_session()
+        try:
+            pub_id = _log_publication(session, channel, "queued", external_id=None, attempts=0)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        _EXEC.submit(_send_queued, pub_id, list(messages), token, chat_id)
+        return PublicationResult(publication_id=pub_id, status="queued", dry_run=False, attempts=0)
+
 
 def publish_telegram(
     messages: list[str],
@@ -1,6 +1,7 @@
 """Shared helpers for env parsing: treat empty as missing, safe int parsing."""
 import os
 import logging
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -128,21 +129,24 @@ def parse_int(
     return n
 
 
+@lru_cache(maxsize=256)
 def parse_int_default(raw: str, default: int, min_val: int, max_val: int) -> int:
     """
     Legacy function for backward compatibility.
-    Parse int from string; empty or invalid -> default; clamp to [min_val, max_val].
+    Parse int from string; empty or invalid -> default; below min_val -> default; above max_val -> max_val.
+    Cached: env values are stable, so repeated reads of the same raw value skip parsing.
     """
-    s = (raw or "").strip()
+    if not raw:
+        return default
+    s = raw.strip()
     if not s:
         return default
     try:
         n = int(s)
-        # Clamp to range
-        if n < min_val:
-            return min_val
-        if n > max_val:
-            return max_val
-        return n
     except ValueError:
         return default
+    if n < min_val:
+        return default
+    if n > max_val:
+        return max_val
+    return n
@@ -100,6 +100,22 @@ def validate_env(role: str = "all") -> None:
             if not url:
                 missing.append("MAKE_WEBHOOK_URL")
                 errors.append("MAKE_WEBHOOK_URL is set but empty")
+        # Explicit pool sizing must leave a connection per publish worker plus the coordinator session.
+        # Unset values fall back to the same defaults as apps/api/db/session.py.
+        raw_pool, raw_overflow = _get("DB_POOL_SIZE"), _get("DB_MAX_OVERFLOW")
+        if raw_pool or raw_overflow:
+            try:
+                workers = max(1, int(_get("PUBLISH_MAX_WORKERS") or 4))
+                pool = int(raw_pool) if raw_pool else max(5, 2 * workers)
+                overflow = int(raw_overflow) if raw_overflow else max(10, 2 * workers)
+            except ValueError:
+                errors.append("DB_POOL_SIZE, DB_MAX_OVERFLOW and PUBLISH_MAX_WORKERS must be integers")
+            else:
+                if pool + overflow < workers + 1:
+                    errors.append(
+                        f"DB_POOL_SIZE + DB_MAX_OVERFLOW ({pool + overflow}) must be at least "
+                        f"PUBLISH_MAX_WORKERS + 1 ({workers + 1})"
+                    )
 
     if errors:
         msg = "Env validation failed: " + "; ".join(errors)
@@ -12,6 +12,19 @@ from typing import Any, Optional
 # not urllib.parse, so .urlencode would raise AttributeError on the Monitoring page.
 from urllib.parse import urlencode
 
+try:
+    import orjson  # optional: faster JSON for POST bodies/responses
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
 
 def _append_query(path: str, params: dict) -> str:
     """Build path + querystring safely. Only appends when params have truthy values; uses '&' if '?' already in path."""
@@ -98,18 +111,59 @@ def _get_timeout() -> int:
 
 
 def _base_url() -> str:
-    """Backend base URL: session_state api_base_url first, then config (secrets/env). Never log."""
-    out = (_get_config().get("GNI_API_BASE_URL") or "").strip().rstrip("/")
+    """Backend base URL: session_state api_base_url first, then config (secrets/env). Never log.
+    Resolved once per Streamlit session and reused until api_base_url changes (save/"Change backend URL")."""
     try:
         import streamlit as st
-        session_url = (st.session_state.get("api_base_url") or "").strip().rstrip("/")
-        if session_url:
-            out = session_url
+        raw = st.session_state.get("api_base_url")
+        cached = st.session_state.get("_base_url_cached")
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+    except Exception:
+        return (_get_config().get("GNI_API_BASE_URL") or "").strip().rstrip("/")
+    out = (raw or "").strip().rstrip("/") or (_get_config().get("GNI_API_BASE_URL") or "").strip().rstrip("/")
+    try:
+        st.session_state["_base_url_cached"] = (raw, out)
     except Exception:
         pass
     return out
 
 
+_http_session = None  # fallback outside Streamlit (scripts, tests)
+
+
+def _session():
+    """Pooled requests.Session reused across API calls (keep-alive; no TCP/TLS handshake per request).
+    One per Streamlit session (st.session_state), since requests.Session is not guaranteed thread-safe."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    global _http_session
+    store = None
+    try:
+        import streamlit as st
+        s = st.session_state.get("_http_session")
+        store = st.session_state
+    except Exception:
+        s = _http_session
+    if s is None:
+        s = requests.Session()
+        # Connect errors only: status/read retries are handled per call (e.g. _wa_request backoff)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, redirect=0, backoff_factor=0.2),
+        )
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        if store is not None:
+            store["_http_session"] = s
+        else:
+            _http_session = s
+    return s
+
+
 def _conn_err(msg: str, url: str) -> str:
     """Build connection error message with safe URL (no tokens)."""
     return f"{msg} Tried: {url}"
@@ -148,172 +202,116 @@ def get_wa_debug_info() -> dict[str, Any]:
     }
 
 
-def api_get(path: str, *, timeout: Optional[int] = None, use_bearer: bool = True) -> tuple[Optional[Any], Optional[str]]:
-    """GET {base}{path}. Returns (data, error). On non-200 returns friendly error (no secrets)."""
-    import requests
-    global _last_http_status, _last_request_url
+# Status-specific error messages, built once (API key/bridge calls vs JWT calls)
+_API_KEY_ERRORS = {
+    401: "Authentication failed (401). Check your secrets.",
+    403: "Forbidden (403). Invalid or missing API key or token.",
+    404: "Endpoint not found (404).",
+}
+_JWT_GET_ERRORS = {
+    401: "Invalid or expired token (401). Please log in again.",
+    404: "Endpoint not found (404).",
+}
+_JWT_POST_ERRORS = {
+    401: "Invalid or expired token (401). Please log in again.",
+    429: "Rate limit exceeded (429). Try again later.",
+}
+_NO_STATUS_ERRORS: dict[int, str] = {}
+
+
+def _prepare_url(path: str) -> Optional[str]:
+    """{base}{path}, recorded as the last request URL; None when no base URL is set."""
+    global _last_request_url
     base = _base_url()
     if not base:
+        return None
+    _last_request_url = f"{base}{path}"
+    return _last_request_url
+
+
+def _handle(r: Any, *, empty: Any, errors: dict[int, str], detail_max: int = 200) -> tuple[Optional[Any], Optional[str]]:
+    """Map a response to (data, error): JSON body on 2xx (empty when no content), else a friendly error."""
+    global _last_http_status
+    _last_http_status = r.status_code
+    if r.ok:
+        return (_json_loads(r.content) if r.content else empty), None
+    msg = errors.get(r.status_code)
+    if msg:
+        return None, msg
+    try:
+        detail = _json_loads(r.content).get("detail", "Request failed")
+    except Exception:
+        detail = r.text[:200] if r.text else "Request failed"
+    return None, f"Request failed ({r.status_code}): {str(detail)[:detail_max]}"
+
+
+def _request_error(e: Exception, url: str, *, split_timeouts: bool = False) -> str:
+    """Connection-level error message (safe URL, no tokens)."""
+    import requests
+    global _last_http_status
+    _last_http_status = None
+    exc = requests.exceptions
+    if isinstance(e, (exc.ConnectTimeout, exc.ReadTimeout)):
+        if not split_timeouts:
+            return _conn_err("Connection error: timed out.", url)
+        kind = "connect" if isinstance(e, exc.ConnectTimeout) else "read"
+        return _conn_err(f"Connection error: {kind} timed out.", url)
+    if isinstance(e, exc.ConnectionError):
+        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
+        return _conn_err(f"Connection error: {reason}.", url)
+    return _conn_err(f"Connection error: {str(e)[:80]}.", url)
+
+
+def api_get(path: str, *, timeout: Optional[int] = None, use_bearer: bool = True) -> tuple[Optional[Any], Optional[str]]:
+    """GET {base}{path}. Returns (data, error). On non-200 returns friendly error (no secrets)."""
+    url = _prepare_url(path)
+    if not url:
         return None, "API base URL not set"
-    url = f"{base}{path}"
-    _last_request_url = url
     to = (timeout if timeout is not None else _get_timeout())
     try:
-        r = requests.get(url, headers=_headers(use_bearer=use_bearer), timeout=(to, to))
-        _last_http_status = r.status_code
-        r.raise_for_status()
-        return r.json() if r.content else None, None
-    except requests.exceptions.HTTPError as e:
-        _last_http_status = e.response.status_code if e.response else None
-        try:
-            detail = e.response.json().get("detail", "Request failed") if e.response else "Request failed"
-        except Exception:
-            detail = (e.response.text[:200] if e.response and e.response.text else "Request failed")
-        if e.response and e.response.status_code == 401:
-            return None, "Authentication failed (401). Check your secrets."
-        if e.response and e.response.status_code == 403:
-            return None, "Forbidden (403). Invalid or missing API key or token."
-        if e.response and e.response.status_code == 404:
-            return None, "Endpoint not found (404)."
-        return None, f"Request failed ({_last_http_status}): {str(detail)[:200]}"
-    except requests.exceptions.ConnectTimeout:
-        _last_http_status = None
-        return None, _conn_err("Connection error: connect timed out.", url)
-    except requests.exceptions.ReadTimeout:
-        _last_http_status = None
-        return None, _conn_err("Connection error: read timed out.", url)
-    except requests.exceptions.ConnectionError as e:
-        _last_http_status = None
-        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
-        return None, _conn_err(f"Connection error: {reason}.", url)
-    except requests.exceptions.RequestException as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        r = _session().get(url, headers=_headers(use_bearer=use_bearer), timeout=(to, to))
+        return _handle(r, empty=None, errors=_API_KEY_ERRORS)
     except Exception as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        return None, _request_error(e, url, split_timeouts=True)
 
 
 def api_post(path: str, json_body: Optional[dict] = None, *, timeout: Optional[int] = None, use_bearer: bool = False) -> tuple[Optional[Any], Optional[str]]:
     """POST {base}{path}. Returns (data, error). use_bearer=True for WA bridge; False for API key (monitoring/posts)."""
-    import requests
-    global _last_http_status, _last_request_url
-    base = _base_url()
-    if not base:
+    url = _prepare_url(path)
+    if not url:
         return None, "API base URL not set"
-    url = f"{base}{path}"
-    _last_request_url = url
     to = (timeout if timeout is not None else _get_timeout())
     try:
-        r = requests.post(url, headers=_headers(use_bearer=use_bearer), json=json_body or {}, timeout=(to, to))
-        _last_http_status = r.status_code
-        r.raise_for_status()
-        return r.json() if r.content else {}, None
-    except requests.exceptions.HTTPError as e:
-        _last_http_status = e.response.status_code if e.response else None
-        try:
-            detail = e.response.json().get("detail", "Request failed") if e.response else "Request failed"
-        except Exception:
-            detail = (e.response.text[:200] if e.response and e.response.text else "Request failed")
-        if e.response and e.response.status_code == 401:
-            return None, "Authentication failed (401). Check your secrets."
-        if e.response and e.response.status_code == 403:
-            return None, "Forbidden (403). Invalid or missing API key or token."
-        if e.response and e.response.status_code == 404:
-            return None, "Endpoint not found (404)."
-        return None, f"Request failed ({_last_http_status}): {str(detail)[:200]}"
-    except requests.exceptions.ConnectTimeout:
-        _last_http_status = None
-        return None, _conn_err("Connection error: connect timed out.", url)
-    except requests.exceptions.ReadTimeout:
-        _last_http_status = None
-        return None, _conn_err("Connection error: read timed out.", url)
-    except requests.exceptions.ConnectionError as e:
-        _last_http_status = None
-        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
-        return None, _conn_err(f"Connection error: {reason}.", url)
-    except requests.exceptions.RequestException as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        r = _session().post(url, headers=_headers(use_bearer=use_bearer), data=_json_dumps(json_body or {}), timeout=(to, to))
+        return _handle(r, empty={}, errors=_API_KEY_ERRORS)
     except Exception as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        return None, _request_error(e, url, split_timeouts=True)
 
 
 def api_get_jwt(path: str, *, timeout: Optional[int] = None, token: Optional[str] = None) -> tuple[Optional[Any], Optional[str]]:
     """GET with JWT from session (or passed token). For /auth/me, /whatsapp/*."""
-    import requests
-    global _last_http_status, _last_request_url
-    base = _base_url()
-    if not base:
+    url = _prepare_url(path)
+    if not url:
         return None, "API base URL not set"
-    url = f"{base}{path}"
-    _last_request_url = url
     to = (timeout if timeout is not None else _get_timeout())
     try:
-        r = requests.get(url, headers=_headers_jwt(token=token), timeout=(to, to))
-        _last_http_status = r.status_code
-        r.raise_for_status()
-        return r.json() if r.content else None, None
-    except requests.exceptions.HTTPError as e:
-        _last_http_status = e.response.status_code if e.response else None
-        try:
-            detail = e.response.json().get("detail", "Request failed")
-        except Exception:
-            detail = "Request failed"
-        if e.response and e.response.status_code == 401:
-            return None, "Invalid or expired token (401). Please log in again."
-        if e.response and e.response.status_code == 404:
-            return None, "Endpoint not found (404)."
-        return None, f"Request failed ({_last_http_status}): {str(detail)[:180]}"
-    except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
-        _last_http_status = None
-        return None, _conn_err("Connection error: timed out.", url)
-    except requests.exceptions.ConnectionError as e:
-        _last_http_status = None
-        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
-        return None, _conn_err(f"Connection error: {reason}.", url)
+        r = _session().get(url, headers=_headers_jwt(token=token), timeout=(to, to))
+        return _handle(r, empty=None, errors=_JWT_GET_ERRORS, detail_max=180)
     except Exception as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        return None, _request_error(e, url)
 
 
 def api_post_jwt(path: str, json_body: Optional[dict] = None, *, timeout: Optional[int] = None, token: Optional[str] = None) -> tuple[Optional[Any], Optional[str]]:
     """POST with JWT from session. For /auth/login, /whatsapp/connect."""
-    import requests
-    global _last_http_status, _last_request_url
-    base = _base_url()
-    if not base:
+    url = _prepare_url(path)
+    if not url:
         return None, "API base URL not set"
-    url = f"{base}{path}"
-    _last_request_url = url
     to = (timeout if timeout is not None else _get_timeout())
     try:
-        r = requests.post(url, headers=_headers_jwt(token=token), json=json_body or {}, timeout=(to, to))
-        _last_http_status = r.status_code
-        r.raise_for_status()
-        return r.json() if r.content else {}, None
-    except requests.exceptions.HTTPError as e:
-        _last_http_status = e.response.status_code if e.response else None
-        try:
-            detail = e.response.json().get("detail", "Request failed")
-        except Exception:
-            detail = "Request failed"
-        if e.response and e.response.status_code == 401:
-            return None, "Invalid or expired token (401). Please log in again."
-        if e.response and e.response.status_code == 429:
-            return None, "Rate limit exceeded (429). Try again later."
-        return None, f"Request failed ({_last_http_status}): {str(detail)[:180]}"
-    except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
-        _last_http_status = None
-        return None, _conn_err("Connection error: timed out.", url)
-    except requests.exceptions.ConnectionError as e:
-        _last_http_status = None
-        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
-        return None, _conn_err(f"Connection error: {reason}.", url)
+        r = _session().post(url, headers=_headers_jwt(token=token), data=_json_dumps(json_body or {}), timeout=(to, to))
+        return _handle(r, empty={}, errors=_JWT_POST_ERRORS, detail_max=180)
     except Exception as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        return None, _request_error(e, url)
 
 
 # --- Convenience (used by pages) ---
@@ -323,36 +321,15 @@ def get_health() -> tuple[Optional[dict], Optional[str]]:
 
 def post_auth_login(email: str, password: str) -> tuple[Optional[dict], Optional[str]]:
     """POST /auth/login. Returns (body with access_token, error). No auth header."""
-    import requests
-    global _last_http_status, _last_request_url
-    base = _base_url()
-    if not base:
+    url = _prepare_url("/auth/login")
+    if not url:
         return None, "API base URL not set"
-    url = f"{base}/auth/login"
-    _last_request_url = url
     to = _get_timeout()
     try:
-        r = requests.post(url, headers={"Content-Type": "application/json"}, json={"email": email, "password": password}, timeout=(to, to))
-        _last_http_status = r.status_code
-        r.raise_for_status()
-        return r.json() if r.content else None, None
-    except requests.exceptions.HTTPError as e:
-        _last_http_status = e.response.status_code if e.response else None
-        try:
-            detail = e.response.json().get("detail", "Request failed")
-        except Exception:
-            detail = "Request failed"
-        return None, f"Request failed ({_last_http_status}): {str(detail)[:180]}"
-    except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
-        _last_http_status = None
-        return None, _conn_err("Connection error: timed out.", url)
-    except requests.exceptions.ConnectionError as e:
-        _last_http_status = None
-        reason = str(e).split("\n")[0][:80] if str(e) else "connection refused or unreachable"
-        return None, _conn_err(f"Connection error: {reason}.", url)
+        r = _session().post(url, headers={"Content-Type": "application/json"}, json={"email": email, "password": password}, timeout=(to, to))
+        return _handle(r, empty=None, errors=_NO_STATUS_ERRORS, detail_max=180)
     except Exception as e:
-        _last_http_status = None
-        return None, _conn_err(f"Connection error: {str(e)[:80]}.", url)
+        return None, _request_error(e, url)
 
 
 def get_auth_me() -> tuple[Optional[dict], Optional[str]]:
@@ -462,9 +439,9 @@ def _wa_request(
     for attempt in range(max_retries + 1):
         try:
             if method == "GET":
-                r = requests.get(url, headers=headers, timeout=timeout)
+                r = _session().get(url, headers=headers, timeout=timeout)
             else:
-                r = requests.post(url, headers=headers, json=json_body or {}, timeout=timeout)
+                r = _session().post(url, headers=headers, json=json_body or {}, timeout=timeout)
 
             _last_http_status = r.status_code
             _last_response_preview = _sanitize_preview(r.text[:200] if r.text else "")
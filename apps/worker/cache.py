@@ -7,6 +7,7 @@ import json
 import os
 import threading
 import time
+from collections import OrderedDict
 from typing import Any, Optional
 
 from apps.api.settings_utils import env_int
@@ -64,6 +65,39 @@ class _InMemoryCache:
             self._data[key] = (value, time.monotonic() + ttl)
 
 
+class LocalTTLCache:
+    """Bounded, thread-safe in-process LRU with TTL for already-decoded objects.
+    Sits in front of Redis for hot keys: a hit costs no network round-trip and no re-parse."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[Any, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() > entry[1]:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self._ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
 _redis = None
 _memory_cache: Optional[_InMemoryCache] = None
 _cache_lock = threading.Lock()
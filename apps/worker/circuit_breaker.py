@@ -7,16 +7,39 @@ from __future__ import annotations
 import os
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from typing import Callable, TypeVar
 
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # redis optional; _get_redis() returns None without it
+    RedisError = OSError
 
 T = TypeVar("T")
 
 # Config
 FAILURE_THRESHOLD = get_int_env("CIRCUIT_FAILURE_THRESHOLD", default=5)
 RECOVERY_TIMEOUT = float(os.environ.get("CIRCUIT_RECOVERY_TIMEOUT", "60.0"))
+# Local read cache: skip Redis round-trips when state was loaded within this window
+REDIS_CACHE_TTL = 1.0
+# After this many consecutive Redis errors, run in-memory only for REDIS_COOLOFF seconds
+REDIS_MAX_ERRORS = 3
+REDIS_COOLOFF = 30.0
+_REDIS_ERRORS = (RedisError, ConnectionError, TimeoutError)
+
+# Atomic failure record: KEYS = failures, opened_at, state; ARGV = now, threshold. Returns new failure count.
+_RECORD_FAILURE_LUA = """
+local f = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], 3600)
+redis.call('SET', KEYS[2], ARGV[1], 'EX', 3600)
+if tonumber(f) >= tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[3], 'open', 'EX', 3600)
+end
+return f
+"""
 
 
 class CircuitState(str, Enum):
@@ -33,6 +56,10 @@ class CircuitOpenError(Exception):
         super().__init__(message or f"Circuit open for {service}")
 
 
+# Single writer keeps Redis writes off the call path and ordered per breaker
+_redis_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cb-redis")
+
+
 def _get_redis():
     try:
         import redis
@@ -63,40 +90,97 @@ class CircuitBreaker:
         self._state = CircuitState.CLOSED
         self._redis = _get_redis()
         self._key_prefix = f"cb:{service}"
+        self._cache_until: float = 0.0
+        self._pending: Future | None = None
+        self._redis_failures = 0
+        self._redis_disabled_until = 0.0
+        self._failure_script = None
+        self._failure_script_client = None
+
+    def _redis_usable(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_disabled_until
+
+    def _redis_succeeded(self) -> None:
+        self._redis_failures = 0
+
+    def _redis_failed(self, exc: Exception) -> None:
+        """Count connection-level errors; disable Redis for a cool-off window once they pile up."""
+        if not isinstance(exc, _REDIS_ERRORS):
+            return
+        self._redis_failures += 1
+        if self._redis_failures >= REDIS_MAX_ERRORS:
+            self._redis_disabled_until = time.monotonic() + REDIS_COOLOFF
+            self._redis_failures = 0
 
     def _load_from_redis(self) -> None:
-        if not self._redis:
+        if not self._redis_usable():
             return
+        if time.monotonic() < self._cache_until:
+            return
+        p = self._key_prefix
         try:
-            failures = self._redis.get(f"{self._key_prefix}:failures")
-            opened_at = self._redis.get(f"{self._key_prefix}:opened_at")
+            failures, state, opened_at = self._redis.mget(f"{p}:failures", f"{p}:state", f"{p}:opened_at")
             if failures is not None:
                 self._failures = int(failures)
             if opened_at is not None:
                 self._last_failure_time = float(opened_at)
-            state = self._redis.get(f"{self._key_prefix}:state")
             if state:
                 self._state = CircuitState(state.decode())
-        except Exception:
-            pass
+            self._cache_until = time.monotonic() + REDIS_CACHE_TTL
+            self._redis_succeeded()
+        except Exception as e:
+            self._redis_failed(e)
 
     def _save_to_redis(self) -> None:
-        if not self._redis:
+        """Queue a snapshot of current state for the background writer (caller holds the lock).
+        A write still waiting in the queue is superseded by the newer snapshot."""
+        if not self._redis_usable():
             return
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = _redis_writer.submit(
+            self._write_to_redis, self._failures, self._state.value, self._last_failure_time
+        )
+
+    def _write_to_redis(self, failures: int, state: str, opened_at: float | None) -> None:
         try:
             pipe = self._redis.pipeline()
-            pipe.set(f"{self._key_prefix}:failures", self._failures, ex=3600)
-            pipe.set(f"{self._key_prefix}:state", self._state.value, ex=3600)
-            if self._last_failure_time is not None:
-                pipe.set(f"{self._key_prefix}:opened_at", str(self._last_failure_time), ex=3600)
+            pipe.set(f"{self._key_prefix}:failures", failures, ex=3600)
+            pipe.set(f"{self._key_prefix}:state", state, ex=3600)
+            if opened_at is not None:
+                pipe.set(f"{self._key_prefix}:opened_at", str(opened_at), ex=3600)
             else:
                 pipe.delete(f"{self._key_prefix}:opened_at")
             pipe.execute()
-        except Exception:
-            pass
+            self._redis_succeeded()
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _incr_failures_in_redis(self, now: float) -> int | None:
+        """Run the failure Lua script on the writer thread (keeps order with queued writes).
+        Returns the shared failure count, or None when Redis is unavailable."""
+        if not self._redis_usable():
+            return None
+        if self._failure_script is None or self._failure_script_client is not self._redis:
+            self._failure_script = self._redis.register_script(_RECORD_FAILURE_LUA)
+            self._failure_script_client = self._redis
+        p = self._key_prefix
+        script = self._failure_script
+        try:
+            self._pending = _redis_writer.submit(
+                script,
+                keys=[f"{p}:failures", f"{p}:opened_at", f"{p}:state"],
+                args=[str(now), self.failure_threshold],
+            )
+            failures = int(self._pending.result())
+            self._redis_succeeded()
+            return failures
+        except Exception as e:
+            self._redis_failed(e)
+            return None
 
     def _reset_to_redis(self) -> None:
-        if not self._redis:
+        if not self._redis_usable():
             return
         try:
             self._redis.delete(
@@ -104,27 +188,33 @@ class CircuitBreaker:
                 f"{self._key_prefix}:opened_at",
                 f"{self._key_prefix}:state",
             )
-        except Exception:
-            pass
+            self._redis_succeeded()
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _current_state(self) -> CircuitState:
+        """Load (cached) state and apply OPEN -> HALF_OPEN on recovery timeout. Caller holds the lock.
+        This is the only Redis read on the call() path; _record_success/_record_failure never reload."""
+        self._load_from_redis()
+        if self._state == CircuitState.OPEN and self._last_failure_time is not None:
+            if time.time() - self._last_failure_time >= self.recovery_timeout:
+                self._state = CircuitState.HALF_OPEN
+                self._save_to_redis()
+        return self._state
 
     @property
     def state(self) -> CircuitState:
         with self._lock:
-            self._load_from_redis()
-            now = time.time()
-            if self._state == CircuitState.OPEN:
-                if self._last_failure_time is not None:
-                    if now - self._last_failure_time >= self.recovery_timeout:
-                        self._state = CircuitState.HALF_OPEN
-                        self._save_to_redis()
-            return self._state
+            return self._current_state()
 
     def call(self, fn: Callable[[], T]) -> T:
         """
         Execute fn through circuit. On open: raise CircuitOpenError.
         On success: record success (reset). On failure: record failure.
+        State is loaded once per call; the record step works on the in-memory copy.
         """
-        state = self.state
+        with self._lock:
+            state = self._current_state()
         if state == CircuitState.OPEN:
             raise CircuitOpenError(self.service)
         try:
@@ -137,7 +227,6 @@ class CircuitBreaker:
 
     def _record_success(self) -> None:
         with self._lock:
-            self._load_from_redis()
             self._failures = 0
             self._state = CircuitState.CLOSED
             self._last_failure_time = None
@@ -145,34 +234,20 @@ class CircuitBreaker:
 
     def _record_failure(self) -> None:
         with self._lock:
-            self._load_from_redis()
-            self._failures += 1
-            self._last_failure_time = time.time()
+            now = time.time()
+            shared = self._incr_failures_in_redis(now)
+            self._failures = shared if shared is not None else self._failures + 1
+            self._last_failure_time = now
             if self._failures >= self.failure_threshold:
                 self._state = CircuitState.OPEN
-            self._save_to_redis()
 
 
-# Per-service instances
-_ollama_cb: CircuitBreaker | None = None
-_telegram_cb: CircuitBreaker | None = None
-_make_cb: CircuitBreaker | None = None
-_cb_lock = threading.Lock()
+# Per-service instances, created at import; unknown services are cached on first use
+_BREAKERS: dict[str, CircuitBreaker] = {s: CircuitBreaker(s) for s in ("ollama", "telegram", "make")}
 
 
 def get_circuit_breaker(service: str) -> CircuitBreaker:
-    global _ollama_cb, _telegram_cb, _make_cb
-    with _cb_lock:
-        if service == "ollama":
-            if _ollama_cb is None:
-                _ollama_cb = CircuitBreaker("ollama")
-            return _ollama_cb
-        if service == "telegram":
-            if _telegram_cb is None:
-                _telegram_cb = CircuitBreaker("telegram")
-            return _telegram_cb
-        if service == "make":
-            if _make_cb is None:
-                _make_cb = CircuitBreaker("make")
-            return _make_cb
-    return CircuitBreaker(service)
+    cb = _BREAKERS.get(service)
+    if cb is None:
+        cb = _BREAKERS.setdefault(service, CircuitBreaker(service))
+    return cb
@@ -1,6 +1,7 @@
 """
 Centralized deduplication: fingerprint spec and 7-day window.
-Fingerprint: sha256(source_type + canonical_url + normalized_title).
+Fingerprint: blake2b-128(source_type + canonical_url + normalized_title), 32 hex chars.
+Rows ingested before the switch carry the legacy sha256 fingerprint (64 hex chars); ingest matches both.
 canonical_url strips utm params and normalizes domains (from collector.normalize).
 Policy: strict (exact fingerprint) | relaxed (title similarity via rapidfuzz if available).
 """
@@ -9,69 +10,128 @@ import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
+from sqlalchemy import exists
+
 # Re-export so pipeline and ingest use one place for canonical URL
 from apps.collector.normalize import canonicalize_url  # noqa: F401
 
 from apps.api.db.models import Item
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 
 # Configurable window (days); only treat as duplicate if same fingerprint exists with created_at >= now - DEDUPE_DAYS
 DEDUPE_DAYS = get_int_env("DEDUPE_DAYS", default=7)
 # Policy: strict (exact fingerprint only) | relaxed (title similarity, uses rapidfuzz if available)
 DEDUPE_POLICY = (os.environ.get("DEDUPE_POLICY", "strict") or "strict").lower()
+# Relaxed policy: compare against at most this many of the most recent in-window titles
+DEDUPE_RELAXED_CANDIDATES = get_int_env("DEDUPE_RELAXED_CANDIDATES", default=500)
+RELAXED_SCORE_CUTOFF = 85
 
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
     _HAS_RAPIDFUZZ = True
 except ImportError:
     _HAS_RAPIDFUZZ = False
 
+_UTC = timezone.utc
+
 
 def build_fingerprint(source_type: str, canonical_url: str, normalized_title: str) -> str:
     """
-    Deterministic fingerprint for dedup: sha256(source_type + canonical_url + normalized_title).
+    Deterministic fingerprint for dedup: blake2b(source_type + canonical_url + normalized_title, digest_size=16).
     Same title/url but different source_type yields different fingerprint.
     """
     raw = f"{source_type}\n{canonical_url}\n{normalized_title}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def legacy_fingerprint(source_type: str, canonical_url: str, normalized_title: str) -> str:
+    """Pre-blake2b fingerprint (sha256 hex). Ingest also looks this up so rows stored before the switch
+    still dedupe; such rows get the new fingerprint when refreshed."""
+    raw = f"{source_type}\n{canonical_url}\n{normalized_title}"
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def find_item(session, fingerprint: str, title: Optional[str] = None) -> Optional[Item]:
+def title_norm(title: Optional[str]) -> Optional[str]:
+    """Normalized title stored on Item.title_norm at ingest: strip + lower; empty -> None."""
+    if not title:
+        return None
+    return title.strip().lower() or None
+
+
+def find_item(
+    session,
+    fingerprint: str,
+    title: Optional[str] = None,
+    cutoff: Optional[datetime] = None,
+) -> Optional[Item]:
     """
     Return existing Item by fingerprint (strict) or title similarity (relaxed).
     In strict mode: exact fingerprint match.
     In relaxed mode: if rapidfuzz available, also check for similar titles within window.
+    Pass cutoff (from get_window_cutoff) to reuse one window across a batch.
     """
     exact = session.query(Item).filter(Item.fingerprint == fingerprint).first()
     if exact:
         return exact
+    return find_similar_item(session, title, cutoff)
+
+
+def exists_fingerprint(session, fingerprint: str) -> bool:
+    """True if an Item with this fingerprint exists (EXISTS on the unique index; no row is loaded)."""
+    return bool(session.query(exists().where(Item.fingerprint == fingerprint)).scalar())
+
+
+def find_item_created_at(session, fingerprint: str) -> Optional[datetime]:
+    """created_at of the Item with this fingerprint, or None if absent (single-column fetch)."""
+    return session.query(Item.created_at).filter(Item.fingerprint == fingerprint).scalar()
+
+
+def find_items_batch(session, fingerprints: list[str]) -> dict[str, Item]:
+    """Exact-match lookup for a whole ingest batch in one IN (...) query: {fingerprint: Item}."""
+    if not fingerprints:
+        return {}
+    rows = session.query(Item).filter(Item.fingerprint.in_(set(fingerprints))).all()
+    return {it.fingerprint: it for it in rows}
+
+
+def find_similar_item(session, title: Optional[str], cutoff: Optional[datetime] = None) -> Optional[Item]:
+    """Relaxed policy only: in-window Item with a similar title, else None (strict policy -> always None)."""
     if DEDUPE_POLICY != "relaxed" or not _HAS_RAPIDFUZZ or not title or not title.strip():
         return None
-    # Relaxed: find items in window with similar title (ratio >= 85)
-    cutoff = get_window_cutoff(DEDUPE_DAYS)
-    candidates = (
-        session.query(Item)
-        .filter(Item.created_at >= cutoff, Item.title.isnot(None))
+    # Relaxed: best similar title (ratio >= 85) among the most recent in-window items.
+    # Only (id, title_norm) are loaded; extractOne scores the whole list in one C call.
+    if cutoff is None:
+        cutoff = get_window_cutoff(DEDUPE_DAYS)
+    rows = (
+        session.query(Item.id, Item.title_norm)
+        .filter(Item.created_at >= cutoff, Item.title_norm.isnot(None))
+        .order_by(Item.created_at.desc())
+        .limit(DEDUPE_RELAXED_CANDIDATES)
         .all()
     )
-    for c in candidates:
-        if c.title and fuzz.ratio(title.strip().lower(), c.title.lower()) >= 85:
-            return c
-    return None
+    if not rows:
+        return None
+    match = process.extractOne(
+        title_norm(title),
+        [t for _, t in rows],
+        scorer=fuzz.ratio,
+        score_cutoff=RELAXED_SCORE_CUTOFF,
+    )
+    if match is None:
+        return None
+    return session.get(Item, rows[match[2]][0])
 
 
 def get_window_cutoff(window_days: int, now: Optional[datetime] = None) -> datetime:
     """Return the cutoff time: items with created_at >= this are considered in-window duplicates."""
     if now is None:
-        now = datetime.now(timezone.utc)
+        now = datetime.now(_UTC)
     return now - timedelta(days=window_days)
 
 
 def _ensure_aware(dt: datetime) -> datetime:
     """Return datetime with tzinfo=timezone.utc if naive."""
-    if dt.tzinfo is not None:
-        return dt
-    return dt.replace(tzinfo=timezone.utc)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=_UTC)
 
 
 def is_duplicate_in_window(
@@ -79,28 +139,32 @@ def is_duplicate_in_window(
     fingerprint: str,
     window_days: int = DEDUPE_DAYS,
     now: Optional[datetime] = None,
+    cutoff: Optional[datetime] = None,
 ) -> bool:
     """
     True if an item with this fingerprint exists and created_at >= now - window_days.
     Duplicate within window -> drop (don't insert new; caller may touch updated_at).
     Duplicate older than window -> allowed (caller may refresh that row).
+    A precomputed cutoff (aware) takes precedence over window_days/now.
     """
-    item = find_item(session, fingerprint)
-    if not item or not item.created_at:
+    created = find_item_created_at(session, fingerprint)
+    if created is None:
         return False
-    if now is None:
-        now = datetime.now(timezone.utc)
-    cutoff = get_window_cutoff(window_days, _ensure_aware(now))
-    created = _ensure_aware(item.created_at)
-    return created >= cutoff
+    if cutoff is None:
+        cutoff = get_window_cutoff(window_days, _ensure_aware(now) if now is not None else None)
+    return _ensure_aware(created) >= cutoff
 
 
-def created_at_in_window(item: Optional[Item], window_days: int, now: Optional[datetime] = None) -> bool:
-    """True if item.created_at >= now - window_days. Used by ingest to decide update vs refresh."""
+def created_at_in_window(
+    item: Optional[Item],
+    window_days: int,
+    now: Optional[datetime] = None,
+    cutoff: Optional[datetime] = None,
+) -> bool:
+    """True if item.created_at >= now - window_days. Used by ingest to decide update vs refresh.
+    Ingest batches compute cutoff once and pass it to skip per-item datetime work."""
     if not item or not getattr(item, "created_at", None):
         return False
-    if now is None:
-        now = datetime.now(timezone.utc)
-    cutoff = get_window_cutoff(window_days, _ensure_aware(now))
-    created = _ensure_aware(item.created_at)
-    return created >= cutoff
+    if cutoff is None:
+        cutoff = get_window_cutoff(window_days, _ensure_aware(now) if now is not None else None)
+    return _ensure_aware(item.created_at) >= cutoff
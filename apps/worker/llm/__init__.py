@@ -3,6 +3,7 @@ from .ollama_client import (
     classify_async,
     generate,
     generate_async,
+    run_batch_async,
     run_classify_then_generate,
     run_classify_then_generate_async,
 )
@@ -13,6 +14,7 @@ __all__ = [
     "classify_async",
     "generate",
     "generate_async",
+    "run_batch_async",
     "run_classify_then_generate",
     "run_classify_then_generate_async",
     "ClassifyResult",
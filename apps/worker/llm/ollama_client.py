@@ -9,12 +9,18 @@ OLLAMA_MODE: native (default) uses /api/chat; openai_compat uses /v1/chat/comple
 import asyncio
 import os
 import re
+import threading
 import time
-from typing import Optional
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Optional, TypeVar
 
 import httpx
+import orjson
+from pydantic import TypeAdapter
 
 from apps.worker.cache import (
+    LocalTTLCache,
     get_llm_classify_cached,
     get_llm_generate_cached,
     prompt_hash,
@@ -23,26 +29,122 @@ from apps.worker.cache import (
 )
 
 from .prompts import (
-    CLASSIFY_SYSTEM,
+    ITEM_SYSTEM,
     STRICT_JSON_REPAIR,
     classify_prompt,
     generate_prompt,
-    get_generate_system,
 )
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 
+from .semantic_cache import SemanticCache
 from .schemas import ClassifyResult, GenerateResult, validate_generate_payload
 
+# Built once: validate_json goes straight to the compiled pydantic-core validator (accepts str or bytes)
+_CLASSIFY_ADAPTER = TypeAdapter(ClassifyResult)
+_GENERATE_ADAPTER = TypeAdapter(GenerateResult)
+
 OLLAMA_REQUEST_TIMEOUT = float(os.environ.get("OLLAMA_REQUEST_TIMEOUT", "120.0"))
 MAX_JSON_RETRY = get_int_env("OLLAMA_MAX_JSON_RETRY", default=1)
 OLLAMA_MODE = (os.environ.get("OLLAMA_MODE", "native") or "native").lower()
+_MODE_OPENAI = OLLAMA_MODE == "openai_compat"
 OLLAMA_BASE_URL_DEFAULT = "http://ollama:11434"
+# Native mode: keep the model (and its prefix KV cache) loaded between classify and generate
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "10m") or "10m"
+# Stream chat replies and stop reading once the JSON object is complete (OLLAMA_STREAM=0: one buffered response)
+OLLAMA_STREAM = os.environ.get("OLLAMA_STREAM", "1").strip().lower() not in ("0", "false", "no")
+# Opt-in HTTP/2 (OLLAMA_HTTP2=1): concurrent calls multiplex over one connection. Needs the h2 package
+# (httpx[http2]) and is negotiated via TLS ALPN, so it only applies to an https:// Ollama (e.g. behind a proxy);
+# plain http:// stays on HTTP/1.1 keep-alive pooling.
+try:
+    import h2  # noqa: F401
+
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+OLLAMA_HTTP2 = os.environ.get("OLLAMA_HTTP2", "").strip().lower() in ("1", "true", "yes") and _H2_AVAILABLE
+# In-process memo of validated results in front of the Redis LLM cache (results are shared: treat as read-only)
+LLM_LOCAL_CACHE_SIZE = get_int_env("LLM_LOCAL_CACHE_SIZE", default=4096)
+LLM_LOCAL_CACHE_SECONDS = get_int_env("LLM_LOCAL_CACHE_SECONDS", default=3600)
+_classify_mem = LocalTTLCache(LLM_LOCAL_CACHE_SIZE, LLM_LOCAL_CACHE_SECONDS)
+_generate_mem = LocalTTLCache(LLM_LOCAL_CACHE_SIZE, LLM_LOCAL_CACHE_SECONDS)
+# Negative cache: prompts whose output stayed invalid after the repair retry fail fast for a while
+# instead of spending model time again on every upstream retry (0 = disabled)
+LLM_NEGATIVE_CACHE_SECONDS = get_int_env("LLM_NEGATIVE_CACHE_SECONDS", default=300)
+_invalid_mem = LocalTTLCache(1024, LLM_NEGATIVE_CACHE_SECONDS)
+# Results longer than this (chars) are validated on a worker thread instead of the event loop
+LLM_VALIDATE_INLINE_MAX = get_int_env("LLM_VALIDATE_INLINE_MAX", default=2048)
+# Semantic cache for near-duplicate articles (title+summary embedding, cosine >= threshold). 0 = disabled.
+try:
+    SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0") or 0)
+except ValueError:
+    SEMANTIC_CACHE_THRESHOLD = 0.0
+SEMANTIC_CACHE_MODEL = os.environ.get("SEMANTIC_CACHE_MODEL", "nomic-embed-text") or "nomic-embed-text"
+SEMANTIC_CACHE_SIZE = get_int_env("SEMANTIC_CACHE_SIZE", default=2048)
+# lookup() is a linear scan (tens of ms when full): always called via asyncio.to_thread
+_semantic: Optional[SemanticCache] = (
+    SemanticCache(SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE) if 0 < SEMANTIC_CACHE_THRESHOLD <= 1 else None
+)
+# classify and generate of the same article embed the same text: one embeddings call per article
+_embed_mem = LocalTTLCache(LLM_LOCAL_CACHE_SIZE, LLM_LOCAL_CACHE_SECONDS)
+
+
+T = TypeVar("T")
+M = TypeVar("M")
+
+# One pooled AsyncClient per event loop (clients cannot be shared across loops); keep-alive
+# connections are reused by every classify/generate call made on that loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Pooled httpx.AsyncClient for the running loop; created on first use (no await, so no lock needed)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=OLLAMA_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=32, keepalive_expiry=60),
+            http2=OLLAMA_HTTP2,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_client() -> None:
+    """Close the running loop's pooled client (e.g. app shutdown for async callers with their own loop)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# Sync wrappers submit to one long-lived loop on a daemon thread, so the loop's pooled client
+# (and its keep-alive connections) survives across calls instead of dying with asyncio.run().
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop for the sync wrappers, started on first use."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="ollama-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro on the background loop and block for its result (sync wrappers)."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
 
 
 def _ollama_base_url() -> str:
     return os.environ.get("OLLAMA_BASE_URL", OLLAMA_BASE_URL_DEFAULT)
 
 
+@lru_cache(maxsize=8)
 def _normalize_base_url(url: str) -> str:
     """Strip /v1 suffix; endpoints are built per OLLAMA_MODE."""
     u = url.rstrip("/")
@@ -51,31 +153,91 @@ def _normalize_base_url(url: str) -> str:
     return u
 
 
+@lru_cache(maxsize=8)
 def _chat_endpoint(base_url: str) -> str:
     """Return full chat URL per OLLAMA_MODE."""
     base = _normalize_base_url(base_url)
-    if OLLAMA_MODE == "openai_compat":
+    if _MODE_OPENAI:
         return f"{base}/v1/chat/completions"
     return f"{base}/api/chat"
 
 
+@lru_cache(maxsize=8)
+def _embeddings_endpoint(base_url: str) -> str:
+    """Return full embeddings URL per OLLAMA_MODE."""
+    base = _normalize_base_url(base_url)
+    if _MODE_OPENAI:
+        return f"{base}/v1/embeddings"
+    return f"{base}/api/embeddings"
+
+
+async def _semantic_vector(base_url: str, title: str, summary: str, timeout: float) -> Optional[list[float]]:
+    """Embedding of title+summary for the semantic cache; None when disabled or the call fails (cache is best-effort)."""
+    if _semantic is None:
+        return None
+    text = f"{title}\n{summary}".strip()
+    if not text:
+        return None
+    key = (SEMANTIC_CACHE_MODEL, text)
+    vec = _embed_mem.get(key)
+    if vec is not None:
+        return vec
+    try:
+        if _MODE_OPENAI:
+            payload = {"model": SEMANTIC_CACHE_MODEL, "input": text}
+        else:
+            payload = {"model": SEMANTIC_CACHE_MODEL, "prompt": text, "keep_alive": OLLAMA_KEEP_ALIVE}
+        resp = await _get_client().post(_embeddings_endpoint(base_url), json=payload, timeout=timeout)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        vec = (data["data"][0] if _MODE_OPENAI else data)["embedding"]
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError, TypeError):
+        return None
+    if not vec:
+        return None
+    _embed_mem.set(key, vec)
+    return vec
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+# Characters that matter for brace matching; everything else is skipped by the regex engine
+_JSON_SCAN_RE = re.compile(r'[{}"\\]')
+
+
 def _extract_json(text: str) -> Optional[str]:
-    """Try to extract a single JSON object from model output (strip markdown/code fences)."""
+    """Try to extract a single JSON object from model output (strip markdown/code fences).
+    Braces inside JSON string literals are ignored when matching the closing brace."""
     if not text or not text.strip():
         return None
     text = text.strip()
+    # JSON mode (format=json) output is a single object already: no fence stripping or brace scan
+    if text[0] == "{" and text[-1] == "}":
+        return text
     if "```" in text:
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+        match = _FENCE_RE.search(text)
         if match:
             text = match.group(1).strip()
     start = text.find("{")
     if start == -1:
         return None
     depth = 0
-    for i in range(start, len(text)):
-        if text[i] == "{":
+    in_string = False
+    skip_to = -1  # position after an escaped character inside a string
+    for m in _JSON_SCAN_RE.finditer(text, start):
+        i = m.start()
+        if i < skip_to:
+            continue
+        c = m.group()
+        if in_string:
+            if c == "\\":
+                skip_to = i + 2
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
             depth += 1
-        elif text[i] == "}":
+        elif c == "}":
             depth -= 1
             if depth == 0:
                 return text[start : i + 1]
@@ -84,7 +246,7 @@ def _extract_json(text: str) -> Optional[str]:
 
 def _extract_content_from_response(data: dict) -> str:
     """Extract content from native (/api/chat) or openai_compat (/v1/chat/completions) response."""
-    if OLLAMA_MODE == "openai_compat":
+    if _MODE_OPENAI:
         choices = data.get("choices") or []
         if choices and isinstance(choices[0], dict):
             msg = choices[0].get("message") or {}
@@ -94,6 +256,64 @@ def _extract_content_from_response(data: dict) -> str:
     return (msg.get("content") or "").strip()
 
 
+def _stream_chunk(line: str) -> tuple[str, bool]:
+    """(content piece, done) from one streamed line: native NDJSON or openai_compat SSE ("data: {...}")."""
+    line = line.strip()
+    if not line:
+        return "", False
+    if _MODE_OPENAI:
+        if line.startswith("data:"):
+            line = line[5:].strip()
+        if line == "[DONE]":
+            return "", True
+        data = orjson.loads(line)
+        choices = data.get("choices") or []
+        if not choices or not isinstance(choices[0], dict):
+            return "", False
+        part = choices[0].get("delta") or choices[0].get("message") or {}
+        return part.get("content") or "", bool(choices[0].get("finish_reason"))
+    data = orjson.loads(line)
+    return (data.get("message") or {}).get("content") or "", bool(data.get("done"))
+
+
+class _JsonObjectScanner:
+    """Incremental brace matcher over streamed text: feed() each new chunk (never re-scans earlier ones);
+    returns True once the first top-level {...} has closed. Braces inside string literals are ignored."""
+
+    __slots__ = ("depth", "in_string", "escape")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape = False  # chunk ended on a backslash inside a string
+
+    def feed(self, chunk: str) -> bool:
+        skip = 0 if self.escape else -1
+        self.escape = False
+        for m in _JSON_SCAN_RE.finditer(chunk):
+            i = m.start()
+            if i == skip:
+                continue
+            c = m.group()
+            if self.in_string:
+                if c == "\\":
+                    if i + 1 == len(chunk):
+                        self.escape = True
+                    else:
+                        skip = i + 1
+                elif c == '"':
+                    self.in_string = False
+            elif c == '"':
+                self.in_string = self.depth > 0
+            elif c == "{":
+                self.depth += 1
+            elif c == "}" and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return True
+        return False
+
+
 async def _chat_async(
     base_url: str,
     model: str,
@@ -103,23 +323,51 @@ async def _chat_async(
     timeout: float = OLLAMA_REQUEST_TIMEOUT,
     operation: str = "chat",
 ) -> str:
-    """POST to chat endpoint; return combined response content. Non-blocking with timeout."""
+    """POST to chat endpoint; return combined response content. Non-blocking with timeout.
+    With OLLAMA_STREAM (default) the reply is streamed and the request is closed as soon as the first
+    JSON object is complete, so trailing model output is never generated or waited for."""
     t0 = time.perf_counter()
     url = _chat_endpoint(base_url)
+    if retry_with_repair:
+        user += STRICT_JSON_REPAIR
     payload = {
         "model": model,
         "messages": [
             {"role": "system", "content": system},
-            {"role": "user", "content": user + (STRICT_JSON_REPAIR if retry_with_repair else "")},
+            {"role": "user", "content": user},
         ],
-        "stream": False,
+        "stream": OLLAMA_STREAM,
     }
+    # Constrain output to one JSON object (native: format=json; OpenAI-compatible: response_format)
+    if _MODE_OPENAI:
+        payload["response_format"] = {"type": "json_object"}
+    else:
+        payload["format"] = "json"
+        payload["keep_alive"] = OLLAMA_KEEP_ALIVE
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(url, json=payload)
+        if not OLLAMA_STREAM:
+            resp = await _get_client().post(url, json=payload, timeout=timeout)
             resp.raise_for_status()
-        data = resp.json()
-        return _extract_content_from_response(data)
+            return _extract_content_from_response(orjson.loads(resp.content))
+        parts: list[str] = []
+        scanner = _JsonObjectScanner()
+        # httpx's timeout is per read and every streamed token resets it: cap the whole reply at timeout too.
+        # Leaving the block early closes the response: Ollama sees the disconnect and stops generating
+        try:
+            async with asyncio.timeout(timeout):
+                async with _get_client().stream("POST", url, json=payload, timeout=timeout) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        piece, done = _stream_chunk(line)
+                        if piece:
+                            parts.append(piece)
+                            if scanner.feed(piece):
+                                break
+                        if done:
+                            break
+        except TimeoutError as e:
+            raise httpx.ReadTimeout(f"{operation}: no complete reply within {timeout}s") from e
+        return "".join(parts).strip()
     finally:
         try:
             from apps.observability.metrics import record_llm_latency
@@ -130,11 +378,67 @@ async def _chat_async(
 
 def _validate_and_fill_result(json_str: str, template: str) -> GenerateResult:
     """Parse GenerateResult JSON and validate payload against template schema."""
-    result = GenerateResult.model_validate_json(json_str)
+    result = _GENERATE_ADAPTER.validate_json(json_str)
     result.payload = validate_generate_payload(result.payload, template)
     return result
 
 
+async def _validate(validate: Callable[[str], M], json_str: str) -> M:
+    """Run validate inline, or on a worker thread for large payloads so concurrent requests keep being served."""
+    if len(json_str) > LLM_VALIDATE_INLINE_MAX:
+        return await asyncio.to_thread(validate, json_str)
+    return validate(json_str)
+
+
+async def _parse_json(raw: str, validate: Callable[[str], M]) -> Optional[tuple[M, str]]:
+    """Extract the JSON object from raw and validate it once; (result, json_str) or None if invalid."""
+    json_str = _extract_json(raw)
+    if not json_str:
+        return None
+    try:
+        return await _validate(validate, json_str), json_str
+    except Exception:
+        return None
+
+
+class InvalidLLMJSONError(ValueError):
+    """Model output stayed invalid after the repair retry (the only failure the negative cache records)."""
+
+
+async def _chat_and_parse(
+    url: str,
+    model: str,
+    system: str,
+    user: str,
+    validate: Callable[[str], M],
+    timeout: float,
+    operation: str,
+) -> tuple[M, str]:
+    """
+    Chat, then extract + validate once. Only on failure (and MAX_JSON_RETRY >= 1) retry once with
+    STRICT JSON REPAIR. Returns (validated result, json_str); raises InvalidLLMJSONError if both attempts fail
+    (a plain ValueError, not negative-cached, when the repair retry is disabled).
+    """
+    raw = await _chat_async(url, model, system, user, retry_with_repair=False, timeout=timeout, operation=operation)
+    parsed = await _parse_json(raw, validate)
+    if parsed is not None:
+        return parsed
+    if MAX_JSON_RETRY < 1:
+        raise ValueError(f"Invalid {operation} JSON (repair retry disabled). Raw: {raw[:500]}...")
+    raw2 = await _chat_async(url, model, system, user, retry_with_repair=True, timeout=timeout, operation=operation)
+    parsed = await _parse_json(raw2, validate)
+    if parsed is None:
+        raise InvalidLLMJSONError(f"Invalid {operation} JSON after retry. Raw: {raw[:500]}...")
+    return parsed
+
+
+def _raise_if_known_invalid(key: Any) -> None:
+    """Fail fast for a prompt that recently produced invalid JSON twice (see LLM_NEGATIVE_CACHE_SECONDS)."""
+    error = _invalid_mem.get(key) if LLM_NEGATIVE_CACHE_SECONDS > 0 else None
+    if error is not None:
+        raise InvalidLLMJSONError(f"Cached invalid JSON (not retried): {error}")
+
+
 async def classify_async(
     title: str,
     summary: str = "",
@@ -146,34 +450,39 @@ async def classify_async(
     """
     Call Ollama with classify prompt; validate with Pydantic.
     Max retry 1: if invalid JSON, retry once with STRICT JSON REPAIR.
-    Caches by prompt hash; repeated items return cached result.
+    Caches by prompt hash; repeated items return cached result. With SEMANTIC_CACHE_THRESHOLD set,
+    a near-duplicate article (embedding similarity >= threshold) reuses its cached result too.
     """
     user = classify_prompt(title, summary, source_name)
-    cache_key = prompt_hash(model, CLASSIFY_SYSTEM, user)
+    cache_key = prompt_hash(model, ITEM_SYSTEM, user)
+    hit = _classify_mem.get(cache_key)
+    if hit is not None:
+        return hit
     cached = get_llm_classify_cached(cache_key)
     if cached:
-        return ClassifyResult.model_validate_json(cached)
+        result = _CLASSIFY_ADAPTER.validate_json(cached)
+        _classify_mem.set(cache_key, result)
+        return result
+    _raise_if_known_invalid(cache_key)
     url = base_url or _ollama_base_url()
-    raw = await _chat_async(url, model, CLASSIFY_SYSTEM, user, retry_with_repair=False, timeout=timeout, operation="classify")
-    json_str = _extract_json(raw)
-    if json_str:
-        try:
-            result = ClassifyResult.model_validate_json(json_str)
-            set_llm_classify_cached(cache_key, result.model_dump_json())
-            return result
-        except Exception:
-            pass
-    if MAX_JSON_RETRY >= 1:
-        raw2 = await _chat_async(url, model, CLASSIFY_SYSTEM, user, retry_with_repair=True, timeout=timeout, operation="classify")
-        json_str2 = _extract_json(raw2)
-        if json_str2:
-            try:
-                result = ClassifyResult.model_validate_json(json_str2)
-                set_llm_classify_cached(cache_key, result.model_dump_json())
-                return result
-            except Exception:
-                pass
-    raise ValueError(f"Invalid classify JSON after retry. Raw: {raw[:500]}...")
+    vec = await _semantic_vector(url, title, summary, timeout)
+    if vec is not None:
+        hit = await asyncio.to_thread(_semantic.lookup, ("classify", model), vec)
+        if hit is not None:
+            _classify_mem.set(cache_key, hit)
+            return hit
+    try:
+        result, json_str = await _chat_and_parse(
+            url, model, ITEM_SYSTEM, user, _CLASSIFY_ADAPTER.validate_json, timeout=timeout, operation="classify"
+        )
+    except InvalidLLMJSONError as e:
+        _invalid_mem.set(cache_key, str(e))
+        raise
+    set_llm_classify_cached(cache_key, json_str)
+    _classify_mem.set(cache_key, result)
+    if vec is not None:
+        _semantic.add(("classify", model), vec, result)
+    return result
 
 
 async def generate_async(
@@ -184,39 +493,47 @@ async def generate_async(
     model: str = "llama3.2",
     base_url: Optional[str] = None,
     timeout: float = OLLAMA_REQUEST_TIMEOUT,
+    source_name: str = "",
 ) -> GenerateResult:
     """
     Call Ollama with generate prompt; validate with Pydantic.
     Max retry 1: if invalid JSON, retry once with STRICT JSON REPAIR.
-    Caches by prompt hash; repeated items return cached result.
+    Caches by prompt hash; repeated items return cached result. With SEMANTIC_CACHE_THRESHOLD set,
+    a near-duplicate article (embedding similarity >= threshold) reuses its cached result too.
     """
-    system = get_generate_system(template)
-    user = generate_prompt(title, summary, template, risk)
+    system = ITEM_SYSTEM
+    user = generate_prompt(title, summary, template, risk, source_name)
     cache_key = prompt_hash(model, system, user)
+    mem_key = (cache_key, template)
+    hit = _generate_mem.get(mem_key)
+    if hit is not None:
+        return hit
     cached = get_llm_generate_cached(cache_key)
     if cached:
-        return _validate_and_fill_result(cached, template)
+        result = await _validate(lambda j: _validate_and_fill_result(j, template), cached)
+        _generate_mem.set(mem_key, result)
+        return result
+    _raise_if_known_invalid(mem_key)
     url = base_url or _ollama_base_url()
-    raw = await _chat_async(url, model, system, user, retry_with_repair=False, timeout=timeout, operation="generate")
-    json_str = _extract_json(raw)
-    if json_str:
-        try:
-            result = _validate_and_fill_result(json_str, template)
-            set_llm_generate_cached(cache_key, result.model_dump_json())
-            return result
-        except Exception:
-            pass
-    if MAX_JSON_RETRY >= 1:
-        raw2 = await _chat_async(url, model, system, user, retry_with_repair=True, timeout=timeout, operation="generate")
-        json_str2 = _extract_json(raw2)
-        if json_str2:
-            try:
-                result = _validate_and_fill_result(json_str2, template)
-                set_llm_generate_cached(cache_key, result.model_dump_json())
-                return result
-            except Exception:
-                pass
-    raise ValueError(f"Invalid generate JSON after retry. Raw: {raw[:500]}...")
+    semantic_ns = ("generate", model, template, risk)
+    vec = await _semantic_vector(url, title, summary, timeout)
+    if vec is not None:
+        hit = await asyncio.to_thread(_semantic.lookup, semantic_ns, vec)
+        if hit is not None:
+            _generate_mem.set(mem_key, hit)
+            return hit
+    try:
+        result, json_str = await _chat_and_parse(
+            url, model, system, user, lambda j: _validate_and_fill_result(j, template), timeout=timeout, operation="generate"
+        )
+    except InvalidLLMJSONError as e:
+        _invalid_mem.set(mem_key, str(e))
+        raise
+    set_llm_generate_cached(cache_key, json_str)
+    _generate_mem.set(mem_key, result)
+    if vec is not None:
+        _semantic.add(semantic_ns, vec, result)
+    return result
 
 
 async def run_classify_then_generate_async(
@@ -227,7 +544,8 @@ async def run_classify_then_generate_async(
     base_url: Optional[str] = None,
     timeout: float = OLLAMA_REQUEST_TIMEOUT,
 ) -> tuple[ClassifyResult, GenerateResult]:
-    """Classify then generate (async)."""
+    """Classify then generate (async). Both prompts start with the same item block, so the
+    generate call reuses the model's prefix KV cache from classify (see prompts.py)."""
     c = await classify_async(title, summary, source_name, model=model, base_url=base_url, timeout=timeout)
     g = await generate_async(
         title, summary,
@@ -236,10 +554,40 @@ async def run_classify_then_generate_async(
         model=model,
         base_url=base_url,
         timeout=timeout,
+        source_name=source_name,
     )
     return c, g
 
 
+async def run_batch_async(
+    articles: list[dict],
+    concurrency: int = 8,
+    model: str = "llama3.2",
+    base_url: Optional[str] = None,
+    timeout: float = OLLAMA_REQUEST_TIMEOUT,
+) -> list:
+    """
+    Classify then generate many articles concurrently (at most `concurrency` in flight), so one
+    article's classify overlaps another's generate over the loop's pooled connections.
+    articles: dicts with title and optional summary/source_name. Returns one entry per article, in order:
+    (ClassifyResult, GenerateResult) or the exception that article raised.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(article: dict) -> tuple[ClassifyResult, GenerateResult]:
+        async with sem:
+            return await run_classify_then_generate_async(
+                article.get("title") or "",
+                article.get("summary") or "",
+                article.get("source_name") or "",
+                model=model,
+                base_url=base_url,
+                timeout=timeout,
+            )
+
+    return await asyncio.gather(*(_one(a) for a in articles), return_exceptions=True)
+
+
 # --- Sync wrappers for compatibility ---
 
 
@@ -250,8 +598,8 @@ def classify(
     model: str = "llama3.2",
     base_url: Optional[str] = None,
 ) -> ClassifyResult:
-    """Sync wrapper: runs classify_async via asyncio.run()."""
-    return asyncio.run(classify_async(title, summary, source_name, model=model, base_url=base_url))
+    """Sync wrapper: runs classify_async on the background loop."""
+    return _run(classify_async(title, summary, source_name, model=model, base_url=base_url))
 
 
 def generate(
@@ -262,8 +610,8 @@ def generate(
     model: str = "llama3.2",
     base_url: Optional[str] = None,
 ) -> GenerateResult:
-    """Sync wrapper: runs generate_async via asyncio.run()."""
-    return asyncio.run(
+    """Sync wrapper: runs generate_async on the background loop."""
+    return _run(
         generate_async(title, summary, template=template, risk=risk, model=model, base_url=base_url)
     )
 
@@ -275,12 +623,15 @@ def run_classify_then_generate(
     model: str = "llama3.2",
     base_url: Optional[str] = None,
 ) -> tuple[ClassifyResult, GenerateResult]:
-    """Sync wrapper: runs run_classify_then_generate_async via asyncio.run(). Circuit breaker protected."""
-    from apps.worker.circuit_breaker import get_circuit_breaker
+    """Sync wrapper: runs run_classify_then_generate_async on the background loop. Circuit breaker protected."""
+    from apps.worker.circuit_breaker import CircuitOpenError, get_circuit_breaker
+    from apps.worker.llm.ollama_ensure import ollama_model_ready
 
+    if not ollama_model_ready():
+        raise CircuitOpenError("ollama", "model not ready")
     cb = get_circuit_breaker("ollama")
     return cb.call(
-        lambda: asyncio.run(
+        lambda: _run(
             run_classify_then_generate_async(
                 title, summary, source_name, model=model, base_url=base_url
             )
@@ -2,15 +2,18 @@
 Ensure Ollama model is present on worker startup. Pull via API if missing (VM-friendly).
 Uses OLLAMA_MODEL, OLLAMA_PULL_ON_START, timeout and retries. No crash-loop on pull failure.
 """
-import json
+import atexit
 import logging
 import os
+import threading
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 
 import httpx
+import orjson
 
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 from apps.worker.llm.ollama_client import OLLAMA_BASE_URL_DEFAULT
 
 logger = logging.getLogger(__name__)
@@ -21,67 +24,102 @@ PULL_TIMEOUT = get_int_env("OLLAMA_PULL_TIMEOUT_SECONDS", default=1800)
 PULL_MAX_RETRIES = get_int_env("OLLAMA_PULL_MAX_RETRIES", default=6)
 PULL_BACKOFF = get_int_env("OLLAMA_PULL_BACKOFF_SECONDS", default=20)
 PROGRESS_LOG_INTERVAL = 20
+PULL_CHUNK_SIZE = 65536
+ENSURE_RETRY_SECONDS = 300  # between background ensure attempts while the model is unavailable
 
+# Shared client: keeps the connection to Ollama alive across tags checks, pulls and retries
+_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(30.0, read=float(PULL_TIMEOUT)),
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+atexit.register(_CLIENT.close)
 
+
+# Env is read once per process, like the other module-level config above
+@lru_cache(maxsize=1)
 def _base_url() -> str:
     return os.environ.get("OLLAMA_BASE_URL", OLLAMA_BASE_URL_DEFAULT).rstrip("/")
 
 
+@lru_cache(maxsize=1)
 def _model_name() -> str:
     return (os.environ.get("OLLAMA_MODEL", OLLAMA_MODEL_DEFAULT) or OLLAMA_MODEL_DEFAULT).strip()
 
 
 def _model_present(tags: dict, want: str) -> bool:
     """True if want is in the models list (exact or prefix match for name)."""
-    models = tags.get("models") or []
+    names = {(m.get("name") or "").strip().lower() for m in tags.get("models") or []}
     want_lower = want.lower()
-    for m in models:
-        name = (m.get("name") or "").strip().lower()
-        if name == want_lower or name.startswith(want_lower + ":") or name.startswith(want_lower + "-"):
-            return True
-    return False
+    if want_lower in names:
+        return True
+    tag_prefix, variant_prefix = want_lower + ":", want_lower + "-"
+    return any(n.startswith(tag_prefix) or n.startswith(variant_prefix) for n in names)
 
 
 def _fetch_tags() -> Optional[dict]:
     try:
-        with httpx.Client(timeout=30.0) as client:
-            r = client.get(f"{_base_url()}/api/tags")
-            r.raise_for_status()
-            return r.json()
+        r = _CLIENT.get(f"{_base_url()}/api/tags", timeout=30.0)
+        r.raise_for_status()
+        return r.json()
     except Exception as e:
         logger.warning("ollama_ensure: fetch tags failed: %s", e)
         return None
 
 
+def _iter_ndjson_lines(resp: httpx.Response) -> Iterator[bytes]:
+    """Yield non-empty raw lines from an NDJSON stream, splitting byte chunks on newlines (no str decode)."""
+    buf = b""
+    for chunk in resp.iter_bytes(chunk_size=PULL_CHUNK_SIZE):
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buf.strip():
+        yield buf
+
+
+def _loads(line: bytes) -> Optional[dict]:
+    try:
+        obj = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
 def _pull_model(model: str) -> bool:
-    """Pull model via POST /api/pull. Stream progress; log at intervals. Returns True on success."""
+    """Pull model via POST /api/pull. Stream progress; log at intervals. Returns True on success.
+    Lines are only parsed when they may carry "success" or when a progress log is due."""
     url = f"{_base_url()}/api/pull"
     last_log = 0.0
+    log_progress = logger.isEnabledFor(logging.INFO)
     try:
-        with httpx.Client(timeout=float(PULL_TIMEOUT)) as client:
-            with client.stream("POST", url, json={"model": model, "stream": True}) as resp:
-                resp.raise_for_status()
-                for line in resp.iter_lines():
-                    if not line:
-                        continue
-                    try:
-                        obj = json.loads(line)
-                        status = obj.get("status", "")
-                        if status == "success":
-                            logger.info("ollama_ensure: pull completed for %s", model)
-                            return True
-                        now = time.monotonic()
-                        if now - last_log >= PROGRESS_LOG_INTERVAL:
-                            completed = obj.get("completed", 0)
-                            total = obj.get("total", 0)
-                            if total:
-                                pct = 100.0 * completed / total
-                                logger.info("ollama_ensure: pulling %s %.0f%%", model, pct)
-                            else:
-                                logger.info("ollama_ensure: pulling %s %s", model, status or "…")
-                            last_log = now
-                    except json.JSONDecodeError:
-                        pass
+        with _CLIENT.stream(
+            "POST", url, json={"model": model, "stream": True}, timeout=float(PULL_TIMEOUT)
+        ) as resp:
+            resp.raise_for_status()
+            for line in _iter_ndjson_lines(resp):
+                if b"success" in line:
+                    obj = _loads(line)
+                    if obj is not None and obj.get("status") == "success":
+                        logger.info("ollama_ensure: pull completed for %s", model)
+                        return True
+                if not log_progress:
+                    continue
+                now = time.monotonic()
+                if now - last_log < PROGRESS_LOG_INTERVAL:
+                    continue
+                obj = _loads(line)
+                if obj is None:
+                    continue
+                completed = obj.get("completed", 0)
+                total = obj.get("total", 0)
+                if total:
+                    pct = 100.0 * completed / total
+                    logger.info("ollama_ensure: pulling %s %.0f%%", model, pct)
+                else:
+                    logger.info("ollama_ensure: pulling %s %s", model, obj.get("status") or "…")
+                last_log = now
         return True
     except httpx.TimeoutException:
         logger.warning("ollama_ensure: pull timeout for %s", model)
@@ -125,3 +163,34 @@ def ensure_ollama_model() -> bool:
 
     logger.warning("ollama_ensure: model %s still not available after %s attempts", model, PULL_MAX_RETRIES)
     return False
+
+
+_ready_event = threading.Event()
+_ensure_thread: Optional[threading.Thread] = None
+_ensure_lock = threading.Lock()
+
+
+def ensure_ollama_model_async(retry_seconds: int = ENSURE_RETRY_SECONDS) -> threading.Event:
+    """
+    Run ensure_ollama_model in a daemon thread so worker boot is not blocked by tags checks or pulls.
+    Retries every retry_seconds until the model is present, then sets the returned Event. Idempotent.
+    """
+    global _ensure_thread
+
+    def _run() -> None:
+        while not ensure_ollama_model():
+            logger.info("ollama_ensure: model not available; degraded mode, retry in %ss", retry_seconds)
+            time.sleep(retry_seconds)
+        _ready_event.set()
+
+    with _ensure_lock:
+        if _ensure_thread is None:
+            _ensure_thread = threading.Thread(target=_run, name="ollama-ensure", daemon=True)
+            _ensure_thread.start()
+    return _ready_event
+
+
+def ollama_model_ready() -> bool:
+    """False only while a background ensure is running and the model is not yet available.
+    Callers that never started one (scripts, tests) are always ready."""
+    return _ensure_thread is None or _ready_event.is_set()
@@ -1,4 +1,13 @@
-"""Prompts em português: classificar (template/risk/priority) e gerar (payload por template). Apenas JSON válido, sem markdown."""
+"""Prompts em português: classificar (template/risk/priority) e gerar (payload por template). Apenas JSON válido, sem markdown.
+
+Classify e generate do mesmo item compartilham o mesmo system (ITEM_SYSTEM) e começam a mensagem de usuário
+com o mesmo bloco do item (item_block). Assim o prefixo é idêntico byte a byte nas duas chamadas e o Ollama
+(llama.cpp) reaproveita o KV cache do prefixo na segunda. Não reordene nem altere o bloco do item em uma das
+chamadas: qualquer diferença antes da tarefa quebra o reaproveitamento.
+"""
+
+ITEM_SYSTEM = """Você é o analista editorial do GNI. Cada mensagem traz um item de notícia seguido de uma tarefa.
+Responda APENAS com JSON válido, sem markdown nem texto extra."""
 
 CLASSIFY_SYSTEM = """Você classifica itens de notícia em template, risk, priority, sector, flag e se requer revisão.
 Responda APENAS com JSON válido, sem markdown nem texto extra.
@@ -6,17 +15,27 @@ Schema: {"template": string, "reason": string|null, "risk": string|null, "priori
 template deve ser "ANALISE_INTEL" ou "FLASH_SETORIAL". reason explica brevemente a classificação."""
 
 
-def classify_prompt(title: str, summary: str, source_name: str = "") -> str:
-    """Monta o prompt de usuário para classificação."""
-    parts = [f"Título: {title}"]
+def item_block(title: str, summary: str = "", source_name: str = "") -> str:
+    """Bloco do item, idêntico em classify e generate (prefixo compartilhado)."""
+    parts = ["ITEM", f"Título: {title}"]
     if summary:
         parts.append(f"Resumo: {summary}")
     if source_name:
         parts.append(f"Fonte: {source_name}")
-    parts.append("\nRetorne somente JSON: template (ANALISE_INTEL ou FLASH_SETORIAL), reason, risk, priority (P0/P1/P2), sector, flag, requires_review.")
+    parts.append("---\n")
     return "\n".join(parts)
 
 
+def classify_prompt(title: str, summary: str, source_name: str = "") -> str:
+    """Monta o prompt de usuário para classificação: bloco do item + tarefa."""
+    return (
+        item_block(title, summary, source_name)
+        + "TAREFA: classificação\n"
+        + CLASSIFY_SYSTEM
+        + "\n\nRetorne somente JSON: template (ANALISE_INTEL ou FLASH_SETORIAL), reason, risk, priority (P0/P1/P2), sector, flag, requires_review."
+    )
+
+
 # --- Generate: schema por template ---
 
 GENERATE_SYSTEM_ANALISE = """Você produz um payload de publicação no template ANALISE_INTEL a partir do item.
@@ -45,7 +64,7 @@ Responda APENAS com JSON válido: {"payload": { ... }}. Sem markdown, sem cercas
 
 
 def get_generate_system(template: str) -> str:
-    """Retorna o system prompt de geração conforme o template."""
+    """Retorna as instruções de geração conforme o template (enviadas após o bloco do item)."""
     if template == "ANALISE_INTEL":
         return GENERATE_SYSTEM_ANALISE
     if template == "FLASH_SETORIAL":
@@ -53,14 +72,13 @@ def get_generate_system(template: str) -> str:
     return GENERATE_SYSTEM_DEFAULT
 
 
-def generate_prompt(title: str, summary: str, template: str, risk: str = "") -> str:
-    """Monta o prompt de usuário para geração do draft."""
+def generate_prompt(title: str, summary: str, template: str, risk: str = "", source_name: str = "") -> str:
+    """Monta o prompt de usuário para geração do draft: bloco do item + tarefa do template."""
     parts = [
-        f"Template: {template}",
-        f"Título: {title}",
+        item_block(title, summary, source_name) + "TAREFA: geração do payload",
+        get_generate_system(template),
+        f"\nTemplate: {template}",
     ]
-    if summary:
-        parts.append(f"Resumo: {summary}")
     if risk:
         parts.append(f"Risk: {risk}")
     parts.append("\nRetorne somente JSON: {\"payload\": { ... }} com os campos exatos do template.")
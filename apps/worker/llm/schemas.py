@@ -1,7 +1,7 @@
 """Pydantic schemas for classify and generate JSON outputs. Exact bullet counts enforced."""
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 # --- Classifier ---
@@ -73,16 +73,22 @@ class GenerateResult(BaseModel):
     payload: dict[str, Any] = Field(default_factory=dict, description="Template payload (validated by template)")
 
 
+# Built once at import; validate_python goes straight to pydantic-core
+ANALISE_ADAPTER = TypeAdapter(AnaliseIntelPayload)
+FLASH_ADAPTER = TypeAdapter(FlashSetorialPayload)
+_PAYLOAD_ADAPTERS: dict[str, TypeAdapter] = {
+    "ANALISE_INTEL": ANALISE_ADAPTER,
+    "FLASH_SETORIAL": FLASH_ADAPTER,
+}
+
+
 def validate_generate_payload(payload: dict[str, Any], template: str) -> dict[str, Any]:
     """
     Validate payload against template schema. Enforces exact bullet counts.
     Returns validated payload as dict; raises pydantic.ValidationError if invalid.
     """
-    if template == "ANALISE_INTEL":
-        m = AnaliseIntelPayload.model_validate(payload)
-        return m.model_dump()
-    if template == "FLASH_SETORIAL":
-        m = FlashSetorialPayload.model_validate(payload)
-        return m.model_dump()
-    # DEFAULT or unknown: accept any dict (no strict schema)
-    return payload
+    adapter = _PAYLOAD_ADAPTERS.get(template)
+    if adapter is None:
+        # DEFAULT or unknown: accept any dict (no strict schema)
+        return payload
+    return adapter.validate_python(payload).model_dump()
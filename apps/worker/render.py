@@ -3,9 +3,9 @@ Render exact Portuguese templates: Template A (Análise de Inteligência), Templ
 Message splitting for WhatsApp when text exceeds WHATSAPP_MAX_CHARS (default 3500).
 """
 import os
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 
 # WhatsApp-safe: configurable max chars (default 3500)
 WHATSAPP_MAX_CHARS = get_int_env("WHATSAPP_MAX_CHARS", default=3500)
@@ -28,23 +28,48 @@ LABEL_EM_DESTAQUE = "Em destaque:"
 LABEL_INSIGHT = "📌 Insight:"
 
 
-def _format_bullets(items: list[str], prefix: str = BULLET_PREFIX) -> str:
-    """Format items with prefix (\t• or \t• ✅)."""
-    if not items:
-        return ""
-    return "\n".join(prefix + str(i).strip() for i in items if i is not None and str(i).strip())
+def _gs(payload: dict[str, Any], key: str) -> str:
+    """Stripped string field from payload; "" when missing or not a string."""
+    v = payload.get(key)
+    return v.strip() if isinstance(v, str) else ""
+
+
+def _format_bullets(items: list[Any], prefix: str = BULLET_PREFIX) -> str:
+    """Format items with prefix (\t• or \t• ✅). Falsy and blank items are skipped; each item is stripped once."""
+    return "\n".join(prefix + t for x in items if x and (t := str(x).strip()))
+
+
+# Generator JSON fields that identify each template's payload (anything else renders as legacy headline/body)
+_TEMPLATE_A_KEYS = ("tema", "leitura_rapida", "por_que_importa", "checklist_osint", "insight_central")
+_TEMPLATE_B_KEYS = ("setor", "linha_1", "em_destaque", "insight")
 
 
 def _is_template_a_payload(payload: dict[str, Any]) -> bool:
     """True if payload has Template A (ANALISE_INTEL) fields."""
-    return any(
-        payload.get(k) for k in ("tema", "leitura_rapida", "por_que_importa", "checklist_osint", "insight_central")
-    )
+    return any(payload.get(k) for k in _TEMPLATE_A_KEYS)
 
 
 def _is_template_b_payload(payload: dict[str, Any]) -> bool:
     """True if payload has Template B (FLASH_SETORIAL) fields."""
-    return any(payload.get(k) for k in ("setor", "linha_1", "em_destaque", "insight"))
+    return any(payload.get(k) for k in _TEMPLATE_B_KEYS)
+
+
+# Precompiled layouts: each section block is "" when absent, else ends with a blank line
+_INTEL_TEMPLATE = HEADER_INTEL + "\n\n{tema}{leitura}{por_que}{checklist}{insight}" + SEPARATOR
+_FLASH_TEMPLATE = "{header}\n\n{linha}{destaque}{insight}" + SEPARATOR
+_SECTION_BLOCK = "{label}\n{content}\n\n"
+_LINE_BLOCK = "{content}\n\n"
+_EMPTY_INTEL_BLOCKS = dict.fromkeys(("tema", "leitura", "por_que", "checklist", "insight"), "")
+_EMPTY_FLASH_BLOCKS = dict.fromkeys(("linha", "destaque", "insight"), "")
+
+
+def _section(label: str, content: str) -> str:
+    return _SECTION_BLOCK.format(label=label, content=content)
+
+
+def _body_bullets(body: str) -> str:
+    """Legacy body: one bullet per non-empty line."""
+    return "\n".join(BULLET_PREFIX + line.strip() for line in body.splitlines() if line.strip())
 
 
 def render_intelligence(payload: dict[str, Any]) -> str:
@@ -52,63 +77,49 @@ def render_intelligence(payload: dict[str, Any]) -> str:
     Template A (ANALISE_INTEL): exact Portuguese layout.
     Header, Tema:, Leitura rápida (\t•), Por que isso importa (\t•), Como validar (checklist) (\t• ✅), Insight central, separator ⸻.
     """
-    parts: list[str] = [HEADER_INTEL, ""]
+    blocks = dict(_EMPTY_INTEL_BLOCKS)
 
     if _is_template_a_payload(payload):
         # Tema
-        tema = payload.get("tema", "").strip() if payload.get("tema") else ""
+        tema = _gs(payload, "tema")
         if tema:
-            parts.append(LABEL_TEMA)
-            parts.append(tema)
-            parts.append("")
+            blocks["tema"] = _section(LABEL_TEMA, tema)
 
         # Leitura rápida (3 bullets)
         leitura = payload.get("leitura_rapida") or []
         if isinstance(leitura, list) and leitura:
-            parts.append(LABEL_LEITURA_RAPIDA)
-            parts.append(_format_bullets([str(x).strip() for x in leitura if x]))
-            parts.append("")
+            blocks["leitura"] = _section(LABEL_LEITURA_RAPIDA, _format_bullets(leitura))
 
         # Por que isso importa (2 bullets)
         por_que = payload.get("por_que_importa") or []
         if isinstance(por_que, list) and por_que:
-            parts.append(LABEL_POR_QUE_IMPORTA)
-            parts.append(_format_bullets([str(x).strip() for x in por_que if x]))
-            parts.append("")
+            blocks["por_que"] = _section(LABEL_POR_QUE_IMPORTA, _format_bullets(por_que))
 
         # Como validar (checklist OSINT) (3 items with ✅)
         checklist = payload.get("checklist_osint") or []
         if isinstance(checklist, list) and checklist:
-            parts.append(LABEL_CHECKLIST_OSINT)
-            parts.append(_format_bullets([str(x).strip() for x in checklist if x], prefix=CHECKLIST_PREFIX))
-            parts.append("")
+            blocks["checklist"] = _section(
+                LABEL_CHECKLIST_OSINT,
+                _format_bullets(checklist, prefix=CHECKLIST_PREFIX),
+            )
 
         # Insight central
-        insight = payload.get("insight_central", "").strip() if payload.get("insight_central") else ""
+        insight = _gs(payload, "insight_central")
         if insight:
-            parts.append(LABEL_INSIGHT_CENTRAL)
-            parts.append(insight)
-            parts.append("")
+            blocks["insight"] = _section(LABEL_INSIGHT_CENTRAL, insight)
     else:
-        # Legacy: headline/body/bullets
-        headline = payload.get("headline", "").strip() if payload.get("headline") else ""
-        body = payload.get("body", "").strip() if payload.get("body") else ""
+        # Legacy: headline/body/bullets (fill the template slots in order)
+        headline = _gs(payload, "headline")
+        body = _gs(payload, "body")
         bullets = payload.get("bullets") or []
         if headline:
-            parts.append(LABEL_TEMA)
-            parts.append(headline)
-            parts.append("")
+            blocks["tema"] = _section(LABEL_TEMA, headline)
         if body:
-            for line in body.splitlines():
-                if line.strip():
-                    parts.append(BULLET_PREFIX + line.strip())
-            parts.append("")
+            blocks["leitura"] = _LINE_BLOCK.format(content=_body_bullets(body))
         if isinstance(bullets, list) and bullets:
-            parts.append(_format_bullets([str(b).strip() for b in bullets if b]))
-            parts.append("")
+            blocks["por_que"] = _LINE_BLOCK.format(content=_format_bullets(bullets))
 
-    parts.append(SEPARATOR)
-    return "\n".join(parts).strip("\n")
+    return _INTEL_TEMPLATE.format_map(blocks)
 
 
 def render_sector_flash(sector: str, flag: str, payload: dict[str, Any]) -> str:
@@ -117,84 +128,82 @@ def render_sector_flash(sector: str, flag: str, payload: dict[str, Any]) -> str:
     Header 🚨 GNI | {Setor} {flag}, Em destaque: (\t•), 📌 Insight: ..., separator ⸻.
     """
     # Use payload setor/flag_emoji when available (from generator)
-    s = payload.get("setor", sector or "").strip() or sector or "Setor"
-    f = payload.get("flag_emoji", flag or "").strip() or flag or ""
-    header = f"{HEADER_FLASH_PREFIX} {s} {f}".rstrip()
-
-    parts: list[str] = [header, ""]
+    s = _gs(payload, "setor") or (sector.strip() if sector else "") or "Setor"
+    f = _gs(payload, "flag_emoji") or (flag.strip() if flag else "")
+    blocks = dict(_EMPTY_FLASH_BLOCKS, header=f"{HEADER_FLASH_PREFIX} {s} {f}".rstrip())
 
     if _is_template_b_payload(payload):
         # linha_1 (first line)
-        linha_1 = payload.get("linha_1", "").strip() if payload.get("linha_1") else ""
+        linha_1 = _gs(payload, "linha_1")
         if linha_1:
-            parts.append(linha_1)
-            parts.append("")
+            blocks["linha"] = _LINE_BLOCK.format(content=linha_1)
 
         # Em destaque: (3 bullets)
         em_destaque = payload.get("em_destaque") or []
         if isinstance(em_destaque, list) and em_destaque:
-            parts.append(LABEL_EM_DESTAQUE)
-            parts.append(_format_bullets([str(x).strip() for x in em_destaque if x]))
-            parts.append("")
+            blocks["destaque"] = _section(LABEL_EM_DESTAQUE, _format_bullets(em_destaque))
 
         # 📌 Insight: ...
-        insight = payload.get("insight", "").strip() if payload.get("insight") else ""
+        insight = _gs(payload, "insight")
         if insight:
-            parts.append(f"{LABEL_INSIGHT} {insight}")
-            parts.append("")
+            blocks["insight"] = _LINE_BLOCK.format(content=f"{LABEL_INSIGHT} {insight}")
     else:
-        # Legacy: headline/body/bullets
-        headline = payload.get("headline", "").strip() if payload.get("headline") else ""
-        body = payload.get("body", "").strip() if payload.get("body") else ""
+        # Legacy: headline/body/bullets (fill the template slots in order)
+        headline = _gs(payload, "headline")
+        body = _gs(payload, "body")
         bullets = payload.get("bullets") or []
         if headline:
-            parts.append(headline)
-            parts.append("")
+            blocks["linha"] = _LINE_BLOCK.format(content=headline)
         if body:
-            parts.append(LABEL_EM_DESTAQUE)
-            for line in body.splitlines():
-                if line.strip():
-                    parts.append(BULLET_PREFIX + line.strip())
-            parts.append("")
+            blocks["destaque"] = _section(LABEL_EM_DESTAQUE, _body_bullets(body))
         if isinstance(bullets, list) and bullets:
-            parts.append(LABEL_EM_DESTAQUE)
-            parts.append(_format_bullets([str(b).strip() for b in bullets if b]))
-            parts.append("")
+            blocks["insight"] = _section(LABEL_EM_DESTAQUE, _format_bullets(bullets))
 
-    parts.append(SEPARATOR)
-    return "\n".join(parts).strip("\n")
+    return _FLASH_TEMPLATE.format_map(blocks)
 
 
-def _split_message(text: str, max_len: int) -> list[str]:
+def _iter_message_parts(text: str, max_len: int) -> Iterator[str]:
     """
-    If text exceeds max_len, split into messages. First part keeps header (first line);
+    Yield text in parts of at most max_len. First part keeps header (first line);
     subsequent parts get the rest. Preserves form: split at newline when possible.
-    Recursively splits until all parts <= max_len.
+    Each part starts with the first line of the remaining text. One cursor walks text once;
+    parts are produced as the cursor advances, so callers can start sending before the walk ends.
     """
+    n = len(text)
+    pos = 0
+    while n - pos > max_len:
+        nl = text.find("\n", pos)
+        header_end = n if nl == -1 else nl + 1
+        first_max = max_len - (header_end - pos)
+        if first_max <= 0:
+            yield text[pos : pos + max_len]
+            pos += max_len
+            continue
+        body_start = header_end
+        while body_start < n and text[body_start] == "\n":
+            body_start += 1
+        body_end = min(body_start + first_max, n)
+        last_nl = text.rfind("\n", body_start, body_end)
+        if last_nl != -1 and last_nl - body_start > first_max // 2:
+            body = text[body_start : last_nl + 1].rstrip()
+            nxt = last_nl + 1
+        else:
+            body = text[body_start:body_end]
+            nxt = body_end
+        yield (text[pos:header_end] + body).rstrip()
+        while nxt < n and text[nxt] == "\n":
+            nxt += 1
+        if nxt >= n:
+            return
+        pos = nxt
+    yield text[pos:]
+
+
+def _split_message(text: str, max_len: int) -> list[str]:
+    """Split text into messages of at most max_len (see _iter_message_parts); short text is returned as is."""
     if len(text) <= max_len:
         return [text]
-    first_line_end = text.find("\n")
-    if first_line_end == -1:
-        first_line_end = len(text)
-    header_line = text[: first_line_end + 1]
-    rest = text[first_line_end + 1 :].lstrip("\n")
-
-    first_max = max_len - len(header_line)
-    if first_max <= 0:
-        return [text[:max_len]] + _split_message(text[max_len:], max_len) if len(text) > max_len else [text]
-
-    first_body = rest[:first_max]
-    last_nl = first_body.rfind("\n")
-    if last_nl > first_max // 2:
-        first_body = first_body[: last_nl + 1].rstrip()
-        rest = rest[last_nl + 1 :].lstrip("\n")
-    else:
-        rest = rest[len(first_body):].lstrip("\n")
-
-    part1 = (header_line + first_body).rstrip()
-    if not rest:
-        return [part1]
-    return [part1] + _split_message(rest, max_len)
+    return list(_iter_message_parts(text, max_len))
 
 
 def render_intelligence_messages(
@@ -217,6 +226,54 @@ def render_sector_flash_messages(
     return _split_message(text, max_length)
 
 
+def _render_intel(payload: dict[str, Any], sector: Optional[str], flag: Optional[str]) -> str:
+    return render_intelligence(payload)
+
+
+def _render_flash(payload: dict[str, Any], sector: Optional[str], flag: Optional[str]) -> str:
+    # render_sector_flash resolves payload setor/flag_emoji over the sector/flag arguments
+    return render_sector_flash(sector or "", flag or "", payload)
+
+
+# Template name -> renderer; unknown names fall back to Template A
+_RENDERERS = {
+    "ANALISE_INTEL": _render_intel,
+    "FLASH_SETORIAL": _render_flash,
+    "DEFAULT": _render_intel,
+}
+
+
+def render_text(
+    template: str,
+    payload: dict[str, Any],
+    sector: Optional[str] = None,
+    flag: Optional[str] = None,
+) -> str:
+    """Rendered message before splitting (same template dispatch as render())."""
+    return _RENDERERS.get(template, _render_intel)(payload, sector, flag)
+
+
+def split_rendered(text: str, max_length: Optional[int] = None) -> list[str]:
+    """Split a render_text() result exactly as render() would (WHATSAPP_MAX_CHARS when max_length not given)."""
+    return _split_message(text, max_length if max_length is not None else WHATSAPP_MAX_CHARS)
+
+
+def render_stream(
+    template: str,
+    payload: dict[str, Any],
+    sector: Optional[str] = None,
+    flag: Optional[str] = None,
+    max_length: Optional[int] = None,
+) -> Iterator[str]:
+    """Like render(), but yields each message part as soon as the splitter reaches it."""
+    ml = max_length if max_length is not None else WHATSAPP_MAX_CHARS
+    text = render_text(template, payload, sector=sector, flag=flag)
+    if len(text) <= ml:
+        yield text
+    else:
+        yield from _iter_message_parts(text, ml)
+
+
 def render(
     template: str,
     payload: dict[str, Any],
@@ -228,12 +285,7 @@ def render(
     Dispatch by template name (ANALISE_INTEL -> Template A, FLASH_SETORIAL -> Template B).
     Returns list of 1 or more messages. Uses WHATSAPP_MAX_CHARS when max_length not given.
     """
-    ml = max_length if max_length is not None else WHATSAPP_MAX_CHARS
-    if template == "FLASH_SETORIAL":
-        s = payload.get("setor", sector or "").strip() or sector or "Setor"
-        f = payload.get("flag_emoji", flag or "").strip() or flag or ""
-        return render_sector_flash_messages(s, f, payload, max_length=ml)
-    return render_intelligence_messages(payload, max_length=ml)
+    return list(render_stream(template, payload, sector=sector, flag=flag, max_length=max_length))
 
 
 # Backward compat alias
@@ -1,18 +1,23 @@
 """
 Shared exponential backoff retry helper for publish (Telegram and Make).
 Max attempts configurable via PUBLISH_MAX_ATTEMPTS env (default 3).
+Backoff uses decorrelated jitter so workers hitting the same flaky upstream do not retry in lockstep;
+total time (calls + sleeps) is capped by PUBLISH_MAX_TOTAL_SECONDS.
 CircuitOpenError: no retry (circuit open, service unavailable).
 """
 import os
+import random
 import time
 from typing import Callable, TypeVar
 
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 
 T = TypeVar("T")
 
 PUBLISH_MAX_ATTEMPTS = get_int_env("PUBLISH_MAX_ATTEMPTS", default=3)
 BACKOFF_BASE = float(os.environ.get("PUBLISH_BACKOFF_BASE") or "1.0")
+MAX_BACKOFF = float(os.environ.get("PUBLISH_MAX_BACKOFF") or "30.0")
+MAX_TOTAL_SECONDS = float(os.environ.get("PUBLISH_MAX_TOTAL_SECONDS") or "120.0")
 
 # Import for "no retry" check; avoid circular import
 def _is_circuit_open(e: Exception) -> bool:
@@ -27,15 +32,20 @@ def run_with_retry(
     fn: Callable[[], T],
     max_attempts: int | None = None,
     backoff_base: float | None = None,
+    max_total: float | None = None,
 ) -> tuple[bool, T | Exception, int]:
     """
-    Run callable with exponential backoff on exception.
+    Run callable with jittered exponential backoff on exception.
+    Sleep before retry n is uniform(base, 3 * previous sleep), capped at MAX_BACKOFF.
+    Stops early once max_total seconds (default MAX_TOTAL_SECONDS) have elapsed.
     Returns (success, result_or_exception, attempts_used).
     CircuitOpenError: fail immediately, no retry (service circuit open).
     """
     attempts = max_attempts if max_attempts is not None else PUBLISH_MAX_ATTEMPTS
     base = backoff_base if backoff_base is not None else BACKOFF_BASE
+    deadline = time.monotonic() + (max_total if max_total is not None else MAX_TOTAL_SECONDS)
     last_error: Exception | None = None
+    delay = base
     for attempt in range(1, attempts + 1):
         try:
             result = fn()
@@ -45,5 +55,9 @@ def run_with_retry(
             if _is_circuit_open(e):
                 return False, e, attempt
         if attempt < attempts:
-            time.sleep(base * (2 ** (attempt - 1)))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, last_error, attempt
+            delay = min(MAX_BACKOFF, random.uniform(base, delay * 3))
+            time.sleep(min(delay, remaining))
     return False, last_error or RuntimeError("retry exhausted"), attempts
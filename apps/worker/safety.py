@@ -1,10 +1,13 @@
 """
 Publish safety: assert_publish_allowed reads Settings from DB.
 If pause_all_publish is true, raises PublishPausedError (controlled exception).
+The flag is cached in-process for PAUSE_CACHE_TTL seconds, so a pause/resume takes effect within that window.
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import os
+import time
+from typing import TYPE_CHECKING, Optional
 
 from apps.api.db.models import Settings
 
@@ -12,6 +15,18 @@ if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
 
+PAUSE_CACHE_TTL = float(os.environ.get("PUBLISH_PAUSE_CACHE_SECONDS") or "5.0")
+
+# (monotonic time read, paused)
+_pause_cache: Optional[tuple[float, bool]] = None
+
+
+def clear_pause_cache() -> None:
+    """Drop the cached pause flag; the next assert_publish_allowed reads Settings again."""
+    global _pause_cache
+    _pause_cache = None
+
+
 class PublishPausedError(Exception):
     """Raised when publish is blocked because pause_all_publish is true in Settings."""
 
@@ -23,6 +38,14 @@ def assert_publish_allowed(session: "Session") -> None:
     Read Settings from DB; if pause_all_publish is True, raise PublishPausedError.
     Call before any publish (Telegram or Make) so the pipeline can skip publish and log the block.
     """
-    row = session.query(Settings).first()
-    if row is not None and getattr(row, "pause_all_publish", False):
+    global _pause_cache
+    now = time.monotonic()
+    cached = _pause_cache
+    if cached is not None and now - cached[0] < PAUSE_CACHE_TTL:
+        paused = cached[1]
+    else:
+        row = session.query(Settings.pause_all_publish).first()
+        paused = bool(row is not None and getattr(row, "pause_all_publish", False))
+        _pause_cache = (now, paused)
+    if paused:
         raise PublishPausedError("publish blocked by pause (pause_all_publish=true)")
@@ -2,7 +2,10 @@
 Source-tier + keyword-based scoring. Fills priority (P0/P1/P2 as int 0/1/2),
 risk, template, needs_review.
 """
+import os
 import re
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -11,28 +14,71 @@ try:
 except ImportError:
     yaml = None
 
+try:
+    import ahocorasick  # optional: pyahocorasick, single-pass keyword scan
+except ImportError:
+    ahocorasick = None
+
 # Default rules if YAML not loaded
 RUMOR_INTEL_KEYWORDS = ("rumor", "rumours", "unconfirmed", "allegedly", "alleged")
 FLASH_EDITORIAL_KEYWORDS = ("announcement", "launch", "partnership", "capability", "unveiled", "released")
 TEMPLATE_ANALISE_INTEL = "ANALISE_INTEL"
 TEMPLATE_FLASH_SETORIAL = "FLASH_SETORIAL"
+# keywords.yaml is re-stat'ed at most this often; re-parsed only when its mtime changes
+KEYWORDS_CHECK_INTERVAL = 5.0
 
 
 def _keywords_path() -> Path:
     path = Path(__file__).resolve().parent.parent.parent / "data" / "keywords.yaml"
-    env_path = __import__("os").environ.get("DATA_KEYWORDS_PATH")
+    env_path = os.environ.get("DATA_KEYWORDS_PATH")
     if env_path:
         return Path(env_path)
     return path
 
 
+@lru_cache(maxsize=1)
+def _load_keywords_cached(path: str, mtime: float) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if isinstance(data, dict):
+        _index_keywords(data)
+    return data
+
+
+def _index_keywords(data: dict[str, Any]) -> dict[str, Any]:
+    """Attach lookups derived from the YAML so score_item does no per-item preparation."""
+    data["_source_tier_index"] = _build_source_tier_index(data)
+    data["_keyword_matchers"] = _build_keyword_matchers(data)
+    return data
+
+
+@lru_cache(maxsize=1)
+def _default_keywords() -> dict[str, Any]:
+    """Built-in rules (no keywords.yaml), indexed once."""
+    return _index_keywords({})
+
+
+_keywords_checked_at = 0.0
+_keywords_checked_path: Optional[Path] = None
+_keywords_data: dict[str, Any] = {}
+
+
 def load_keywords() -> dict[str, Any]:
-    """Load data/keywords.yaml."""
+    """Load data/keywords.yaml (cached; reloaded when the file changes). Treat the result as read-only."""
+    global _keywords_checked_at, _keywords_checked_path, _keywords_data
     path = _keywords_path()
-    if not path.exists() or yaml is None:
-        return {}
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    now = time.monotonic()
+    if path == _keywords_checked_path and now - _keywords_checked_at < KEYWORDS_CHECK_INTERVAL:
+        return _keywords_data
+    if yaml is None:
+        data = _default_keywords()
+    else:
+        try:
+            data = _load_keywords_cached(str(path), path.stat().st_mtime)
+        except FileNotFoundError:
+            data = _default_keywords()
+    _keywords_data, _keywords_checked_path, _keywords_checked_at = data, path, now
+    return data
 
 
 def _get_keywords_list(data: dict, key: str, default: tuple[str, ...]) -> list[str]:
@@ -42,22 +88,96 @@ def _get_keywords_list(data: dict, key: str, default: tuple[str, ...]) -> list[s
     return list(default)
 
 
-def _get_source_tier(data: dict, source_name: Optional[str]) -> int:
-    """Return tier 1 (best), 2, or 3 (lowest). Unknown source => 3."""
+def _build_source_tier_index(data: dict) -> dict[str, int]:
+    """source name -> tier from source_tiers.tier1..tier3; a name listed twice keeps its best tier."""
     tiers = (data or {}).get("source_tiers") or {}
-    name = (source_name or "").strip()
+    index: dict[str, int] = {}
     for tier_key in ("tier1", "tier2", "tier3"):
         names = tiers.get(tier_key)
-        if isinstance(names, list) and name in names:
-            return int(tier_key.replace("tier", ""))
-    return 3
+        if isinstance(names, list):
+            tier = int(tier_key.replace("tier", ""))
+            for n in names:
+                if isinstance(n, str):
+                    index.setdefault(n, tier)
+    return index
+
+
+def _get_source_tier(data: dict, source_name: Optional[str]) -> int:
+    """Return tier 1 (best), 2, or 3 (lowest). Unknown source => 3.
+    Loaded keywords carry a prebuilt name -> tier index; other dicts get one built on the fly."""
+    index = (data or {}).get("_source_tier_index")
+    if index is None:
+        index = _build_source_tier_index(data)
+    return index.get((source_name or "").strip(), 3)
+
+
+@lru_cache(maxsize=32)
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern:
+    """One compiled whole-word alternation for a keyword list (keywords already lowercased)."""
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b")
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _at_word_boundary(text: str, i: int) -> bool:
+    """Same test as regex \\b at index i."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+@lru_cache(maxsize=8)
+def _keyword_automaton(rumor_kw: tuple[str, ...], flash_kw: tuple[str, ...]):
+    """Aho-Corasick automaton over both keyword lists; each word maps to (word length, its categories).
+    Keyword lists only change with keywords.yaml, so this is rebuilt once per file version."""
+    cats: dict[str, set[str]] = {}
+    for cat, keywords in (("rumor", rumor_kw), ("flash", flash_kw)):
+        for kw in keywords:
+            if kw:
+                cats.setdefault(kw, set()).add(cat)
+    automaton = ahocorasick.Automaton()
+    for kw, kw_cats in cats.items():
+        automaton.add_word(kw, (len(kw), frozenset(kw_cats)))
+    if cats:
+        automaton.make_automaton()
+    return automaton if cats else None
+
+
+def _build_keyword_matchers(data: dict) -> dict[str, Any]:
+    """Compile both keyword categories once: a whole-word regex per list and, with pyahocorasick,
+    one automaton shared by both lists."""
+    rumor_kw = tuple(_get_keywords_list(data, "rumor_intel", RUMOR_INTEL_KEYWORDS))
+    flash_kw = tuple(_get_keywords_list(data, "flash_editorial", FLASH_EDITORIAL_KEYWORDS))
+    return {
+        "rumor_re": _keyword_pattern(rumor_kw) if rumor_kw else None,
+        "flash_re": _keyword_pattern(flash_kw) if flash_kw else None,
+        "automaton": _keyword_automaton(rumor_kw, flash_kw) if ahocorasick is not None else None,
+    }
 
 
-def _text_contains_any(text: str, keywords: list[str]) -> bool:
-    if not text or not keywords:
-        return False
-    lower = text.lower()
-    return any(re.search(rf"\b{re.escape(k)}\b", lower) for k in keywords)
+def _matched_categories(text: str, matchers: dict[str, Any]) -> set[str]:
+    """Which of "rumor" / "flash" have a whole-word keyword hit in text (already lowercased).
+    With pyahocorasick the text is walked once for both lists; otherwise one regex search per list."""
+    hits: set[str] = set()
+    if not text:
+        return hits
+    automaton = matchers["automaton"]
+    if automaton is None:
+        if matchers["rumor_re"] is not None and matchers["rumor_re"].search(text):
+            hits.add("rumor")
+        if matchers["flash_re"] is not None and matchers["flash_re"].search(text):
+            hits.add("flash")
+        return hits
+    for end, (length, kw_cats) in automaton.iter(text):
+        if kw_cats <= hits:
+            continue
+        if _at_word_boundary(text, end - length + 1) and _at_word_boundary(text, end + 1):
+            hits |= kw_cats
+            if len(hits) == 2:
+                break
+    return hits
 
 
 def score_item(
@@ -72,20 +192,22 @@ def score_item(
            announcement/launch/partnership/capability => template=FLASH_SETORIAL.
     """
     data = keywords_data if keywords_data is not None else load_keywords()
-    rumor_kw = _get_keywords_list(data, "rumor_intel", RUMOR_INTEL_KEYWORDS)
-    flash_kw = _get_keywords_list(data, "flash_editorial", FLASH_EDITORIAL_KEYWORDS)
+    matchers = (data or {}).get("_keyword_matchers")
+    if matchers is None:
+        matchers = _build_keyword_matchers(data)
 
-    combined = f"{title or ''} {summary or ''}"
+    combined = f"{title or ''} {summary or ''}".lower()
     risk: Optional[str] = None
     template: Optional[str] = None
     needs_review = False
 
-    if _text_contains_any(combined, rumor_kw):
+    hits = _matched_categories(combined, matchers)
+    if "rumor" in hits:
         risk = "high"
         template = TEMPLATE_ANALISE_INTEL
         needs_review = True
 
-    if _text_contains_any(combined, flash_kw) and template is None:
+    if "flash" in hits and template is None:
         template = TEMPLATE_FLASH_SETORIAL
 
     if template is None:
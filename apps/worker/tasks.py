@@ -5,35 +5,37 @@ Internal scheduler: run every RUN_EVERY_MINUTES.
 Uses batch operations and bounded parallelism to reduce DB round trips.
 Graceful shutdown: SIGTERM stops new work, finishes current task or exits.
 """
+import asyncio
 import os
+import queue
 import signal
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, NamedTuple, Optional
 
 # Ensure repo root on path when run as __main__ or from worker container
 _repo = Path(__file__).resolve().parent.parent.parent
 if str(_repo) not in sys.path:
     sys.path.insert(0, str(_repo))
 
-from sqlalchemy import func
+from sqlalchemy import update
 
 from apps.api.db import SessionLocal, init_db
 from apps.shared.config import ConfigError, validate_config
-from apps.shared.env_helpers import parse_int
+from apps.shared.env_helpers import get_int_env
 from apps.shared.env_validation import EnvValidationError, validate_env
 from apps.api.db.models import DeadLetterQueue, Draft, EventsLog, Item, Publication
 from apps.api.settings import get_settings
 from apps.worker.cache import get_score_cached, set_score_cached
 from apps.worker.scoring import score_item
 from apps.worker.llm import run_classify_then_generate
-from apps.worker.llm.ollama_ensure import ensure_ollama_model
-from apps.worker.render import render
+from apps.worker.llm.ollama_ensure import ensure_ollama_model_async, ollama_model_ready
+from apps.worker.render import render_text, split_rendered
 from apps.worker.safety import PublishPausedError, assert_publish_allowed
 from apps.publisher.telegram import publish_telegram
 from apps.publisher.whatsapp_web import send_whatsapp_web, WhatsAppWebResult
@@ -67,11 +69,14 @@ def _log_info(msg: str, **kw: Any) -> None:
 RUN_EVERY_MINUTES = get_int_env("RUN_EVERY_MINUTES", default=15)
 TELEGRAM_SINCE_MINUTES = get_int_env("TELEGRAM_SINCE_MINUTES", default=60)
 PUBLISH_MAX_WORKERS = get_int_env("PUBLISH_MAX_WORKERS", default=4)
+# Concurrent classify+generate calls per LLM step (they share the Ollama client's pooled connections)
+LLM_MAX_WORKERS = get_int_env("LLM_MAX_WORKERS", default=4)
 MAX_PIPELINE_ATTEMPTS = get_int_env("MAX_PIPELINE_ATTEMPTS", default=3)
 DRY_RUN = os.environ.get("DRY_RUN", "").lower() in ("1", "true", "yes")
-
-# Serialize rate limit check to avoid Redis race; each worker acquires before check+increment
-_rate_limit_lock = threading.Lock()
+# Streaming pipeline: publish drafts while the LLM stage is still drafting (chunks handed over via a bounded queue)
+PIPELINE_STREAMING = os.environ.get("PIPELINE_STREAMING", "").lower() in ("1", "true", "yes")
+PIPELINE_STREAM_CHUNK = get_int_env("PIPELINE_STREAM_CHUNK", default=5)
+PIPELINE_QUEUE_SIZE = get_int_env("PIPELINE_QUEUE_SIZE", default=4)
 
 
 def _dry_run() -> bool:
@@ -88,7 +93,10 @@ def step_scoring(limit: int = 100, item_ids: Optional[list[int]] = None) -> int:
     init_db()
     session = SessionLocal()
     try:
-        q = session.query(Item).filter(Item.status == "new")
+        # Only the columns scoring reads: plain rows, no ORM instances (writes go by id)
+        q = session.query(
+            Item.id, Item.fingerprint, Item.title, Item.summary, Item.source_name
+        ).filter(Item.status == "new")
         if item_ids:
             q = q.filter(Item.id.in_(item_ids))
         items = q.limit(limit).all()
@@ -128,14 +136,63 @@ def step_scoring(limit: int = 100, item_ids: Optional[list[int]] = None) -> int:
         session.close()
 
 
-def step_llm_draft(limit: int = 20, item_ids: Optional[list[int]] = None) -> int:
-    """For items status=scored: classify+generate, create Draft, set status=drafted. On error set status=failed."""
+def step_llm_draft(
+    limit: int = 20,
+    item_ids: Optional[list[int]] = None,
+    on_drafted: Optional[Callable[[list[int]], None]] = None,
+) -> int:
+    """For items status=scored: classify+generate, create Draft, set status=drafted. On error set status=failed.
+    With on_drafted, commits every PIPELINE_STREAM_CHUNK items and passes the drafted ids downstream."""
     span = _tracer.start_as_current_span("step_llm_draft") if _tracer else _null_ctx()
     with span:
-        return _step_llm_draft_impl(limit=limit, item_ids=item_ids)
+        return _step_llm_draft_impl(limit=limit, item_ids=item_ids, on_drafted=on_drafted)
 
 
-def _step_llm_draft_impl(limit: int = 20, item_ids: Optional[list[int]] = None) -> int:
+def _llm_one(
+    item: Any, model: str, base_url: str, now: datetime
+) -> tuple[Optional[Draft], dict[str, Any], Optional[DeadLetterQueue]]:
+    """Classify+generate one item (no DB access; safe on a worker thread).
+    Returns (draft or None, Item update mapping, DLQ row when attempts are exhausted)."""
+    try:
+        c, g = run_classify_then_generate(
+            title=item.title or "",
+            summary=item.summary or "",
+            source_name=item.source_name or "",
+            model=model,
+            base_url=base_url,
+        )
+        payload = g.payload or {}
+        return (
+            Draft(item_id=item.id, data=payload, rendered_text=None),
+            {"id": item.id, "template": c.template, "status": "drafted", "last_error": None, "updated_at": now},
+            None,
+        )
+    except Exception as e:
+        err = str(e)[:500]
+        retry_count = (item.retry_count or 0) + 1
+        update_row = {
+            "id": item.id,
+            "status": "scored",
+            "last_error": err,
+            "retry_count": retry_count,
+            "updated_at": now,
+        }
+        if retry_count < MAX_PIPELINE_ATTEMPTS:
+            return None, update_row, None
+        update_row["status"] = "dlq"
+        dlq = DeadLetterQueue(item_id=item.id, stage="llm_draft", error=err, attempts=retry_count, last_seen=now)
+        return None, update_row, dlq
+
+
+def _step_llm_draft_impl(
+    limit: int = 20,
+    item_ids: Optional[list[int]] = None,
+    on_drafted: Optional[Callable[[list[int]], None]] = None,
+) -> int:
+    if not ollama_model_ready():
+        # Model still being checked/pulled in the background: leave items scored (queued) without burning retries
+        _log_info("step_llm_draft skipped: Ollama model not ready")
+        return 0
     init_db()
     session = SessionLocal()
     dry_run = _dry_run()
@@ -144,71 +201,42 @@ def _step_llm_draft_impl(limit: int = 20, item_ids: Optional[list[int]] = None)
     base_url = os.environ.get("OLLAMA_BASE_URL", OLLAMA_BASE_URL_DEFAULT)
     model = os.environ.get("OLLAMA_MODEL", "qwen2.5:7b")
     try:
-        q = session.query(Item).filter(Item.status == "scored")
+        # Only the columns _llm_one reads: plain rows, no ORM instances (writes go by id)
+        q = session.query(
+            Item.id, Item.title, Item.summary, Item.source_name, Item.retry_count
+        ).filter(Item.status == "scored")
         if item_ids:
             q = q.filter(Item.id.in_(item_ids))
         items = q.limit(limit).all()
         if not items:
             return 0
-        drafts_to_add = []
-        item_updates = []
-        now = datetime.now(timezone.utc)
-        for item in items:
-            try:
-                title = item.title or ""
-                summary = item.summary or ""
-                source_name = item.source_name or ""
-                c, g = run_classify_then_generate(
-                    title=title,
-                    summary=summary,
-                    source_name=source_name,
-                    model=model,
-                    base_url=base_url,
-                )
-                payload = g.payload or {}
-                drafts_to_add.append(
-                    Draft(item_id=item.id, data=payload, rendered_text=None)
-                )
-                item_updates.append({
-                    "id": item.id,
-                    "template": c.template,
-                    "status": "drafted",
-                    "last_error": None,
-                    "updated_at": now,
-                })
-            except Exception as e:
-                err = str(e)[:500]
-                retry_count = (item.retry_count or 0) + 1
-                if retry_count >= MAX_PIPELINE_ATTEMPTS:
-                    session.add(
-                        DeadLetterQueue(
-                            item_id=item.id,
-                            stage="llm_draft",
-                            error=err,
-                            attempts=retry_count,
-                            last_seen=now,
-                        )
-                    )
-                    item_updates.append({
-                        "id": item.id,
-                        "status": "dlq",
-                        "last_error": err,
-                        "retry_count": retry_count,
-                        "updated_at": now,
-                    })
-                else:
-                    item_updates.append({
-                        "id": item.id,
-                        "status": "scored",
-                        "last_error": err,
-                        "retry_count": retry_count,
-                        "updated_at": now,
-                    })
-        session.add_all(drafts_to_add)
-        if item_updates:
-            session.bulk_update_mappings(Item, item_updates)
-        session.commit()
-        n = len(drafts_to_add)
+        # Batch mode: one commit for all items. Streaming: commit per chunk so drafts can be published meanwhile.
+        chunk_size = max(1, PIPELINE_STREAM_CHUNK) if on_drafted else len(items)
+        n = 0
+        for start in range(0, len(items), chunk_size):
+            drafts_to_add = []
+            item_updates = []
+            now = datetime.now(timezone.utc)
+            chunk = items[start:start + chunk_size]
+            # Ollama calls overlap across workers; DB writes stay on this thread after the chunk completes
+            if len(chunk) > 1 and LLM_MAX_WORKERS > 1:
+                with ThreadPoolExecutor(max_workers=min(LLM_MAX_WORKERS, len(chunk)), thread_name_prefix="llm") as ex:
+                    results = list(ex.map(lambda it: _llm_one(it, model, base_url, now), chunk))
+            else:
+                results = [_llm_one(it, model, base_url, now) for it in chunk]
+            for draft, update_row, dlq in results:
+                if draft is not None:
+                    drafts_to_add.append(draft)
+                if dlq is not None:
+                    session.add(dlq)
+                item_updates.append(update_row)
+            session.add_all(drafts_to_add)
+            if item_updates:
+                session.bulk_update_mappings(Item, item_updates)
+            session.commit()
+            n += len(drafts_to_add)
+            if on_drafted and drafts_to_add:
+                on_drafted([d.item_id for d in drafts_to_add])
         if _has_obs and n > 0:
             try:
                 from apps.observability.metrics import record_drafts_generated
@@ -223,26 +251,46 @@ def _step_llm_draft_impl(limit: int = 20, item_ids: Optional[list[int]] = None)
         session.close()
 
 
-def _fetch_latest_drafts_per_items(session, item_ids: list[int]) -> dict[int, Draft]:
-    """Fetch latest draft per item_id in one query. Returns {item_id: Draft}."""
-    if not item_ids:
-        return {}
-    subq = (
-        session.query(Draft.item_id, func.max(Draft.id).label("max_id"))
-        .filter(Draft.item_id.in_(item_ids))
-        .group_by(Draft.item_id)
-    ).subquery()
-    drafts = (
-        session.query(Draft)
-        .join(subq, (Draft.item_id == subq.c.item_id) & (Draft.id == subq.c.max_id))
+def _fetch_drafted_items_with_latest_draft(
+    session, limit: int, item_ids_filter: Optional[list[int]] = None
+) -> list[Any]:
+    """Drafted items with their latest draft in one query (LEFT JOIN + DISTINCT ON item), as plain rows of the
+    columns the publish step uses. Items without a draft have draft_id/draft_data None so the caller can fail them."""
+    q = (
+        session.query(
+            Item.id,
+            Item.template,
+            Item.priority,
+            Item.source_name,
+            Item.url,
+            Item.retry_count,
+            Draft.id.label("draft_id"),
+            Draft.data.label("draft_data"),
+        )
+        .outerjoin(Draft, Draft.item_id == Item.id)
+        .filter(Item.status == "drafted")
+    )
+    if item_ids_filter:
+        q = q.filter(Item.id.in_(item_ids_filter))
+    return (
+        q.distinct(Item.id)
+        .order_by(Item.id, Draft.id.desc().nulls_last())
+        .limit(limit)
         .all()
     )
-    return {d.item_id: d for d in drafts if d.item_id is not None}
+
+
+class _ItemSnapshot(NamedTuple):
+    """Item fields the publishers read (id, source_name, url); detached, so no per-task reload."""
+
+    id: int
+    source_name: Optional[str]
+    url: Optional[str]
 
 
 @dataclass
 class _PublishTask:
-    """Immutable task data for parallel processing."""
+    """Immutable task data for parallel processing (carries everything the worker needs from Item)."""
 
     item_id: int
     template: Optional[str]
@@ -251,18 +299,59 @@ class _PublishTask:
     url: Optional[str]
     draft_id: int
     draft_data: dict[str, Any]
+    retry_count: int = 0
+
+    @property
+    def item(self) -> _ItemSnapshot:
+        return _ItemSnapshot(self.item_id, self.source_name, self.url)
+
+
+class _PublishOutcome(NamedTuple):
+    """Result of one publish task. failed=True: the caller must record the failure (retry_count/DLQ)."""
+
+    item_id: int
+    success: bool
+    rendered_text: Optional[str]
+    error: Optional[str]
+    failed: bool = False
+
+
+def _record_publish_failures(session, failures: list[tuple[_PublishTask, str]]) -> None:
+    """One bulk Item update (+ DLQ rows for exhausted items) for all failed tasks of a publish step."""
+    now = datetime.now(timezone.utc)
+    updates = []
+    dlq_rows = []
+    for task, err in failures:
+        retry_count = task.retry_count + 1
+        to_dlq = retry_count >= MAX_PIPELINE_ATTEMPTS
+        if to_dlq:
+            dlq_rows.append(
+                DeadLetterQueue(item_id=task.item_id, stage="publish", error=err, attempts=retry_count, last_seen=now)
+            )
+        updates.append({
+            "id": task.item_id,
+            "status": "dlq" if to_dlq else "drafted",
+            "last_error": err,
+            "retry_count": retry_count,
+            "updated_at": now,
+        })
+    session.add_all(dlq_rows)
+    session.bulk_update_mappings(Item, updates)
 
 
 def _process_single_item(
     task: _PublishTask,
     settings: dict[str, Any],
     dry_run: bool,
-) -> tuple[int, bool, Optional[str], Optional[str]]:
+) -> "_PublishOutcome":
     """
     Process one item: rate limit (with lock), render, publish, update DB.
-    Uses own session; commits atomically. Returns (item_id, success, rendered_text, error).
+    Uses own session; success commits atomically with the publish. A failure is returned (failed=True) for
+    the caller to record in batch; a rate-limited item is not a failure (no retry is consumed).
     """
     session = SessionLocal()
+    # One timestamp per task: every row this task writes shares it
+    now = datetime.now(timezone.utc)
     try:
         _log_info(
             "publish_start",
@@ -271,133 +360,120 @@ def _process_single_item(
             channel="telegram,whatsapp_web,make",
         )
         if not dry_run:
-            with _rate_limit_lock:
-                try:
-                    check_rate_limit("telegram", settings=settings)
-                    check_rate_limit("whatsapp_web", settings=settings)
-                    check_rate_limit("make", settings=settings)
-                except RateLimitExceededError as rle:
-                    log_rate_limit_event(
-                        session, rle.channel, rle.limit_type, rle.current, rle.limit
-                    )
-                    session.commit()
-                    return (task.item_id, False, None, f"rate limited: {rle.channel}")
+            # check_rate_limit is atomic in Redis (check + count in one script): no Python-side lock
+            try:
+                check_rate_limit("telegram", settings=settings)
+                check_rate_limit("whatsapp_web", settings=settings)
+                check_rate_limit("make", settings=settings)
+            except RateLimitExceededError as rle:
+                log_rate_limit_event(
+                    session, rle.channel, rle.limit_type, rle.current, rle.limit
+                )
+                session.commit()
+                return _PublishOutcome(task.item_id, False, None, f"rate limited: {rle.channel}")
         payload = task.draft_data if isinstance(task.draft_data, dict) else {}
         sector = (task.source_name or "").strip() or "Sector"
         flag = ""
-        messages = render(
-            template=task.template or "DEFAULT",
-            payload=payload,
-            sector=sector,
-            flag=flag,
-        )
-        if not messages:
-            messages = [str(payload)[:1000]]
+        text = render_text(task.template or "DEFAULT", payload, sector=sector, flag=flag)
+        if not text:
+            text = str(payload)[:1000]
+        messages = split_rendered(text)
         rendered_text = "\n---\n".join(messages) if messages else ""
         priority = f"P{task.priority}" if task.priority is not None else "P2"
 
         # Per-channel success: item is published if at least one channel delivers (existing Publication rows record each)
         telegram_ok = False
         try:
-            tg_result = publish_telegram(messages, channel="telegram", dry_run=dry_run, session=session)
+            # Telegram gets the unsplit text: it re-splits at its own limit (the WhatsApp parts are not independent posts)
+            tg_result = publish_telegram([text], channel="telegram", dry_run=dry_run, session=session)
             telegram_ok = (tg_result.status == "sent") or (getattr(tg_result, "dry_run", False) and dry_run)
         except Exception as tg_err:
-            now_tg = datetime.now(timezone.utc)
-            session.add(Publication(channel="telegram", status="failed", attempts=1, published_at=now_tg))
+            session.add(Publication(channel="telegram", status="failed", attempts=1, published_at=now))
             session.flush()
             try:
                 _log_info("TELEGRAM_PUBLISH_FAILED", item_id=task.item_id, error_class=type(tg_err).__name__)
             except Exception:
                 pass
 
-        item = session.query(Item).filter(Item.id == task.item_id).first()
-        if item:
-            wa_web_result = None
-            wa_fallback_logged = False
-            try:
-                wa_web_result = send_whatsapp_web(
-                    session,
-                    item,
-                    rendered_text=rendered_text,
-                    template=task.template or "DEFAULT",
-                    dry_run=dry_run,
-                )
-            except Exception as wa_err:
-                # Fallback: network/connection failure — log Publication, continue with other channels (Make).
-                now_wa = datetime.now(timezone.utc)
-                session.add(
-                    Publication(channel="whatsapp_web", status="failed", attempts=1, published_at=now_wa)
-                )
-                session.flush()
-                wa_web_result = WhatsAppWebResult(status="failed", last_error=str(wa_err)[:500])
-                wa_fallback_logged = True
-                try:
-                    _log_info(
-                        "WHATSAPP_BLOCKED_FALLBACK",
-                        error_class=type(wa_err).__name__,
-                        error_message=str(wa_err)[:200],
-                    )
-                except Exception:
-                    pass
-
-            if wa_web_result and wa_web_result.status == "failed" and not wa_fallback_logged:
-                try:
-                    _log_info(
-                        "WHATSAPP_BLOCKED_FALLBACK",
-                        error_class="SendFailed",
-                        error_message=(wa_web_result.last_error or "unknown")[:200],
-                    )
-                except Exception:
-                    pass
-
-            wa_ok = wa_web_result and (wa_web_result.status == "sent" or (wa_web_result.dry_run and dry_run))
-
-            # Optional fallback: when whatsapp_web failed and make_webhook enabled, try make_webhook (never blocks)
-            if wa_web_result and wa_web_result.status == "failed":
-                try:
-                    mw_result = send_make_webhook(
-                        session, item,
-                        rendered_text=rendered_text,
-                        dry_run=dry_run,
-                    )
-                    if mw_result.status == "sent":
-                        try:
-                            _log_info("MAKE_WEBHOOK_FALLBACK_SUCCESS", item_id=task.item_id)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-            from apps.publisher.whatsapp_make import send_whatsapp_via_make
-
-            make_result = send_whatsapp_via_make(
+        item = task.item
+        wa_web_result = None
+        wa_fallback_logged = False
+        try:
+            wa_web_result = send_whatsapp_web(
                 session,
                 item,
                 rendered_text=rendered_text,
-                template=task.template or "ANALISE_INTEL",
-                priority=priority,
+                template=task.template or "DEFAULT",
                 dry_run=dry_run,
-                messages=messages,
             )
-            make_ok = make_result.status == "sent" or (make_result.dry_run and dry_run)
-            any_channel_ok = telegram_ok or wa_ok or make_ok
-            if make_result.status == "dead_letter" and not any_channel_ok:
-                raise RuntimeError(make_result.last_error or "Make webhook exhausted retries")
-        else:
-            any_channel_ok = telegram_ok
+        except Exception as wa_err:
+            # Fallback: network/connection failure — log Publication, continue with other channels (Make).
+            session.add(
+                Publication(channel="whatsapp_web", status="failed", attempts=1, published_at=now)
+            )
+            session.flush()
+            wa_web_result = WhatsAppWebResult(status="failed", last_error=str(wa_err)[:500])
+            wa_fallback_logged = True
+            try:
+                _log_info(
+                    "WHATSAPP_BLOCKED_FALLBACK",
+                    error_class=type(wa_err).__name__,
+                    error_message=str(wa_err)[:200],
+                )
+            except Exception:
+                pass
+
+        if wa_web_result and wa_web_result.status == "failed" and not wa_fallback_logged:
+            try:
+                _log_info(
+                    "WHATSAPP_BLOCKED_FALLBACK",
+                    error_class="SendFailed",
+                    error_message=(wa_web_result.last_error or "unknown")[:200],
+                )
+            except Exception:
+                pass
+
+        wa_ok = wa_web_result and (wa_web_result.status == "sent" or (wa_web_result.dry_run and dry_run))
+
+        # Optional fallback: when whatsapp_web failed and make_webhook enabled, try make_webhook (never blocks)
+        if wa_web_result and wa_web_result.status == "failed":
+            try:
+                mw_result = send_make_webhook(
+                    session, item,
+                    rendered_text=rendered_text,
+                    dry_run=dry_run,
+                )
+                if mw_result.status == "sent":
+                    try:
+                        _log_info("MAKE_WEBHOOK_FALLBACK_SUCCESS", item_id=task.item_id)
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+
+        from apps.publisher.whatsapp_make import send_whatsapp_via_make
+
+        make_result = send_whatsapp_via_make(
+            session,
+            item,
+            rendered_text=rendered_text,
+            template=task.template or "ANALISE_INTEL",
+            priority=priority,
+            dry_run=dry_run,
+            messages=messages,
+        )
+        make_ok = make_result.status == "sent" or (make_result.dry_run and dry_run)
+        any_channel_ok = telegram_ok or wa_ok or make_ok
+        if make_result.status == "dead_letter" and not any_channel_ok:
+            raise RuntimeError(make_result.last_error or "Make webhook exhausted retries")
 
         if not any_channel_ok:
             raise RuntimeError("No channel delivered (telegram, whatsapp_web, make)")
 
-        now = datetime.now(timezone.utc)
-        session.bulk_update_mappings(
-            Draft,
-            [{"id": task.draft_id, "rendered_text": rendered_text, "updated_at": now}],
-        )
-        session.bulk_update_mappings(
-            Item,
-            [{"id": task.item_id, "status": "published", "updated_at": now}],
+        session.execute(
+            update(Draft).where(Draft.id == task.draft_id).values(rendered_text=rendered_text, updated_at=now)
         )
+        session.execute(update(Item).where(Item.id == task.item_id).values(status="published", updated_at=now))
         session.commit()
         if _has_obs:
             try:
@@ -405,60 +481,44 @@ def _process_single_item(
                 record_publication_success()
             except ImportError:
                 pass
-        return (task.item_id, True, rendered_text, None)
+        return _PublishOutcome(task.item_id, True, rendered_text, None)
     except Exception as e:
         session.rollback()
-        err = str(e)[:500]
-        try:
-            now = datetime.now(timezone.utc)
-            item = session.query(Item).filter(Item.id == task.item_id).first()
-            if item:
-                retry_count = (item.retry_count or 0) + 1
-                if retry_count >= MAX_PIPELINE_ATTEMPTS:
-                    session.add(
-                        DeadLetterQueue(
-                            item_id=task.item_id,
-                            stage="publish",
-                            error=err,
-                            attempts=retry_count,
-                            last_seen=now,
-                        )
-                    )
-                    session.bulk_update_mappings(
-                        Item,
-                        [{
-                            "id": task.item_id,
-                            "status": "dlq",
-                            "last_error": err,
-                            "retry_count": retry_count,
-                            "updated_at": now,
-                        }],
-                    )
-                else:
-                    session.bulk_update_mappings(
-                        Item,
-                        [{
-                            "id": task.item_id,
-                            "status": "drafted",
-                            "last_error": err,
-                            "retry_count": retry_count,
-                            "updated_at": now,
-                        }],
-                    )
-            session.commit()
-        except Exception:
-            session.rollback()
         if _has_obs:
             try:
                 from apps.observability.metrics import record_publication_failure
                 record_publication_failure()
             except ImportError:
                 pass
-        return (task.item_id, False, None, err)
+        # No DB write here: the coordinator records all failures of the step in one batch
+        return _PublishOutcome(task.item_id, False, None, str(e)[:500], failed=True)
     finally:
         session.close()
 
 
+# Long-lived pool for the blocking per-item publish work (sync DB session + HTTP publishers): threads are
+# reused across pipeline runs instead of being spawned and joined every run.
+_publish_executor = ThreadPoolExecutor(max_workers=max(1, PUBLISH_MAX_WORKERS), thread_name_prefix="publish")
+
+
+async def _gather_publish(
+    tasks: list[_PublishTask], settings: dict[str, Any], dry_run: bool
+) -> list[_PublishOutcome]:
+    """Fan out publish tasks with asyncio.gather, at most PUBLISH_MAX_WORKERS in flight. One outcome per task, in order."""
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max(1, PUBLISH_MAX_WORKERS))
+
+    async def _one(task: _PublishTask) -> _PublishOutcome:
+        async with sem:
+            return await loop.run_in_executor(_publish_executor, _process_single_item, task, settings, dry_run)
+
+    results = await asyncio.gather(*(_one(t) for t in tasks), return_exceptions=True)
+    return [
+        r if isinstance(r, _PublishOutcome) else _PublishOutcome(t.item_id, False, None, str(r)[:500], failed=True)
+        for t, r in zip(tasks, results)
+    ]
+
+
 def step_render_and_publish(limit: int = 20, dry_run: bool = True, item_ids_filter: Optional[list[int]] = None) -> int:
     span = _tracer.start_as_current_span("step_render_and_publish") if _tracer else _null_ctx()
     with span:
@@ -488,23 +548,17 @@ def _step_render_and_publish_impl(limit: int = 20, dry_run: bool = True, item_id
             )
             session.commit()
             return 0
-        q = session.query(Item).filter(Item.status == "drafted")
-        if item_ids_filter:
-            q = q.filter(Item.id.in_(item_ids_filter))
-        items = q.limit(limit).all()
-        if not items:
+        rows = _fetch_drafted_items_with_latest_draft(session, limit, item_ids_filter)
+        if not rows:
             return 0
-        item_ids = [i.id for i in items]
-        draft_by_item = _fetch_latest_drafts_per_items(session, item_ids)
         settings = get_settings(session)
         now = datetime.now(timezone.utc)
 
         # Items without draft: fail upfront (single-threaded)
         item_updates = []
         tasks: list[_PublishTask] = []
-        for item in items:
-            draft = draft_by_item.get(item.id)
-            if not draft or not draft.data:
+        for item in rows:
+            if item.draft_id is None or not item.draft_data:
                 item_updates.append({
                     "id": item.id,
                     "status": "failed",
@@ -519,8 +573,9 @@ def _step_render_and_publish_impl(limit: int = 20, dry_run: bool = True, item_id
                     priority=item.priority,
                     source_name=item.source_name,
                     url=item.url,
-                    draft_id=draft.id,
-                    draft_data=draft.data if isinstance(draft.data, dict) else {},
+                    draft_id=item.draft_id,
+                    draft_data=item.draft_data if isinstance(item.draft_data, dict) else {},
+                    retry_count=item.retry_count or 0,
                 )
             )
 
@@ -531,21 +586,17 @@ def _step_render_and_publish_impl(limit: int = 20, dry_run: bool = True, item_id
         if not tasks:
             return 0
 
-        # Process publish tasks in parallel; each worker uses own session and commits atomically
-        max_workers = min(PUBLISH_MAX_WORKERS, len(tasks))
-        count = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(_process_single_item, task, settings, dry_run): task
-                for task in tasks
-            }
-            for future in as_completed(futures):
-                try:
-                    item_id, success, _, _ = future.result()
-                    if success:
-                        count += 1
-                except Exception:
-                    pass  # _process_single_item catches and updates DB
+        # Process publish tasks concurrently; each worker uses own session and commits atomically
+        outcomes = asyncio.run(_gather_publish(tasks, settings, dry_run))
+        count = sum(1 for o in outcomes if o.success)
+        failures = [(t, o.error or "publish failed") for t, o in zip(tasks, outcomes) if o.failed]
+        if failures:
+            try:
+                _record_publish_failures(session, failures)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                _log_info("Publish failure bookkeeping failed", error=str(e), items=len(failures))
 
         if _has_obs and count > 0:
             record_pipeline_step("publish", count)
@@ -557,6 +608,57 @@ def _step_render_and_publish_impl(limit: int = 20, dry_run: bool = True, item_id
         session.close()
 
 
+def _drafted_item_ids(limit: int, item_ids: Optional[list[int]] = None) -> list[int]:
+    """Ids of items already drafted (publish backlog), up to limit."""
+    session = SessionLocal()
+    try:
+        q = session.query(Item.id).filter(Item.status == "drafted")
+        if item_ids:
+            q = q.filter(Item.id.in_(item_ids))
+        return [row[0] for row in q.order_by(Item.id).limit(limit).all()]
+    finally:
+        session.close()
+
+
+def _draft_and_publish_streaming(dry_run: bool, item_ids: Optional[list[int]] = None) -> tuple[int, int]:
+    """
+    LLM draft and publish overlapped: a publisher thread consumes chunks of freshly drafted ids from a
+    bounded queue while the LLM stage keeps drafting. The existing drafted backlog is snapshotted first
+    and published by the same thread, so backlog and new drafts never overlap. Status is still committed
+    per chunk, so a crash mid-run resumes from the DB like the staged pipeline.
+    Returns (drafted, published).
+    """
+    init_db()
+    backlog = _drafted_item_ids(20, item_ids)
+    chunks: "queue.Queue[Optional[list[int]]]" = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    published = [0]
+
+    def _publish(ids: list[int]) -> None:
+        try:
+            published[0] += step_render_and_publish(dry_run=dry_run, limit=len(ids), item_ids_filter=ids)
+        except Exception as e:
+            # Items stay drafted and are retried next cycle; keep consuming so the LLM stage never blocks
+            _log_info("Pipeline publish error", error=str(e))
+
+    def _publisher() -> None:
+        if backlog:
+            _publish(backlog)
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            _publish(chunk)
+
+    consumer = threading.Thread(target=_publisher, name="pipeline-publish", daemon=True)
+    consumer.start()
+    try:
+        drafted = step_llm_draft(item_ids=item_ids, on_drafted=chunks.put)
+    finally:
+        chunks.put(None)
+        consumer.join()
+    return drafted, published[0]
+
+
 def run_pipeline(
     dry_run: Optional[bool] = None,
     ingest_limit: Optional[int] = None,
@@ -565,6 +667,7 @@ def run_pipeline(
     """
     Run full pipeline once: scoring → LLM draft → render & publish.
     Ingest is handled by the collector service. Idempotency: each step processes items by status.
+    With PIPELINE_STREAMING, publish overlaps the LLM stage (see _draft_and_publish_streaming).
     When item_ids is provided, only those items are processed.
     """
     if dry_run is None:
@@ -580,8 +683,11 @@ def run_pipeline(
     }
     t0 = time.perf_counter()
     out["scoring"] = step_scoring(item_ids=item_ids)
-    out["llm_draft"] = step_llm_draft(item_ids=item_ids)
-    out["publish"] = step_render_and_publish(dry_run=dry_run, item_ids_filter=item_ids)
+    if PIPELINE_STREAMING:
+        out["llm_draft"], out["publish"] = _draft_and_publish_streaming(dry_run, item_ids)
+    else:
+        out["llm_draft"] = step_llm_draft(item_ids=item_ids)
+        out["publish"] = step_render_and_publish(dry_run=dry_run, item_ids_filter=item_ids)
     elapsed = time.perf_counter() - t0
     if _has_obs:
         try:
@@ -592,12 +698,12 @@ def run_pipeline(
     return out
 
 
-_worker_shutdown = False
+# Set on SIGTERM/SIGINT; the scheduler waits on it between runs, so shutdown wakes it immediately
+_worker_shutdown = threading.Event()
 
 
 def _worker_sigterm(signum, frame):
-    global _worker_shutdown
-    _worker_shutdown = True
+    _worker_shutdown.set()
 
 
 DEGRADED_RETRY_SECONDS = 300  # 5 min between retries when Ollama model not available
@@ -605,7 +711,6 @@ DEGRADED_RETRY_SECONDS = 300  # 5 min between retries when Ollama model not avai
 
 def run_scheduler() -> None:
     """Loop: run_pipeline() every RUN_EVERY_MINUTES. Handles SIGTERM: stops new work, finishes current task."""
-    global _worker_shutdown
     try:
         validate_env(role="worker")
     except (ConfigError, EnvValidationError) as e:
@@ -614,18 +719,9 @@ def run_scheduler() -> None:
     signal.signal(signal.SIGTERM, _worker_sigterm)
     signal.signal(signal.SIGINT, _worker_sigterm)
 
-    # Ensure Ollama model (pull if missing). If not available, degraded mode: retry until present (no crash-loop).
-    while not _worker_shutdown:
-        if ensure_ollama_model():
-            break
-        _log_info(
-            "Ollama model not available; degraded mode. Will retry pull in %s min.",
-            DEGRADED_RETRY_SECONDS // 60,
-        )
-        for _ in range(DEGRADED_RETRY_SECONDS):
-            if _worker_shutdown:
-                return
-            time.sleep(1)
+    # Ensure Ollama model (pull if missing) in the background; until it is present the LLM step is skipped
+    # (degraded mode: items stay scored, retried every DEGRADED_RETRY_SECONDS). Scoring and publish run meanwhile.
+    ensure_ollama_model_async(retry_seconds=DEGRADED_RETRY_SECONDS)
 
     interval_sec = max(1, RUN_EVERY_MINUTES * 60)
     dry_run = _dry_run()
@@ -634,7 +730,7 @@ def run_scheduler() -> None:
         _log_info("step_llm_draft signature check", step_llm_draft_sig=str(inspect.signature(step_llm_draft)))
     except Exception:
         pass
-    while not _worker_shutdown:
+    while not _worker_shutdown.is_set():
         try:
             result = run_pipeline(dry_run=dry_run)
             _log_info(
@@ -645,10 +741,8 @@ def run_scheduler() -> None:
             )
         except Exception as e:
             _log_info("Pipeline error", error=str(e))
-        for _ in range(interval_sec):
-            if _worker_shutdown:
-                break
-            time.sleep(1)
+        if _worker_shutdown.wait(interval_sec):
+            break
     _log_info("Worker shutdown")
 
 
@@ -14,7 +14,7 @@ if str(repo) not in sys.path:
 
 from apps.api.db import SessionLocal, init_db
 from apps.api.db.models import Item
-from apps.worker.dedupe import build_fingerprint
+from apps.worker.dedupe import build_fingerprint, title_norm
 
 # Item A: alegação / não confirmada -> Template A (ANALISE_INTEL)
 ITEM_A = {
@@ -47,6 +47,7 @@ def main() -> int:
             item = Item(
                 fingerprint=fp,
                 title=data["title"],
+                title_norm=title_norm(data["title"]),
                 url=data["url"],
                 summary=data["summary"],
                 source_name=data["source_name"],
@@ -48,3 +48,56 @@ def test_rate_limit_client_identifier():
     assert "ip:" in _client_identifier(req)
     req.headers["X-API-Key"] = "abc"
     assert "token:" in _client_identifier(req)
+    ident = _client_identifier(req)
+    assert len(ident) == len("token:") + 16
+    assert _client_identifier(req) == ident
+    req.headers = {"Authorization": "Bearer xyz"}
+    assert _client_identifier(req).startswith("token:")
+    assert _client_identifier(req) != ident
+
+
+@pytest.mark.skipif(not HAS_FASTAPI, reason="FastAPI not installed")
+def test_rate_limit_middleware_single_script_call():
+    """Rate limit is one script call per request; a blocked verdict returns 429 without calling the app."""
+    import asyncio
+
+    from apps.api import middleware
+
+    req = MagicMock()
+    req.url.path = "/items"
+    req.headers = {}
+    req.client.host = "10.0.0.1"
+    r = MagicMock()
+    script = MagicMock(return_value=[1, 60])
+    r.register_script.return_value = script
+    call_next = MagicMock()
+    mw = middleware.RateLimitMiddleware(app=MagicMock())
+    with patch.object(middleware, "_get_redis", return_value=r), patch.object(middleware, "_rate_limit_script", None):
+        resp = asyncio.run(mw.dispatch(req, call_next))
+    assert resp.status_code == 429
+    script.assert_called_once()
+    r.get.assert_not_called()
+    call_next.assert_not_called()
+
+
+@pytest.mark.skipif(not HAS_FASTAPI, reason="FastAPI not installed")
+def test_rate_limit_redis_client_created_once():
+    """The middleware reuses one Redis client (one connection pool) across requests."""
+    from apps.api import middleware
+
+    if middleware.redis is None:
+        pytest.skip("redis not installed")
+    with patch.object(middleware, "_redis_client", None), patch.object(middleware.redis.Redis, "from_url") as from_url:
+        a = middleware._get_redis()
+        b = middleware._get_redis()
+    assert a is b
+    from_url.assert_called_once()
+
+
+def test_rate_limit_keys_use_epoch_buckets():
+    """Minute/hour keys are integer epoch buckets."""
+    from apps.api import middleware
+
+    with patch.object(middleware, "time", return_value=7260.5):
+        assert middleware._minute_key("ip:1.2.3.4") == "api:rate:ip:1.2.3.4:min:121"
+        assert middleware._hour_key("ip:1.2.3.4") == "api:rate:ip:1.2.3.4:hr:2"
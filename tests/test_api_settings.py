@@ -0,0 +1,77 @@
+"""Tests for Settings access: in-process cache and invalidation on write."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.api.settings import clear_settings_cache, get_feature_flag, get_settings, set_feature_flag
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings_cache():
+    clear_settings_cache()
+    yield
+    clear_settings_cache()
+
+
+def _session_with_row(**fields):
+    session = MagicMock()
+    session.info = {}
+    row = MagicMock()
+    row.pause_all_publish = fields.get("pause_all_publish", False)
+    row.autopilot_enabled = fields.get("autopilot_enabled", False)
+    row.rate_limits = fields.get("rate_limits")
+    row.feature_flags = fields.get("feature_flags")
+    session.get.return_value = row
+    return session, row
+
+
+def test_get_settings_cached_between_calls():
+    """Repeated reads within the TTL hit the DB once."""
+    session, _ = _session_with_row(autopilot_enabled=True)
+    assert get_settings(session)["autopilot_enabled"] is True
+    assert get_feature_flag(session, "x") is False
+    assert session.get.call_count == 1
+    session.query.assert_not_called()
+
+
+def test_set_feature_flag_invalidates_cache_on_commit():
+    """A write through set_feature_flag makes the next read go to the DB once the session commits."""
+    from apps.api.settings import _clear_cache_on_commit
+
+    session, row = _session_with_row(feature_flags={"beta": False})
+    assert get_feature_flag(session, "beta") is False
+    set_feature_flag(session, "beta", True)
+    assert row.feature_flags == {"beta": True}
+    assert get_feature_flag(session, "beta") is False  # not committed yet: cache keeps the committed value
+    _clear_cache_on_commit(session)
+    assert get_feature_flag(session, "beta") is True
+
+
+def test_commit_event_clears_cache_rollback_does_not():
+    """The Session after_commit event drops the cache for sessions that wrote settings; rollback discards the mark."""
+    from sqlalchemy.orm import Session
+
+    import apps.api.settings as mod
+
+    session = Session()
+    session.begin()
+    mod._invalidate_on_commit(session)
+    session.rollback()
+    get_settings(_session_with_row()[0])
+    session.commit()
+    assert mod._settings_cache is not None
+
+    mod._invalidate_on_commit(session)
+    session.commit()
+    assert mod._settings_cache is None
+
+
+def test_set_settings_returns_dict_without_requery():
+    """set_settings builds its result from the fetched row (one SELECT per write)."""
+    from apps.api.settings import set_settings
+
+    session, row = _session_with_row()
+    out = set_settings(session, pause_all_publish=True)
+    assert out["pause_all_publish"] is True
+    assert session.get.call_count == 1
+    session.query.assert_not_called()
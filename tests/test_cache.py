@@ -45,3 +45,21 @@ def test_score_cache_hit_returns_value():
     assert cached is not None
     assert cached["priority"] == 1
     assert cached["template"] == "ANALISE_INTEL"
+
+
+def test_local_ttl_cache_lru_and_expiry(monkeypatch):
+    """LocalTTLCache evicts least recently used entries beyond maxsize and drops expired ones."""
+    from apps.worker import cache
+    from apps.worker.cache import LocalTTLCache
+
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    c = LocalTTLCache(maxsize=2, ttl=10)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    now[0] += 11
+    assert c.get("a") is None
@@ -66,3 +66,79 @@ def test_get_circuit_breaker_returns_singletons():
     assert a is b
     c = get_circuit_breaker("telegram")
     assert c is not a
+
+
+def test_load_from_redis_uses_single_mget_and_caches():
+    """State is read with one MGET and cached locally for a short TTL."""
+    cb = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10.0)
+    fake = MagicMock()
+    fake.mget.return_value = [b"2", b"closed", None]
+    cb._redis = fake
+    assert cb.state == CircuitState.CLOSED
+    assert cb._failures == 2
+    assert cb.state == CircuitState.CLOSED
+    fake.mget.assert_called_once()
+    fake.get.assert_not_called()
+
+
+def test_save_to_redis_runs_in_background_writer():
+    """Success recording does not block on Redis; the write lands via the background writer."""
+    cb = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10.0)
+    fake = MagicMock()
+    cb._redis = fake
+    cb._record_success()
+    cb._pending.result(timeout=2)
+    pipe = fake.pipeline.return_value
+    pipe.set.assert_any_call("cb:test:failures", 0, ex=3600)
+    pipe.execute.assert_called_once()
+    fake.mget.assert_not_called()
+
+
+def test_record_failure_uses_atomic_script():
+    """Failure recording is one Lua call; the shared count from Redis decides the state."""
+    cb = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10.0)
+    fake = MagicMock()
+    fake.register_script.return_value.return_value = 3
+    cb._redis = fake
+    cb._record_failure()
+    script = fake.register_script.return_value
+    script.assert_called_once()
+    assert script.call_args.kwargs["keys"] == ["cb:test:failures", "cb:test:opened_at", "cb:test:state"]
+    assert cb._failures == 3
+    assert cb._state == CircuitState.OPEN
+    fake.mget.assert_not_called()
+    fake.pipeline.assert_not_called()
+
+
+def test_redis_disabled_after_repeated_connection_errors():
+    """Consecutive Redis connection errors switch the breaker to in-memory mode for a cool-off window."""
+    cb = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10.0)
+    fake = MagicMock()
+    fake.mget.side_effect = ConnectionError("down")
+    cb._redis = fake
+    for _ in range(5):
+        assert cb.state == CircuitState.CLOSED
+    assert fake.mget.call_count == 3
+    assert not cb._redis_usable()
+
+
+def test_call_reads_redis_state_once():
+    """One wrapped call does a single MGET; recording success or failure does not reload."""
+    cb = CircuitBreaker("test", failure_threshold=5, recovery_timeout=10.0)
+    fake = MagicMock()
+    fake.mget.return_value = [b"0", b"closed", None]
+    fake.register_script.return_value = MagicMock(return_value=1)
+    cb._redis = fake
+    assert cb.call(lambda: 7) == 7
+    assert fake.mget.call_count == 1
+    cb._cache_until = 0.0
+    with pytest.raises(ValueError):
+        cb.call(_fail)
+    assert fake.mget.call_count == 2
+
+
+def test_get_circuit_breaker_caches_unknown_service():
+    """Unknown services get one cached instance instead of a fresh breaker per call."""
+    a = get_circuit_breaker("custom-svc")
+    assert get_circuit_breaker("custom-svc") is a
+    assert a.service == "custom-svc"
@@ -2,12 +2,19 @@
 from datetime import datetime, timezone, timedelta
 from unittest.mock import MagicMock
 
+import pytest
+
+from apps.worker import dedupe
 from apps.worker.dedupe import (
     build_fingerprint,
     canonicalize_url,
     created_at_in_window,
+    exists_fingerprint,
+    find_item,
+    find_items_batch,
     get_window_cutoff,
     is_duplicate_in_window,
+    legacy_fingerprint,
 )
 
 
@@ -27,6 +34,16 @@ def test_fingerprint_same_source_type_url_title_reproducible():
     assert build_fingerprint("rss", url, title) == build_fingerprint("rss", url, title)
 
 
+def test_fingerprint_is_32_hex_chars_and_differs_from_legacy():
+    """Fingerprint is blake2b-128 (32 hex chars); legacy sha256 stays available for old rows."""
+    fp = build_fingerprint("rss", "https://example.com/a", "Title")
+    legacy = legacy_fingerprint("rss", "https://example.com/a", "Title")
+    assert len(fp) == 32
+    int(fp, 16)
+    assert len(legacy) == 64
+    assert fp != legacy
+
+
 def test_canonical_url_strips_utm():
     """canonical_url strips utm params (from normalize)."""
     u = "https://example.com/article?utm_source=twitter&foo=bar"
@@ -37,10 +54,8 @@ def test_canonical_url_strips_utm():
 def test_duplicate_older_than_window_is_allowed():
     """Duplicate with created_at older than window: is_duplicate_in_window returns False (allowed)."""
     session = MagicMock()
-    old_item = MagicMock()
     now = datetime.now(timezone.utc)
-    old_item.created_at = now - timedelta(days=8)
-    session.query.return_value.filter.return_value.first.return_value = old_item
+    session.query.return_value.filter.return_value.scalar.return_value = now - timedelta(days=8)
 
     assert is_duplicate_in_window(session, "abc123", window_days=7, now=now) is False
 
@@ -48,14 +63,28 @@ def test_duplicate_older_than_window_is_allowed():
 def test_duplicate_within_window_is_dropped():
     """Duplicate with created_at within window: is_duplicate_in_window returns True (dropped)."""
     session = MagicMock()
-    recent_item = MagicMock()
     now = datetime.now(timezone.utc)
-    recent_item.created_at = now - timedelta(days=3)
-    session.query.return_value.filter.return_value.first.return_value = recent_item
+    session.query.return_value.filter.return_value.scalar.return_value = now - timedelta(days=3)
 
     assert is_duplicate_in_window(session, "abc123", window_days=7, now=now) is True
 
 
+def test_is_duplicate_in_window_missing_fingerprint():
+    """No item with this fingerprint: not a duplicate."""
+    session = MagicMock()
+    session.query.return_value.filter.return_value.scalar.return_value = None
+    assert is_duplicate_in_window(session, "abc123", window_days=7) is False
+
+
+def test_exists_fingerprint():
+    """exists_fingerprint returns the EXISTS scalar as bool."""
+    session = MagicMock()
+    session.query.return_value.scalar.return_value = True
+    assert exists_fingerprint(session, "abc123") is True
+    session.query.return_value.scalar.return_value = False
+    assert exists_fingerprint(session, "abc123") is False
+
+
 def test_created_at_in_window_older_than_window():
     """created_at_in_window returns False when item is older than window."""
     item = MagicMock()
@@ -77,3 +106,50 @@ def test_get_window_cutoff():
     now = datetime(2025, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
     cutoff = get_window_cutoff(7, now)
     assert cutoff == datetime(2025, 1, 8, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.skipif(not dedupe._HAS_RAPIDFUZZ, reason="rapidfuzz not installed")
+def test_find_item_relaxed_picks_similar_title(monkeypatch):
+    """Relaxed policy: no exact fingerprint, similar recent title -> that item is returned."""
+    monkeypatch.setattr(dedupe, "DEDUPE_POLICY", "relaxed")
+    session = MagicMock()
+    session.query.return_value.filter.return_value.first.return_value = None
+    rows = [(1, "completely unrelated story"), (2, "central bank raises interest rates")]
+    session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = rows
+    match = MagicMock()
+    session.get.return_value = match
+
+    assert find_item(session, "fp", title="Central Bank raises interest rates!") is match
+    assert session.get.call_args.args[1] == 2
+
+
+@pytest.mark.skipif(not dedupe._HAS_RAPIDFUZZ, reason="rapidfuzz not installed")
+def test_find_item_relaxed_no_match_below_cutoff(monkeypatch):
+    """Relaxed policy: titles below the similarity cutoff are not duplicates."""
+    monkeypatch.setattr(dedupe, "DEDUPE_POLICY", "relaxed")
+    session = MagicMock()
+    session.query.return_value.filter.return_value.first.return_value = None
+    rows = [(1, "completely unrelated story")]
+    session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = rows
+
+    assert find_item(session, "fp", title="Central bank raises interest rates") is None
+    session.get.assert_not_called()
+
+
+def test_created_at_in_window_uses_precomputed_cutoff():
+    """A cutoff passed in by the caller is used as-is (window_days/now ignored)."""
+    item = MagicMock()
+    item.created_at = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    assert created_at_in_window(item, 7, cutoff=datetime(2025, 1, 9, tzinfo=timezone.utc)) is True
+    assert created_at_in_window(item, 7, cutoff=datetime(2025, 1, 11, tzinfo=timezone.utc)) is False
+
+
+def test_find_items_batch_single_query_keyed_by_fingerprint():
+    """Batch lookup issues one query and returns {fingerprint: item}; empty input skips the DB."""
+    session = MagicMock()
+    a, b = MagicMock(fingerprint="fa"), MagicMock(fingerprint="fb")
+    session.query.return_value.filter.return_value.all.return_value = [a, b]
+
+    assert find_items_batch(session, ["fa", "fb", "fc"]) == {"fa": a, "fb": b}
+    session.query.assert_called_once()
+    assert find_items_batch(MagicMock(), []) == {}
@@ -5,7 +5,7 @@ import os
 import pytest
 
 from apps.shared.config import ConfigError
-from apps.shared.env_helpers import parse_int, parse_int_default
+from apps.shared.env_helpers import get_int_env, parse_int, parse_int_default
 from apps.shared.secrets import EnvSecretsProvider
 
 try:
@@ -323,3 +323,42 @@ class TestApiSettingsJwtExpiry:
             API_KEY="",
         )
         assert s.JWT_EXPIRY_SECONDS == 3600
+
+
+class TestWorkerPoolValidation:
+    """validate_env(worker): explicit DB pool sizing must cover the publish workers."""
+
+    @pytest.fixture(autouse=True)
+    def _env(self, monkeypatch):
+        for key in ("TELEGRAM_BOT_TOKEN", "TELEGRAM_TARGET_CHAT_ID", "TELEGRAM_CHAT_ID", "MAKE_WEBHOOK_URL"):
+            monkeypatch.delenv(key, raising=False)
+        monkeypatch.setattr("apps.shared.env_validation.validate_config", lambda required=True: None)
+        monkeypatch.setenv("PUBLISH_MAX_WORKERS", "8")
+
+    def test_pool_too_small_rejected(self, monkeypatch):
+        from apps.shared.env_validation import EnvValidationError, validate_env
+
+        monkeypatch.setenv("DB_POOL_SIZE", "4")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        with pytest.raises(EnvValidationError, match="PUBLISH_MAX_WORKERS") as exc:
+            validate_env(role="worker")
+        assert exc.value.missing == []
+
+    def test_pool_large_enough_or_unset_ok(self, monkeypatch):
+        from apps.shared.env_validation import validate_env
+
+        monkeypatch.delenv("DB_POOL_SIZE", raising=False)
+        monkeypatch.delenv("DB_MAX_OVERFLOW", raising=False)
+        validate_env(role="worker")
+        monkeypatch.setenv("DB_POOL_SIZE", "8")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "1")
+        validate_env(role="worker")
+
+    def test_unset_value_uses_session_default(self, monkeypatch):
+        """Only DB_POOL_SIZE set: overflow defaults to max(10, 2 * workers), as in session.py."""
+        from apps.shared.env_validation import validate_env
+
+        monkeypatch.setenv("PUBLISH_MAX_WORKERS", "20")
+        monkeypatch.setenv("DB_POOL_SIZE", "1")
+        monkeypatch.delenv("DB_MAX_OVERFLOW", raising=False)
+        validate_env(role="worker")
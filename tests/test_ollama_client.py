@@ -0,0 +1,407 @@
+"""Unit tests for the Ollama HTTP client (mock transport; no Ollama required)."""
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from apps.worker.llm import ollama_client
+
+
+@pytest.fixture
+def mock_ollama(monkeypatch):
+    """Route the pooled AsyncClient through a MockTransport; returns the list of requests seen."""
+    seen = []
+    real_client = httpx.AsyncClient
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"message": {"content": '{"ok": true}'}})
+
+    monkeypatch.setattr(
+        ollama_client.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    yield seen
+    # The sync wrappers' loop outlives the test: drop its client so the next test gets its own transport
+    ollama_client._run(ollama_client.aclose_client())
+
+
+def test_chat_reuses_client_within_loop(mock_ollama):
+    """Calls on one event loop share a pooled client."""
+
+    async def two_calls():
+        await ollama_client._chat_async("http://ollama:11434", "m", "sys", "user")
+        first = ollama_client._get_client()
+        out = await ollama_client._chat_async("http://ollama:11434", "m", "sys", "user")
+        assert ollama_client._get_client() is first
+        return out
+
+    assert asyncio.run(two_calls()) == '{"ok": true}'
+    assert len(mock_ollama) == 2
+    assert str(mock_ollama[0].url) == "http://ollama:11434/api/chat"
+
+
+def test_chat_requests_json_mode(mock_ollama):
+    """Native requests ask Ollama for JSON output and keep the model loaded."""
+    import json
+
+    ollama_client._run(ollama_client._chat_async("http://ollama:11434", "m", "sys", "user"))
+    body = json.loads(mock_ollama[-1].content)
+    assert body["format"] == "json"
+    assert body["keep_alive"] == ollama_client.OLLAMA_KEEP_ALIVE
+    assert body["stream"] is ollama_client.OLLAMA_STREAM
+
+
+def test_sync_calls_share_background_loop_client(mock_ollama):
+    """Sync wrappers run on one persistent loop, so its pooled client is reused across calls."""
+
+    async def chat_and_client():
+        out = await ollama_client._chat_async("http://ollama:11434", "m", "sys", "user")
+        return out, ollama_client._get_client()
+
+    out1, client1 = ollama_client._run(chat_and_client())
+    out2, client2 = ollama_client._run(chat_and_client())
+    assert out1 == out2 == '{"ok": true}'
+    assert client1 is client2
+    assert len(mock_ollama) == 2
+
+
+def _fake_chat(content):
+    async def chat(*args, **kwargs):
+        return content
+
+    return chat
+
+
+@pytest.fixture
+def fresh_memo():
+    ollama_client._classify_mem.clear()
+    ollama_client._generate_mem.clear()
+    ollama_client._invalid_mem.clear()
+    yield
+    ollama_client._classify_mem.clear()
+    ollama_client._generate_mem.clear()
+    ollama_client._invalid_mem.clear()
+
+
+def test_classify_memoized_in_process(fresh_memo, monkeypatch):
+    """A repeated classify is served from the in-process memo: no external cache read, no HTTP call."""
+    lookups = []
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: lookups.append(key))
+    monkeypatch.setattr(ollama_client, "set_llm_classify_cached", lambda key, value: None)
+    monkeypatch.setattr(
+        ollama_client,
+        "_chat_async",
+        _fake_chat('{"template": "DEFAULT", "risk": "low", "priority": "P2", "requires_review": false}'),
+    )
+
+    first = ollama_client._run(ollama_client.classify_async("Title", "Summary"))
+    second = ollama_client._run(ollama_client.classify_async("Title", "Summary"))
+    assert second is first
+    assert len(lookups) == 1
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('  {"a": {"b": 1}}\n', '{"a": {"b": 1}}'),
+        ('Sure! {"a": 1} done', '{"a": 1}'),
+        ('```json\n{"a": {"b": [1, 2]}}\n```', '{"a": {"b": [1, 2]}}'),
+        ('{"a": "} not the end"} tail', '{"a": "} not the end"}'),
+        ('{"a": "quote \\" and }"}', '{"a": "quote \\" and }"}'),
+        ("no json here", None),
+        ('{"unterminated": 1', None),
+    ],
+)
+def test_extract_json(text, expected):
+    """Fences stripped; the first balanced object returned; braces in string literals ignored."""
+    assert ollama_client._extract_json(text) == expected
+
+
+def test_classify_and_generate_prompts_share_item_prefix():
+    """Both prompts open with the same item block (byte-identical prefix for Ollama's KV cache reuse)."""
+    from apps.worker.llm.prompts import classify_prompt, generate_prompt, item_block
+
+    block = item_block("Title", "Summary", "Reuters")
+    assert classify_prompt("Title", "Summary", "Reuters").startswith(block)
+    assert generate_prompt("Title", "Summary", "FLASH_SETORIAL", "high", "Reuters").startswith(block)
+    assert classify_prompt("Title", "Summary", "Reuters") != generate_prompt("Title", "Summary", "DEFAULT", "", "Reuters")
+
+
+def test_run_batch_async_bounded_and_ordered(monkeypatch):
+    """Articles run concurrently up to the limit; results keep input order and failures stay per article."""
+    in_flight = []
+    peak = []
+
+    async def fake_pipeline(title, summary="", source_name="", **kwargs):
+        in_flight.append(title)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(title)
+        if title == "bad":
+            raise ValueError("invalid JSON")
+        return title.upper(), summary
+
+    monkeypatch.setattr(ollama_client, "run_classify_then_generate_async", fake_pipeline)
+    articles = [{"title": t, "summary": "s"} for t in ("a", "bad", "c", "d", "e")]
+    out = asyncio.run(ollama_client.run_batch_async(articles, concurrency=2))
+    assert out[0] == ("A", "s") and out[2:] == [("C", "s"), ("D", "s"), ("E", "s")]
+    assert isinstance(out[1], ValueError)
+    assert max(peak) == 2
+
+
+def test_classify_retries_once_with_repair(fresh_memo, monkeypatch):
+    """Invalid first reply triggers one STRICT JSON REPAIR retry; its valid reply is returned and cached."""
+    calls = []
+    stored = {}
+
+    async def chat(*args, retry_with_repair=False, **kwargs):
+        calls.append(retry_with_repair)
+        if not retry_with_repair:
+            return "not json"
+        return '{"template": "DEFAULT", "risk": "low", "priority": "P2", "requires_review": false}'
+
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "set_llm_classify_cached", lambda key, value: stored.setdefault(key, value))
+    monkeypatch.setattr(ollama_client, "_chat_async", chat)
+
+    result = ollama_client._run(ollama_client.classify_async("Title", "Summary"))
+    assert result.priority == "P2"
+    assert calls == [False, True]
+    assert len(stored) == 1
+
+
+def test_classify_semantic_hit_skips_model(fresh_memo, monkeypatch):
+    """A near-duplicate article (similar embedding) reuses the earlier classify result without a chat call."""
+    from apps.worker.llm.semantic_cache import SemanticCache
+
+    chats = []
+
+    async def chat(*args, **kwargs):
+        chats.append(args)
+        return '{"template": "DEFAULT", "risk": "low", "priority": "P2", "requires_review": false}'
+
+    async def vector(base_url, title, summary, timeout):
+        return [1.0, 0.0] if title.startswith("Quake") else [0.0, 1.0]
+
+    monkeypatch.setattr(ollama_client, "_semantic", SemanticCache(0.9, 10))
+    monkeypatch.setattr(ollama_client, "_semantic_vector", vector)
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "set_llm_classify_cached", lambda key, value: None)
+    monkeypatch.setattr(ollama_client, "_chat_async", chat)
+
+    first = ollama_client._run(ollama_client.classify_async("Quake hits city", "s"))
+    again = ollama_client._run(ollama_client.classify_async("Quake strikes the city", "s"))
+    ollama_client._run(ollama_client.classify_async("Unrelated", "s"))
+    assert again is first
+    assert len(chats) == 2
+
+
+def test_chat_stream_stops_at_complete_json(monkeypatch):
+    """Streamed reply: content is joined across chunks and reading stops once the JSON object closes."""
+    lines = [
+        {"message": {"content": '{"a": "x } y'}, "done": False},
+        {"message": {"content": '", "b": {"c": 1}'}, "done": False},
+        {"message": {"content": "}"}, "done": False},
+        {"message": {"content": " trailing chatter"}, "done": False},
+        {"message": {"content": ""}, "done": True},
+    ]
+    body = b"\n".join(orjson.dumps(line) for line in lines) + b"\n"
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        ollama_client.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(lambda req: httpx.Response(200, content=body)), **kw),
+    )
+    monkeypatch.setattr(ollama_client, "OLLAMA_STREAM", True)
+
+    async def chat():
+        try:
+            return await ollama_client._chat_async("http://ollama:11434", "m", "sys", "user")
+        finally:
+            await ollama_client.aclose_client()
+
+    assert asyncio.run(chat()) == '{"a": "x } y", "b": {"c": 1}}'
+
+
+@pytest.mark.parametrize(
+    "chunks, closes_at",
+    [
+        (['{"a": 1}'], 0),
+        (['noise {"a"', ': {"b": 2}', "} tail"], 2),
+        (['{"s": "\\', '"}"', "}"], 2),
+        (['{"open": ', "1"], None),
+    ],
+)
+def test_json_object_scanner_incremental(chunks, closes_at):
+    """Scanner tracks depth/strings/escapes across chunk boundaries."""
+    scanner = ollama_client._JsonObjectScanner()
+    closed = [i for i, chunk in enumerate(chunks) if scanner.feed(chunk)]
+    assert (closed[0] if closed else None) == closes_at
+
+
+def test_large_payload_validated_off_loop(monkeypatch):
+    """Payloads above LLM_VALIDATE_INLINE_MAX are validated on a worker thread; small ones inline."""
+    import threading
+
+    monkeypatch.setattr(ollama_client, "LLM_VALIDATE_INLINE_MAX", 10)
+    seen = []
+
+    def validate(json_str):
+        seen.append(threading.current_thread())
+        return json_str
+
+    async def both():
+        await ollama_client._validate(validate, "{}")
+        await ollama_client._validate(validate, '{"long": "payload"}')
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(both())
+    assert seen[0] is loop_thread
+    assert seen[1] is not loop_thread
+
+
+def test_invalid_json_negative_cached(fresh_memo, monkeypatch):
+    """After both passes fail, the same prompt fails fast without another model call."""
+    calls = []
+
+    async def chat(*args, **kwargs):
+        calls.append(kwargs.get("retry_with_repair"))
+        return "not json"
+
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "_chat_async", chat)
+
+    with pytest.raises(ValueError, match="Invalid classify JSON"):
+        ollama_client._run(ollama_client.classify_async("Bad", "s"))
+    with pytest.raises(ValueError, match="Cached invalid JSON"):
+        ollama_client._run(ollama_client.classify_async("Bad", "s"))
+    assert calls == [False, True]
+
+
+def test_garbled_stream_not_negative_cached(fresh_memo, monkeypatch):
+    """A truncated/non-JSON stream line is a transport failure: it propagates uncached and the next call retries."""
+    bodies = [
+        b'{"message": {"content": "{\\"tem',
+        b'{"message": {"content": "{\\"template\\": \\"DEFAULT\\", \\"risk\\": \\"low\\", \\"priority\\": \\"P2\\", \\"requires_review\\": false}"}, "done": true}\n',
+    ]
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        ollama_client.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(lambda req: httpx.Response(200, content=bodies.pop(0))), **kw),
+    )
+    monkeypatch.setattr(ollama_client, "OLLAMA_STREAM", True)
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "set_llm_classify_cached", lambda key, value: None)
+
+    async def classify():
+        return await ollama_client.classify_async("Title", "Summary", base_url="http://ollama:11434")
+
+    try:
+        with pytest.raises(orjson.JSONDecodeError):
+            ollama_client._run(classify())
+        assert ollama_client._run(classify()).priority == "P2"
+    finally:
+        ollama_client._run(ollama_client.aclose_client())
+
+
+def test_semantic_lookup_runs_off_loop(fresh_memo, monkeypatch):
+    """The linear semantic scan runs on a worker thread so it never stalls concurrent LLM coroutines."""
+    import threading
+
+    from apps.worker.llm.semantic_cache import SemanticCache
+
+    seen = []
+
+    class RecordingCache(SemanticCache):
+        def lookup(self, namespace, vec):
+            seen.append(threading.current_thread())
+            return super().lookup(namespace, vec)
+
+    async def vector(base_url, title, summary, timeout):
+        return [1.0, 0.0]
+
+    monkeypatch.setattr(ollama_client, "_semantic", RecordingCache(0.9, 10))
+    monkeypatch.setattr(ollama_client, "_semantic_vector", vector)
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "set_llm_classify_cached", lambda key, value: None)
+    monkeypatch.setattr(
+        ollama_client,
+        "_chat_async",
+        _fake_chat('{"template": "DEFAULT", "risk": "low", "priority": "P2", "requires_review": false}'),
+    )
+
+    async def classify():
+        await ollama_client.classify_async("Title", "Summary")
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(classify())
+    assert len(seen) == 1 and seen[0] is not loop_thread
+
+
+def test_stream_total_timeout(monkeypatch):
+    """A stream that keeps trickling tokens but never closes its JSON object is cut off at the total timeout."""
+
+    class Trickle(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            while True:
+                yield orjson.dumps({"message": {"content": " "}, "done": False}) + b"\n"
+                await asyncio.sleep(0.01)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        ollama_client.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(lambda req: httpx.Response(200, stream=Trickle())), **kw),
+    )
+    monkeypatch.setattr(ollama_client, "OLLAMA_STREAM", True)
+
+    async def chat():
+        try:
+            return await ollama_client._chat_async("http://ollama:11434", "m", "sys", "user", timeout=0.2)
+        finally:
+            await ollama_client.aclose_client()
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(asyncio.wait_for(chat(), 5))
+
+
+def test_negative_cache_checked_before_embedding(fresh_memo, monkeypatch):
+    """A known-invalid prompt fails fast without an embeddings round trip."""
+    embeds = []
+
+    async def vector(base_url, title, summary, timeout):
+        embeds.append(title)
+        return None
+
+    monkeypatch.setattr(ollama_client, "_semantic_vector", vector)
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "_chat_async", _fake_chat("not json"))
+
+    with pytest.raises(ValueError, match="Invalid classify JSON after retry"):
+        ollama_client._run(ollama_client.classify_async("Bad", "s"))
+    with pytest.raises(ValueError, match="Cached invalid JSON"):
+        ollama_client._run(ollama_client.classify_async("Bad", "s"))
+    assert embeds == ["Bad"]
+
+
+def test_no_repair_retry_not_negative_cached(fresh_memo, monkeypatch):
+    """With OLLAMA_MAX_JSON_RETRY=0 no repair ran: the failure is not reported as "after retry" nor cached."""
+    calls = []
+
+    async def chat(*args, **kwargs):
+        calls.append(kwargs.get("retry_with_repair"))
+        return "not json"
+
+    monkeypatch.setattr(ollama_client, "MAX_JSON_RETRY", 0)
+    monkeypatch.setattr(ollama_client, "get_llm_classify_cached", lambda key: None)
+    monkeypatch.setattr(ollama_client, "_chat_async", chat)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="repair retry disabled") as exc:
+            ollama_client._run(ollama_client.classify_async("Bad", "s"))
+        assert not isinstance(exc.value, ollama_client.InvalidLLMJSONError)
+    assert calls == [False, False]
@@ -33,8 +33,10 @@ def test_get_limits_uses_defaults_when_no_settings():
 def test_check_rate_limit_raises_when_over_limit():
     """check_rate_limit raises RateLimitExceededError when count >= limit."""
     r = MagicMock()
-    r.get.side_effect = ["5", "50"]  # min 5, hour 50
-    with patch("apps.publisher.rate_limit._get_redis", return_value=r):
+    r.register_script.return_value = MagicMock(return_value=[1, 5])  # over the minute limit at 5
+    with patch("apps.publisher.rate_limit._get_redis", return_value=r), patch(
+        "apps.publisher.rate_limit._rate_limit_script", None
+    ):
         with pytest.raises(RateLimitExceededError) as exc_info:
             check_rate_limit("telegram", settings={"rate_limits": {"telegram": {"per_minute": 5, "per_hour": 100}}})
     assert exc_info.value.limit_type == "per_minute"
@@ -60,3 +62,18 @@ def test_log_rate_limit_event_adds_events_log():
     assert added[0].payload["limit_type"] == "per_hour"
     assert added[0].payload["current"] == 101
     assert added[0].payload["limit"] == 100
+
+
+def test_check_rate_limit_counts_in_one_script_call():
+    """Allowed publish: one atomic script call with per-channel keys and limits; no GET/INCR from Python."""
+    r = MagicMock()
+    script = MagicMock(return_value=[0])
+    r.register_script.return_value = script
+    with patch("apps.publisher.rate_limit._rate_limit_script", None):
+        check_rate_limit("make", settings={"rate_limits": {"make": {"per_minute": 3, "per_hour": 30}}}, redis_client=r)
+    script.assert_called_once()
+    kwargs = script.call_args.kwargs
+    assert kwargs["args"] == [3, 30]
+    assert all(k.startswith("rate:make:") for k in kwargs["keys"])
+    r.get.assert_not_called()
+    r.pipeline.assert_not_called()
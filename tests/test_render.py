@@ -8,6 +8,7 @@ from apps.worker.render import (
     render_sector_flash,
     render_sector_flash_messages,
     render,
+    render_stream,
 )
 
 
@@ -185,6 +186,16 @@ def test_render_sector_flash_messages_over_limit_splits_two():
         assert len(m) <= 80
 
 
+def test_render_messages_very_long_payload_splits_without_recursion():
+    """Thousands of parts: iterative split (no RecursionError); every part within max_length."""
+    payload = {"bullets": [f"Point {i}" for i in range(5000)]}
+    msgs = render_intelligence_messages(payload, max_length=60)
+    assert len(msgs) > 1000
+    assert msgs[0].startswith("🚨 GNI — Análise de Inteligência")
+    for m in msgs:
+        assert len(m) <= 60
+
+
 # --- render() dispatch ---
 def test_render_analise_intel_dispatches_to_template_a():
     """render(template=ANALISE_INTEL) uses Template A."""
@@ -227,6 +238,15 @@ def test_render_default_uses_intelligence():
     assert msgs[0].startswith("🚨 GNI — Análise de Inteligência")
 
 
+def test_render_stream_matches_render():
+    """render_stream yields the same parts as render(), lazily."""
+    payload = {"bullets": [f"Point {i}" for i in range(200)]}
+    stream = render_stream("ANALISE_INTEL", payload, max_length=80)
+    first = next(stream)
+    assert first.startswith("🚨 GNI — Análise de Inteligência")
+    assert [first, *stream] == render("ANALISE_INTEL", payload, max_length=80)
+
+
 def test_whatsapp_max_chars_configurable():
     """WHATSAPP_MAX_CHARS is configurable (default 3500 when env not set)."""
     assert isinstance(WHATSAPP_MAX_CHARS, int)
@@ -59,3 +59,42 @@ def test_run_with_retry_no_retry_on_circuit_open():
     assert result.service == "test"
     assert attempts == 1
     assert len(calls) == 1
+
+
+def test_run_with_retry_jittered_backoff_bounds(monkeypatch):
+    """Sleeps are decorrelated jitter: uniform(base, 3 * previous), capped at MAX_BACKOFF."""
+    from apps.worker import retry
+
+    sleeps = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    monkeypatch.setattr(retry, "MAX_BACKOFF", 5.0)
+
+    def fn():
+        raise RuntimeError("fail")
+
+    ok, _, attempts = run_with_retry(fn, max_attempts=6, backoff_base=1.0, max_total=1000)
+    assert ok is False
+    assert attempts == 6
+    assert len(sleeps) == 5
+    prev = 1.0
+    for s in sleeps:
+        assert 1.0 <= s <= min(5.0, prev * 3)
+        prev = s
+
+
+def test_run_with_retry_stops_at_max_total(monkeypatch):
+    """No further attempts once the total time budget is spent."""
+    from apps.worker import retry
+
+    monkeypatch.setattr(retry.time, "sleep", lambda s: None)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise RuntimeError("fail")
+
+    ok, result, attempts = run_with_retry(fn, max_attempts=5, backoff_base=0.0, max_total=0.0)
+    assert ok is False
+    assert isinstance(result, RuntimeError)
+    assert attempts == 1
+    assert len(calls) == 1
@@ -3,7 +3,14 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from apps.worker.safety import PublishPausedError, assert_publish_allowed
+from apps.worker.safety import PublishPausedError, assert_publish_allowed, clear_pause_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pause_cache():
+    clear_pause_cache()
+    yield
+    clear_pause_cache()
 
 
 def test_assert_publish_allowed_when_not_paused():
@@ -50,3 +57,19 @@ def test_publish_blocked_events_log_payload():
     assert log.event_type == "publish_blocked"
     assert log.payload["message"] == "publish blocked by pause"
     assert log.payload["reason"] == "pause_all_publish"
+
+
+def test_assert_publish_allowed_caches_flag():
+    """Within PAUSE_CACHE_TTL the Settings row is read once; clear_pause_cache forces a re-read."""
+    session = MagicMock()
+    row = MagicMock()
+    row.pause_all_publish = False
+    session.query.return_value.first.return_value = row
+    assert_publish_allowed(session)
+    assert_publish_allowed(session)
+    assert session.query.call_count == 1
+    row.pause_all_publish = True
+    assert_publish_allowed(session)
+    clear_pause_cache()
+    with pytest.raises(PublishPausedError):
+        assert_publish_allowed(session)
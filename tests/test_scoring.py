@@ -73,3 +73,52 @@ def test_priority_p0_p1_p2():
     assert score["priority"] in (0, 1, 2)
     score2 = score_item(title="Normal news", source_name="Reddit r/CryptoCurrency")
     assert score2["priority"] in (0, 1, 2)
+
+
+def test_load_keywords_cached_and_reloaded_on_change(tmp_path, monkeypatch):
+    """keywords.yaml is parsed once and re-parsed only when its mtime changes."""
+    import os
+
+    from apps.worker import scoring
+
+    path = tmp_path / "keywords.yaml"
+    path.write_text("rumor_intel:\n  - whisper\n", encoding="utf-8")
+    monkeypatch.setenv("DATA_KEYWORDS_PATH", str(path))
+    monkeypatch.setattr(scoring, "KEYWORDS_CHECK_INTERVAL", 0.0)
+
+    first = scoring.load_keywords()
+    assert first["rumor_intel"] == ["whisper"]
+    assert scoring.load_keywords() is first
+
+    path.write_text("rumor_intel:\n  - murmur\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert scoring.load_keywords()["rumor_intel"] == ["murmur"]
+    assert score_item(title="A murmur in the market")["risk"] == "high"
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_keyword_scan_whole_words_with_and_without_automaton(monkeypatch, use_automaton):
+    """Aho-Corasick scan and regex fallback agree: whole-word hits only, both categories in one pass."""
+    from apps.worker import scoring
+
+    if not use_automaton:
+        monkeypatch.setattr(scoring, "ahocorasick", None)
+    elif scoring.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    matchers = scoring._build_keyword_matchers({"rumor_intel": ["Rumor", "alleged"], "flash_editorial": ["launch"]})
+    assert scoring._matched_categories("rumored launched", matchers) == set()
+    assert scoring._matched_categories("alleged launch.", matchers) == {"rumor", "flash"}
+    assert scoring._matched_categories("big launch", matchers) == {"flash"}
+
+
+def test_source_tier_index_lookup():
+    """Source tiers resolve through a name -> tier index; best tier wins, unknown => 3."""
+    from apps.worker.scoring import _build_source_tier_index, _get_source_tier
+
+    data = {"source_tiers": {"tier1": ["Reuters"], "tier2": ["Blog", "Reuters"], "tier3": ["Forum"]}}
+    assert _build_source_tier_index(data) == {"Reuters": 1, "Blog": 2, "Forum": 3}
+    assert _get_source_tier(data, " Reuters ") == 1
+    assert _get_source_tier(data, "Blog") == 2
+    assert _get_source_tier(data, "Unknown") == 3
+    assert _get_source_tier({}, None) == 3
@@ -0,0 +1,25 @@
+"""Unit tests for the semantic (embedding similarity) LLM cache."""
+from apps.worker.llm.semantic_cache import SemanticCache, normalize
+
+
+def test_normalize_unit_length_and_zero():
+    assert normalize([3.0, 4.0]) == (0.6, 0.8)
+    assert normalize([0.0, 0.0]) is None
+
+
+def test_lookup_hits_above_threshold_within_namespace():
+    cache = SemanticCache(threshold=0.95, maxsize=10)
+    cache.add("classify", [1.0, 0.0, 0.0], "A")
+    cache.add("classify", [0.0, 1.0, 0.0], "B")
+    assert cache.lookup("classify", [0.99, 0.05, 0.0]) == "A"
+    assert cache.lookup("classify", [0.7, 0.7, 0.0]) is None  # cosine ~0.71 < 0.95
+    assert cache.lookup("generate", [1.0, 0.0, 0.0]) is None
+
+
+def test_oldest_evicted_past_maxsize():
+    cache = SemanticCache(threshold=0.9, maxsize=2)
+    cache.add("ns", [1.0, 0.0], "old")
+    cache.add("ns", [0.0, 1.0], "mid")
+    cache.add("ns", [-1.0, 0.0], "new")
+    assert len(cache) == 2
+    assert cache.lookup("ns", [1.0, 0.0]) is None
@@ -11,6 +11,14 @@ from apps.publisher.telegram import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_secrets():
+    """Token/chat id are cached per process; each test reads its own env."""
+    TelegramPublisher.reload_secrets()
+    yield
+    TelegramPublisher.reload_secrets()
+
+
 def test_publication_result():
     """PublicationResult holds id, status, external_id, dry_run, attempts."""
     r = PublicationResult(publication_id=1, status="dry_run", dry_run=True, attempts=0)
@@ -129,3 +137,160 @@ def test_publish_telegram_real_send_writes_sent_status():
     assert result.external_id == "456"
     assert result.dry_run is False
     assert result.attempts >= 1
+
+
+def test_send_message_reuses_shared_client():
+    """_send_message posts through one process-wide client (no client per message)."""
+    from apps.publisher import telegram as mod
+
+    client = MagicMock()
+    resp = MagicMock(status_code=200, content=b'{"ok": true, "result": {"message_id": 7}}')
+    client.post.return_value = resp
+    with patch.object(mod, "_CLIENT", client):
+        assert mod._send_message("tok", "1", "a") == "7"
+        assert mod._send_message("tok", "1", "b") == "7"
+    assert client.post.call_count == 2
+    assert client.post.call_args[0][0] == "/bottok/sendMessage"
+
+
+def test_publish_retry_resumes_after_sent_parts():
+    """A failure mid-post retries only the unsent parts, in order (no duplicate messages)."""
+    from apps.publisher import telegram as mod
+
+    session = MagicMock()
+    a, b, c = "a" * 3000, "b" * 3000, "c" * 3000  # too long to pack together
+    sent = []
+    fail_once = {b: True}
+
+    def fake_send(token, chat_id, text):
+        if fail_once.pop(text, False):
+            raise RuntimeError("503")
+        sent.append(text)
+        return str(len(sent))
+
+    with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "t", "TELEGRAM_TARGET_CHAT_ID": "1"}):
+        with patch.object(mod, "_send_message", side_effect=fake_send), patch("apps.worker.retry.time.sleep"):
+            result = publish_telegram(messages=[a, b, c], dry_run=False, session=session)
+    assert sent == [a, b, c]
+    assert result.external_id == "1,2,3"
+    assert result.attempts == 2
+
+
+def test_publish_failure_carries_logged_row():
+    """A send that fails after retries raises with the logged "failed" row's id and attempts."""
+    from apps.publisher import telegram as mod
+
+    session = MagicMock()
+    with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "t", "TELEGRAM_TARGET_CHAT_ID": "1"}), \
+         patch.object(mod, "_send_with_retry", return_value=(False, RuntimeError("503"), 3)), \
+         patch.object(mod, "_log_publication", return_value=42) as log_pub:
+        with pytest.raises(mod.TelegramPublishError, match="after 3 attempts") as exc:
+            publish_telegram(messages=["hi"], dry_run=False, session=session)
+    assert log_pub.call_args.args[2] == "failed"
+    assert (exc.value.publication_id, exc.value.attempts) == (42, 3)
+
+
+def test_normalize_packs_short_messages():
+    """Consecutive short messages share one sendMessage; long ones are still split."""
+    from apps.publisher.telegram import TELEGRAM_MAX_MESSAGE_LENGTH, _normalize_messages_for_telegram
+
+    assert _normalize_messages_for_telegram(["one", "", "two"]) == ["one\n\ntwo"]
+    big = "x" * (TELEGRAM_MAX_MESSAGE_LENGTH - 2)
+    out = _normalize_messages_for_telegram(["hi", big])
+    assert out == ["hi", big]
+    assert all(len(m) <= TELEGRAM_MAX_MESSAGE_LENGTH for m in _normalize_messages_for_telegram(["y" * 9000]))
+
+
+def test_render_split_sent_as_original_text():
+    """A post render() splits for WhatsApp (3500) but that fits Telegram goes out as the unsplit text, unchanged."""
+    from apps.publisher.telegram import _normalize_messages_for_telegram
+    from apps.worker.render import render, render_text
+
+    payload = {"bullets": [("word " * 780).strip()]}
+    text = render_text("ANALISE_INTEL", payload)
+    assert len(render("ANALISE_INTEL", payload)) == 2
+    assert _normalize_messages_for_telegram([text]) == [text]
+
+
+def test_split_breaks_at_newline():
+    """Oversize text is split after a line, not mid-line; the header repeats on continuation parts."""
+    from apps.publisher.telegram import TELEGRAM_MAX_MESSAGE_LENGTH, _split_message
+
+    lines = [f"line {i} " + "z" * 90 for i in range(80)]
+    parts = _split_message("Header\n" + "\n".join(lines))
+    assert len(parts) == 2
+    assert all(len(p) <= TELEGRAM_MAX_MESSAGE_LENGTH and p.startswith("Header\n") for p in parts)
+    body_lines = [line for p in parts for line in p.split("\n")[1:]]
+    assert body_lines == lines
+
+
+def test_secrets_cached_until_reload():
+    """Token is read once per process; reload_secrets() picks up a rotated value."""
+    from apps.publisher.telegram import _get_bot_token
+
+    with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "old"}):
+        assert _get_bot_token() == "old"
+    with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "new"}):
+        assert _get_bot_token() == "old"
+        TelegramPublisher.reload_secrets()
+        assert _get_bot_token() == "new"
+
+
+def test_publish_async_queues_then_worker_marks_sent():
+    """publish_async commits a queued row and returns; the background send updates it to sent."""
+    from apps.publisher import telegram as mod
+
+    session = MagicMock()
+    submitted = []
+    with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "t", "TELEGRAM_TARGET_CHAT_ID": "1"}), \
+         patch.object(mod, "_get_session", return_value=session), \
+         patch.object(mod, "_log_publication", return_value=5) as log, \
+         patch.object(mod, "_EXEC") as executor:
+        executor.submit.side_effect = lambda fn, *args: submitted.append((fn, args))
+        result = TelegramPublisher().publish_async(["hello"], "telegram")
+    assert (result.status, result.publication_id) == ("queued", 5)
+    assert log.call_args[0][2] == "queued"
+    session.commit.assert_called_once()
+    assert submitted and submitted[0][1] == (5, ["hello"], "t", "1")
+
+    worker_session = MagicMock()
+    fn, args = submitted[0]
+    with patch.object(mod, "_get_session", return_value=worker_session), \
+         patch.object(mod, "_send_with_retry", return_value=(True, ["11"], 1)):
+        fn(*args)
+    stmt = worker_session.execute.call_args[0][0]
+    assert stmt.compile().params["status"] == "sent"
+    assert stmt.compile().params["external_id"] == "11"
+    worker_session.commit.assert_called_once()
+
+
+def test_publish_batch_one_session_one_commit():
+    """publish_batch reuses one session, commits once, and keeps going past a failed post."""
+    from apps.publisher import telegram as mod
+
+    session = MagicMock()
+    sent = MagicMock(status="sent")
+    failed = mod.TelegramPublishError("down", publication_id=7, attempts=3)
+    with patch.object(TelegramPublisher, "publish", side_effect=[sent, failed, sent]) as pub, \
+         patch.object(mod, "_get_session", return_value=session):
+        results = TelegramPublisher().publish_batch([(["a"], "telegram"), (["b"], "telegram"), (["c"], "x")], dry_run=False)
+    assert [r.status for r in results] == ["sent", "failed", "sent"]
+    assert (results[1].publication_id, results[1].attempts) == (7, 3)
+    assert all(c.kwargs["session"] is session for c in pub.call_args_list)
+    session.commit.assert_called_once()
+    session.close.assert_called_once()
+
+
+def test_send_queued_logs_failed_update():
+    """A failing background UPDATE is logged with the publication id (the future is never observed)."""
+    from apps.publisher import telegram as mod
+
+    session = MagicMock()
+    session.execute.side_effect = RuntimeError("db down")
+    with patch.object(mod, "_send_with_retry", return_value=(True, ["11"], 1)), \
+         patch.object(mod, "_get_session", return_value=session), \
+         patch.object(mod, "_log") as log:
+        with pytest.raises(RuntimeError, match="db down"):
+            mod._send_queued(5, ["hello"], "t", "1")
+    session.rollback.assert_called_once()
+    assert log.error.call_args.kwargs["publication_id"] == 5
@@ -0,0 +1,30 @@
+"""Unit tests for the Streamlit UI stylesheet injection (skipped when streamlit is not installed)."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+
+_UI_PATH = Path(__file__).resolve().parent.parent / "apps" / "wa-qr-cloud-ui" / "src" / "ui.py"
+
+
+@pytest.fixture
+def ui():
+    spec = importlib.util.spec_from_file_location("wa_qr_cloud_ui_ui", _UI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_css_inlined_even_with_static_serving(ui, monkeypatch):
+    """Static serving sends .css as text/plain (nosniff), so the stylesheet must be inlined, never <link>ed."""
+    emitted = []
+    monkeypatch.setattr(st, "get_option", lambda name: True)
+    monkeypatch.setattr(st, "markdown", lambda body, **kw: emitted.append(body))
+
+    ui.inject_app_css()
+    assert len(emitted) == 1
+    assert emitted[0].startswith("<style>")
+    assert "<link" not in emitted[0]
+    assert ".sidebar-header" in emitted[0]
@@ -0,0 +1,243 @@
+"""Tests for the worker publish step (mocked session and publishers; no DB or network)."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.worker import tasks
+
+
+def _task(**kw):
+    base = dict(
+        item_id=7,
+        template="FLASH_SETORIAL",
+        priority=1,
+        source_name="Reuters",
+        url="https://example.com/7",
+        draft_id=70,
+        draft_data={"setor": "Energia"},
+        retry_count=0,
+    )
+    base.update(kw)
+    return tasks._PublishTask(**base)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    s = MagicMock()
+    monkeypatch.setattr(tasks, "SessionLocal", lambda: s)
+    monkeypatch.setattr(tasks, "render_text", lambda *a, **kw: "msg")
+    return s
+
+
+def _fail_all_channels(monkeypatch):
+    def boom(*a, **kw):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(tasks, "publish_telegram", boom)
+    monkeypatch.setattr(tasks, "send_whatsapp_web", boom)
+    monkeypatch.setattr(tasks, "send_make_webhook", boom)
+    monkeypatch.setattr(
+        "apps.publisher.whatsapp_make.send_whatsapp_via_make",
+        lambda *a, **kw: SimpleNamespace(status="dead_letter", dry_run=False, last_error="make down"),
+    )
+
+
+def test_publish_failure_returned_without_db_write(session, monkeypatch):
+    """Error path: the worker rolls back and reports the failure; no query and no Item update of its own."""
+    _fail_all_channels(monkeypatch)
+    outcome = tasks._process_single_item(_task(retry_count=0), {}, dry_run=True)
+    assert (outcome.item_id, outcome.success, outcome.failed) == (7, False, True) and outcome.error
+    session.query.assert_not_called()
+    session.execute.assert_not_called()
+    session.bulk_update_mappings.assert_not_called()
+
+
+def test_publish_failures_recorded_in_one_batch():
+    """All failures of a step: one bulk Item update, DLQ rows only for exhausted items."""
+    session = MagicMock()
+    failures = [
+        (_task(item_id=1, retry_count=0), "down"),
+        (_task(item_id=2, retry_count=tasks.MAX_PIPELINE_ATTEMPTS - 1), "still down"),
+    ]
+    tasks._record_publish_failures(session, failures)
+    (model, rows), _ = session.bulk_update_mappings.call_args
+    assert model is tasks.Item
+    assert [(r["id"], r["status"], r["retry_count"]) for r in rows] == [
+        (1, "drafted", 1),
+        (2, "dlq", tasks.MAX_PIPELINE_ATTEMPTS),
+    ]
+    (dlq_rows,), _ = session.add_all.call_args
+    assert [d.item_id for d in dlq_rows] == [2]
+
+
+def test_publishers_receive_detached_item_snapshot(session, monkeypatch):
+    """Publishers get the task's item snapshot (id/source_name/url), not an ORM reload."""
+    seen = []
+    monkeypatch.setattr(
+        tasks, "publish_telegram", lambda *a, **kw: SimpleNamespace(status="dry_run", dry_run=True)
+    )
+
+    def wa(session, item, **kw):
+        seen.append(item)
+        return SimpleNamespace(status="dry_run", dry_run=True, last_error=None)
+
+    monkeypatch.setattr(tasks, "send_whatsapp_web", wa)
+    monkeypatch.setattr(
+        "apps.publisher.whatsapp_make.send_whatsapp_via_make",
+        lambda *a, **kw: SimpleNamespace(status="dry_run", dry_run=True, last_error=None),
+    )
+    assert tasks._process_single_item(_task(), {}, dry_run=True).success
+    assert seen[0] == (7, "Reuters", "https://example.com/7")
+    session.query.assert_not_called()
+
+
+def test_gather_publish_bounded_and_ordered(monkeypatch):
+    """Fan-out caps in-flight tasks at PUBLISH_MAX_WORKERS; one outcome per task, in order."""
+    import asyncio
+    import threading
+    import time
+
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def fake_process(task, settings, dry_run):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.01)
+        with lock:
+            state["now"] -= 1
+        if task.item_id == 3:
+            raise RuntimeError("unexpected")
+        return tasks._PublishOutcome(task.item_id, task.item_id % 2 == 0, None, None)
+
+    monkeypatch.setattr(tasks, "_process_single_item", fake_process)
+    monkeypatch.setattr(tasks, "PUBLISH_MAX_WORKERS", 2)
+    outcomes = asyncio.run(tasks._gather_publish([_task(item_id=i) for i in range(1, 7)], {}, True))
+    assert [o.item_id for o in outcomes] == [1, 2, 3, 4, 5, 6]
+    assert [o.item_id for o in outcomes if o.success] == [2, 4, 6]
+    assert outcomes[2].failed and "unexpected" in outcomes[2].error  # a crashed worker still counts as failed
+    assert state["peak"] <= 2
+
+
+def test_drafted_items_fetched_with_latest_draft_in_one_query(monkeypatch):
+    """One SELECT of the needed columns: items LEFT JOIN drafts, DISTINCT ON item, newest draft first."""
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm import Query, Session
+
+    executed = []
+    monkeypatch.setattr(Query, "all", lambda self: executed.append(self) or [])
+    tasks._fetch_drafted_items_with_latest_draft(Session(), limit=5, item_ids_filter=[1, 2])
+    assert len(executed) == 1
+    sql = str(executed[0].statement.compile(dialect=postgresql.dialect()))
+    assert "DISTINCT ON (items.id)" in sql
+    assert "LEFT OUTER JOIN drafts" in sql
+    assert "ORDER BY items.id, drafts.id DESC NULLS LAST" in sql
+    assert "items.title" not in sql and "items.summary" not in sql  # only the columns publish reads
+
+
+def test_scheduler_wakes_immediately_on_shutdown(monkeypatch):
+    """SIGTERM during the inter-run wait ends the scheduler at once, not after the interval."""
+    import time
+
+    monkeypatch.setattr(tasks, "validate_env", lambda role: None)
+    monkeypatch.setattr(tasks.signal, "signal", lambda *a: None)
+    monkeypatch.setattr(tasks, "ensure_ollama_model_async", lambda **kw: None)
+    monkeypatch.setattr(tasks, "RUN_EVERY_MINUTES", 15)
+    monkeypatch.setattr(tasks, "_worker_shutdown", tasks.threading.Event())
+    runs = []
+
+    def fake_pipeline(dry_run):
+        runs.append(dry_run)
+        tasks.threading.Timer(0.05, tasks._worker_sigterm, args=(None, None)).start()
+        return {"scoring": 0, "llm_draft": 0, "publish": 0}
+
+    monkeypatch.setattr(tasks, "run_pipeline", fake_pipeline)
+    t0 = time.monotonic()
+    tasks.run_scheduler()
+    assert len(runs) == 1
+    assert time.monotonic() - t0 < 5
+
+
+def test_streaming_publishes_backlog_then_each_drafted_chunk(monkeypatch):
+    """Streaming run: backlog published first, then every drafted chunk as the LLM stage hands it over."""
+    published = []
+
+    def fake_llm(item_ids=None, on_drafted=None):
+        on_drafted([10, 11])
+        on_drafted([12])
+        return 3
+
+    def fake_publish(dry_run, limit=20, item_ids_filter=None):
+        published.append(list(item_ids_filter))
+        if item_ids_filter == [12]:
+            raise RuntimeError("db hiccup")  # logged; does not stall the stream
+        return len(item_ids_filter)
+
+    monkeypatch.setattr(tasks, "init_db", lambda: None)
+    monkeypatch.setattr(tasks, "_drafted_item_ids", lambda limit, item_ids=None: [1])
+    monkeypatch.setattr(tasks, "step_llm_draft", fake_llm)
+    monkeypatch.setattr(tasks, "step_render_and_publish", fake_publish)
+    drafted, count = tasks._draft_and_publish_streaming(dry_run=True)
+    assert drafted == 3
+    assert published == [[1], [10, 11], [12]]
+    assert count == 3
+
+
+def test_llm_draft_overlaps_calls_and_keeps_db_writes_on_caller(monkeypatch):
+    """Classify+generate runs on up to LLM_MAX_WORKERS threads; drafts/updates/DLQ written once, in item order."""
+    import threading
+    import time
+
+    items = [SimpleNamespace(id=i, title=f"t{i}", summary="", source_name="", retry_count=0) for i in range(1, 5)]
+    items[2].retry_count = tasks.MAX_PIPELINE_ATTEMPTS - 1
+    session = MagicMock()
+    session.query.return_value.filter.return_value.limit.return_value.all.return_value = items
+    monkeypatch.setattr(tasks, "SessionLocal", lambda: session)
+    monkeypatch.setattr(tasks, "init_db", lambda: None)
+    monkeypatch.setattr(tasks, "ollama_model_ready", lambda: True)
+    monkeypatch.setattr(tasks, "LLM_MAX_WORKERS", 4)
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def fake_llm(title, **kw):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.05)
+        with lock:
+            state["now"] -= 1
+        if title == "t3":
+            raise ValueError("invalid JSON")
+        return SimpleNamespace(template="FLASH_SETORIAL"), SimpleNamespace(payload={"x": title})
+
+    monkeypatch.setattr(tasks, "run_classify_then_generate", fake_llm)
+    assert tasks._step_llm_draft_impl(limit=4) == 3
+    assert state["peak"] > 1
+    (_, rows), _ = session.bulk_update_mappings.call_args
+    assert [(r["id"], r["status"]) for r in rows] == [(1, "drafted"), (2, "drafted"), (3, "dlq"), (4, "drafted")]
+    assert any(isinstance(c.args[0], tasks.DeadLetterQueue) for c in session.add.call_args_list)
+    session.commit.assert_called_once()
+
+
+def test_telegram_receives_unsplit_render(session, monkeypatch):
+    """WhatsApp-sized parts are not handed to Telegram (it would pack them with a blank line mid-text)."""
+    sent = []
+    long_text = "Header\n" + "word " * 800
+    monkeypatch.setattr(tasks, "render_text", lambda *a, **kw: long_text)
+
+    def telegram(messages, **kw):
+        sent.append(messages)
+        return SimpleNamespace(status="dry_run", dry_run=True)
+
+    monkeypatch.setattr(tasks, "publish_telegram", telegram)
+    monkeypatch.setattr(
+        tasks, "send_whatsapp_web", lambda *a, **kw: SimpleNamespace(status="dry_run", dry_run=True, last_error=None)
+    )
+    monkeypatch.setattr(
+        "apps.publisher.whatsapp_make.send_whatsapp_via_make",
+        lambda *a, **kw: SimpleNamespace(status="dry_run", dry_run=True, last_error=None),
+    )
+    assert tasks._process_single_item(_task(), {}, dry_run=True).success
+    assert sent == [[long_text]]